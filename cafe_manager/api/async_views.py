@@ -0,0 +1,223 @@
+"""
+Асинхронные версии основных endpoint'ов заказов для запуска под ASGI
+(uvicorn): список, один заказ, создание, смена статуса и выручка.
+Запросы к БД идут через асинхронный ORM Django (aget, acreate,
+aaggregate, async for), поэтому view не занимает поток на время
+запроса; смена статуса — тот же условный UPDATE, что и в OrderViewSet,
+через sync_to_async. JSON ответов совпадает с OrderViewSet; кэш
+ответов эти view не используют.
+"""
+
+import json
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from rest_framework import filters, status
+from rest_framework.exceptions import (
+    APIException,
+    NotFound,
+    ParseError,
+    ValidationError,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+from api.filters import DishSearchFilter
+from api.serializers import (
+    OrderReadSerializer,
+    OrderSerializer,
+    OrderStatusSerializer,
+    aload_items,
+)
+from api.views import OrderViewSet, advance_order, order_etag
+from orders import revenue as orders_revenue
+from orders.forms import RevenueReportForm
+from orders.models import Order
+from orders.pagination import InvalidCursor, apaginate, get_page_size
+
+
+def json_response(
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    etag: Optional[str] = None,
+) -> HttpResponse:
+    """Ответ в JSON, отрендеренный так же, как в DRF."""
+    response = HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+    )
+    if etag is not None:
+        response["ETag"] = etag
+    return response
+
+
+def error_response(error: APIException) -> HttpResponse:
+    """Ошибка в формате DRF: {"detail": ...} или ошибки полей."""
+    detail = error.detail
+    if not isinstance(detail, (dict, list)):
+        detail = {"detail": detail}
+    return json_response(detail, error.status_code)
+
+
+def async_api_view(*methods: str) -> Callable:
+    """
+    Асинхронный view API: допустимые HTTP-методы и отключенная
+    проверка CSRF, как у view DRF. Декораторы Django 4.2
+    (require_http_methods, csrf_exempt) асинхронные view не
+    поддерживают.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def parse_json(request: HttpRequest) -> Any:
+    """Тело запроса в JSON; ParseError, если его не удалось разобрать."""
+    try:
+        return json.loads(request.body or b"null")
+    except (UnicodeDecodeError, ValueError) as error:
+        raise ParseError(f"Ошибка разбора JSON: {error}")
+
+
+async def read_order(pk: int) -> Optional[dict]:
+    """Заказ в представлении OrderReadSerializer или None."""
+    try:
+        row = await Order.objects.values(
+            *OrderReadSerializer.value_fields()
+        ).aget(pk=pk)
+    except Order.DoesNotExist:
+        return None
+    await aload_items([row])
+    return OrderReadSerializer().to_representation(row)
+
+
+@async_api_view("GET", "POST")
+async def order_list(request: HttpRequest) -> HttpResponse:
+    """
+    GET — список заказов с keyset-пагинацией и поиском (search, dish,
+    cursor, page_size), как /api/orders/. POST — создание заказа.
+    """
+    if request.method == "POST":
+        return await create_order(request)
+
+    drf_request = Request(request)
+    rows = Order.objects.values(*OrderReadSerializer.value_fields())
+    for backend in (filters.SearchFilter, DishSearchFilter):
+        rows = backend().filter_queryset(drf_request, rows, OrderViewSet)
+    try:
+        page = await apaginate(
+            rows,
+            request.GET.get("cursor"),
+            get_page_size(request.GET.get("page_size")),
+        )
+    except InvalidCursor:
+        return error_response(NotFound("Некорректный курсор."))
+
+    def link(cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        return replace_query_param(
+            request.build_absolute_uri(), "cursor", cursor
+        )
+
+    await aload_items(page.object_list)
+    serializer = OrderReadSerializer()
+    return json_response(
+        {
+            "next": link(page.next_cursor),
+            "previous": link(page.previous_cursor),
+            "results": [
+                serializer.to_representation(row) for row in page.object_list
+            ],
+        }
+    )
+
+
+async def create_order(request: HttpRequest) -> HttpResponse:
+    """Создает заказ; ответ 201 с ETag, как у POST /api/orders/."""
+    try:
+        serializer = OrderSerializer(data=parse_json(request))
+    except ParseError as error:
+        return error_response(error)
+    # Проверка блюд читает меню (при промахе кэша меню — из БД)
+    if not await sync_to_async(serializer.is_valid)():
+        return error_response(ValidationError(serializer.errors))
+    order = await Order.objects.acreate(**serializer.validated_data)
+    # Блюда созданного заказа уже в кэше строк: запросов к БД нет
+    data = OrderSerializer(order).data
+    return json_response(
+        data, status.HTTP_201_CREATED, etag=order_etag(data["version"])
+    )
+
+
+@async_api_view("GET")
+async def order_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    """Один заказ с ETag, как GET /api/orders/{id}/."""
+    data = await read_order(pk)
+    if data is None:
+        return error_response(NotFound())
+    return json_response(data, etag=order_etag(data["version"]))
+
+
+@async_api_view("PATCH")
+async def order_status(request: HttpRequest, pk: int) -> HttpResponse:
+    """
+    Смена статуса заказа: {"status": "ready"} или {"status": "paid"}.
+    Как и POST /api/orders/{id}/ready/ и /pay/, статус меняется
+    условным UPDATE по предыдущему статусу (и по версии из If-Match):
+    недопустимый переход — 409, другая версия — 412.
+    """
+    try:
+        serializer = OrderStatusSerializer(data=parse_json(request))
+    except ParseError as error:
+        return error_response(error)
+    if not serializer.is_valid():
+        return error_response(ValidationError(serializer.errors))
+
+    try:
+        await sync_to_async(advance_order)(
+            request, pk, serializer.validated_data["status"]
+        )
+    except APIException as error:
+        return error_response(error)
+
+    data = await read_order(pk)
+    if data is None:
+        # Заказ удалили сразу после изменения
+        return error_response(NotFound())
+    return json_response(data, etag=order_etag(data["version"]))
+
+
+@async_api_view("GET")
+async def order_revenue(request: HttpRequest) -> HttpResponse:
+    """Выручка за период, как GET /api/orders/revenue/."""
+    form = RevenueReportForm(request.GET)
+    if not form.is_valid():
+        return error_response(ValidationError(form.errors))
+    date_from, date_to = form.cleaned_data["from"], form.cleaned_data["to"]
+    group_by = form.cleaned_data["group_by"]
+
+    data = {
+        "total_revenue": await orders_revenue.atotal_revenue(
+            date_from, date_to
+        )
+    }
+    if group_by:
+        data["group_by"] = group_by
+        data["results"] = await orders_revenue.arevenue_series(
+            group_by, date_from, date_to
+        )
+    return json_response(data)
@@ -0,0 +1,22 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    """Версия в If-Match не совпадает с текущей версией заказа."""
+
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = (
+        "Заказ изменился: версия в If-Match не совпадает с текущей."
+    )
+    default_code = "precondition_failed"
+
+
+class Conflict(APIException):
+    """Заказ изменили одновременно с этим запросом."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "Заказ изменен другим запросом. Перечитайте заказ и повторите."
+    )
+    default_code = "conflict"
@@ -0,0 +1,83 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.serializers import OrderReadSerializer, load_items
+from orders.items import format_item_line
+
+CSV_COLUMNS = [
+    "id",
+    "table_number",
+    "status",
+    "total_price",
+    "created_at",
+    "items",
+]
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_order_chunks(queryset: QuerySet) -> Iterator[list[dict]]:
+    """
+    Читает заказы пачками по ORDERS_EXPORT_CHUNK_SIZE с пагинацией
+    по ключу (WHERE id > <последний id> ORDER BY id LIMIT n) и подгружает
+    блюда каждой пачки одним запросом. Каждая пачка — отдельный
+    запрос, поэтому в памяти одновременно находится только одна пачка
+    и без серверных курсоров (DISABLE_SERVER_SIDE_CURSORS за PgBouncer).
+    """
+    chunk_size = settings.ORDERS_EXPORT_CHUNK_SIZE
+    rows = queryset.order_by("id").values(*OrderReadSerializer.value_fields())
+    last_id = None
+    while True:
+        page = rows if last_id is None else rows.filter(id__gt=last_id)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        load_items(chunk)
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1]["id"]
+
+
+def format_items(items: Iterable[dict]) -> str:
+    """
+    Разворачивает блюда в одну ячейку CSV в формате ввода заказа:
+    "борщ 100.00; хлеб x3 5.00".
+    """
+    return "; ".join(format_item_line(item) for item in items)
+
+
+def stream_csv(queryset: QuerySet) -> Iterator[str]:
+    """Строки CSV с заголовком; блюда развернуты в колонку items."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    serializer = OrderReadSerializer()
+    for chunk in iter_order_chunks(queryset):
+        for row in chunk:
+            data = serializer.to_representation(row)
+            data["items"] = format_items(data["items"])
+            yield writer.writerow([data[column] for column in CSV_COLUMNS])
+
+
+def stream_ndjson(queryset: QuerySet) -> Iterator[str]:
+    """
+    Строки NDJSON: по одному заказу в формате API на строку.
+    """
+    serializer = OrderReadSerializer()
+    for chunk in iter_order_chunks(queryset):
+        for row in chunk:
+            yield json.dumps(
+                serializer.to_representation(row),
+                cls=JSONEncoder,
+                ensure_ascii=False,
+            ) + "\n"
@@ -0,0 +1,22 @@
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from orders.search import search_orders
+
+
+class DishSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск заказов по названию блюда: ?dish=борщ.
+    Идет по индексу поиска (GIN на PostgreSQL, FTS5 на SQLite).
+    """
+
+    search_param = "dish"
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view
+    ) -> QuerySet:
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        return search_orders(queryset, text)
@@ -0,0 +1,70 @@
+from typing import Optional
+
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from orders.pagination import InvalidCursor, get_page_size, paginate
+
+
+class OrderCursorPagination(BasePagination):
+    """
+    Keyset-пагинация заказов по (created_at, id).
+    Параметры запроса: cursor и page_size.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list:
+        """Возвращает строки текущей страницы."""
+        self.request = request
+        try:
+            self.page = paginate(
+                queryset,
+                request.query_params.get(self.cursor_query_param),
+                get_page_size(
+                    request.query_params.get(self.page_size_query_param)
+                ),
+            )
+        except InvalidCursor:
+            raise NotFound("Некорректный курсор.")
+        return self.page.object_list
+
+    def get_link(self, cursor: Optional[str]) -> Optional[str]:
+        """Строит ссылку на соседнюю страницу."""
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data: list) -> Response:
+        """Оборачивает данные страницы ссылками next/previous."""
+        return Response(
+            {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        """Описывает формат ответа для генерации схемы API."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
@@ -0,0 +1,29 @@
+import json
+
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ExportRenderer(renderers.BaseRenderer):
+    """
+    Формат выгрузки заказов. Сами данные отдаются потоково
+    через StreamingHttpResponse; рендерер нужен для выбора формата
+    по ?format= и для ответов с ошибками.
+    """
+
+    charset = "utf-8"
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False).encode()
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
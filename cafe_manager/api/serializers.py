@@ -1,6 +1,177 @@
+from collections import defaultdict
+from decimal import Decimal
+from functools import cache
+from typing import Any, Callable, Iterable
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import serializers
 
-from orders.models import Order
+from orders.items import validate_items as validate_order_items
+from orders.menu import price_items
+from orders.models import (
+    PREVIOUS_STATUS,
+    ArchivedOrder,
+    Order,
+    OrderItem,
+    TableSession,
+    can_change_status,
+    status_transition_error,
+)
+
+
+class OrderListSerializer(serializers.ListSerializer):
+    """
+    Массовое создание и обновление заказов: вместо INSERT/UPDATE
+    на каждый заказ используются bulk_create/bulk_update.
+    """
+
+    def run_child_validation(self, data: dict) -> dict:
+        """
+        При массовом обновлении подставляет дочернему сериализатору
+        заказ по id из переданного словаря заказов. Статус массовым
+        обновлением не меняется: переходы pending → ready → paid
+        выполняет условный UPDATE в /bulk-status/.
+        """
+        if self.instance is not None:
+            order = None
+            if isinstance(data, dict):
+                order = self.instance.get(data.get("id"))
+            if order is None:
+                raise serializers.ValidationError(
+                    {"id": ["Заказ с таким id не найден."]}
+                )
+            if "status" in data:
+                raise serializers.ValidationError(
+                    {
+                        "status": [
+                            "Статус заказов массово меняется через "
+                            "/api/orders/bulk-status/."
+                        ]
+                    }
+                )
+            version = data.get("version")
+            if "version" in data and (
+                not isinstance(version, int)
+                or isinstance(version, bool)
+                or version < 1
+            ):
+                raise serializers.ValidationError(
+                    {"version": ["Укажите версию заказа целым числом."]}
+                )
+            self.child.instance = order
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def create(self, validated_data: list[dict]) -> list[Order]:
+        """Создает заказы и их блюда двумя bulk_create."""
+        return Order.objects.bulk_create_with_items(
+            [Order(**attrs) for attrs in validated_data]
+        )
+
+    def update(
+        self, instance: dict[int, Order], validated_data: list[dict]
+    ) -> list[Order]:
+        """
+        Обновляет заказы одним bulk_update. Заказ пишется с версией,
+        переданной клиентом в поле version, а без нее — с версией,
+        с которой он прочитан для проверки.
+        """
+        orders, fields = [], set()
+        for data, attrs in zip(self.initial_data, validated_data):
+            order = instance[data["id"]]
+            order.version = data.get("version", order.version)
+            for attr, value in attrs.items():
+                setattr(order, attr, value)
+            fields.update(attrs.keys() - {"items"})
+            orders.append(order)
+        return Order.objects.bulk_update_with_items(orders, fields)
+
+
+class OrderStatusSerializer(serializers.Serializer):
+    """Новый статус заказа."""
+
+    status = serializers.ChoiceField(
+        choices=Order.STATUS_CHOICES, help_text="Новый статус."
+    )
+
+
+class BulkStatusSerializer(OrderStatusSerializer):
+    """Параметры массовой смены статуса заказов."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        help_text="Список id заказов.",
+    )
+
+    def validate_status(self, value: str) -> str:
+        """Массово заказы переводятся только в ready или paid."""
+        if value not in PREVIOUS_STATUS:
+            raise serializers.ValidationError(
+                "Заказы можно перевести только в статус ready или paid."
+            )
+        return value
+
+
+class TableSessionSerializer(serializers.ModelSerializer):
+    """Сессия стола (счет) с суммой неоплаченных заказов."""
+
+    class Meta:
+        model = TableSession
+        fields = [
+            "id",
+            "table_number",
+            "opened_at",
+            "closed_at",
+            "unpaid_total",
+            "orders_count",
+            "paid_total",
+        ]
+        read_only_fields = fields
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """Заказ из архива: блюда хранятся в самой строке архива."""
+
+    class Meta:
+        model = ArchivedOrder
+        fields = [
+            "id",
+            "table_number",
+            "items",
+            "total_price",
+            "status",
+            "created_at",
+            "version",
+            "ready_at",
+            "paid_at",
+            "session",
+            "archived_at",
+        ]
+        read_only_fields = fields
+
+
+class SplitItemSerializer(serializers.Serializer):
+    """Блюдо счета в части при разделении счета."""
+
+    item = serializers.IntegerField(help_text="id строки счета.")
+    quantity = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        help_text="Сколько порций (по умолчанию все).",
+    )
+
+
+class SplitBillSerializer(serializers.Serializer):
+    """Части счета: список блюд для каждого гостя."""
+
+    parts = serializers.ListField(
+        child=serializers.ListField(child=SplitItemSerializer()),
+        allow_empty=False,
+        help_text="Список частей, в каждой — блюда счета.",
+    )
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -11,34 +182,146 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = "__all__"
+        list_serializer_class = OrderListSerializer
 
-    def validate_items(
-        self, value: list[dict[str, float]]
-    ) -> list[dict[str, float]]:
-        """Проверяем, что список блюд корректный."""
-        if not isinstance(value, list) or not value:
+    def validate_status(self, value: str) -> str:
+        """Статус заказа меняется только по порядку pending → ready → paid."""
+        if self.instance is not None and not can_change_status(
+            self.instance.status, value
+        ):
             raise serializers.ValidationError(
-                "Список блюд не может быть пустым."
+                status_transition_error(self.instance.status, value)
             )
+        return value
 
-        for item in value:
-            if (
-                not isinstance(item, dict)
-                or "name" not in item
-                or "price" not in item
-            ):
-                raise serializers.ValidationError(
-                    "Каждый элемент списка должен содержать 'name' и 'price'."
-                )
-            if not isinstance(item["name"], str) or not isinstance(
-                item["price"], (int, float)
-            ):
-                raise serializers.ValidationError(
-                    "Поле 'name' должно быть строкой, а 'price' числом."
-                )
-            if item["price"] <= 0:
-                raise serializers.ValidationError(
-                    "Цена блюда должна быть больше 0."
-                )
+    def validate_items(self, value: Any) -> list[dict[str, Any]]:
+        """
+        Проверяем, что список блюд корректный, и назначаем цены
+        блюдам из меню.
+        """
+        try:
+            return price_items(validate_order_items(value))
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
 
+
+def _decimal_converter(field: serializers.DecimalField) -> Callable:
+    """Форматирует Decimal так же, как DecimalField (строкой)."""
+    exponent = Decimal(1).scaleb(-field.decimal_places)
+
+    def convert(value: Decimal):
+        if value is None:
+            return None
+        return "{:f}".format(value.quantize(exponent))
+
+    return convert
+
+
+def _datetime_converter(field: serializers.DateTimeField) -> Callable:
+    """Форматирует datetime так же, как DateTimeField в ISO 8601."""
+
+    def convert(value):
+        if value is None:
+            return None
+        value = timezone.localtime(value).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
         return value
+
+    return convert
+
+
+@cache
+def _read_fields() -> tuple[tuple[str, Callable[[Any], Any]], ...]:
+    """
+    Поля ответа в порядке OrderSerializer и функции их форматирования.
+    Простые значения (числа, строки, выбор из списка) отдаются как есть.
+    """
+    fields = []
+    for name, field in OrderSerializer().fields.items():
+        if name == "items":
+            converter = None
+        elif isinstance(field, serializers.DecimalField):
+            converter = _decimal_converter(field)
+        elif isinstance(field, serializers.DateTimeField):
+            converter = _datetime_converter(field)
+        elif isinstance(
+            field,
+            (
+                serializers.IntegerField,
+                serializers.CharField,
+                serializers.ChoiceField,
+                serializers.BooleanField,
+                serializers.PrimaryKeyRelatedField,
+            ),
+        ):
+            converter = None
+        else:
+            converter = field.to_representation
+        fields.append((name, converter))
+    return tuple(fields)
+
+
+def _item_rows(rows: list[dict]) -> QuerySet:
+    """Запрос блюд для строк заказов: (order_id, name, price, quantity)."""
+    return OrderItem.objects.filter(
+        order_id__in=[row["id"] for row in rows]
+    ).values_list("order_id", "name", "price", "quantity")
+
+
+def _attach_items(rows: list[dict], item_rows: Iterable[tuple]) -> None:
+    """Раскладывает блюда по строкам заказов."""
+    items = defaultdict(list)
+    for order_id, name, price, quantity in item_rows:
+        item = {"name": name, "price": price}
+        if quantity != 1:
+            item["quantity"] = quantity
+        items[order_id].append(item)
+    for row in rows:
+        row["items"] = items.get(row["id"], [])
+
+
+def load_items(rows: list[dict]) -> None:
+    """Добавляет к строкам заказов блюда, загруженные одним запросом."""
+    _attach_items(rows, _item_rows(rows))
+
+
+async def aload_items(rows: list[dict]) -> None:
+    """Асинхронный вариант load_items()."""
+    _attach_items(rows, [item async for item in _item_rows(rows)])
+
+
+class OrderReadListSerializer(serializers.ListSerializer):
+    """Список заказов для быстрого чтения: блюда грузятся одним запросом."""
+
+    def to_representation(self, data) -> list[dict]:
+        rows = list(data)
+        load_items(rows)
+        return [self.child.to_representation(row) for row in rows]
+
+
+class OrderReadSerializer(serializers.BaseSerializer):
+    """
+    Быстрое представление заказов для list и retrieve.
+    Принимает строки из Order.objects.values(*value_fields()) и собирает
+    словари напрямую, без интроспекции полей DRF. JSON совпадает
+    с OrderSerializer; запись идет только через OrderSerializer.
+    """
+
+    class Meta:
+        list_serializer_class = OrderReadListSerializer
+
+    @staticmethod
+    def value_fields() -> list[str]:
+        """Колонки, которые нужно выбрать через values()."""
+        return [name for name, _ in _read_fields() if name != "items"]
+
+    def to_representation(self, row: dict) -> dict:
+        if "items" not in row:
+            load_items([row])
+        return {
+            name: (
+                converter(row[name]) if converter is not None else row[name]
+            )
+            for name, converter in _read_fields()
+        }
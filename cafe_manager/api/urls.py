@@ -1,7 +1,15 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import OrderViewSet
+from . import async_views
+from .views import (
+    ArchivedOrderViewSet,
+    OrderViewSet,
+    TableSessionViewSet,
+    cache_stats,
+    menu,
+    table_balance,
+)
 
 
 app_name = "api"
@@ -9,7 +17,33 @@ app_name = "api"
 router = DefaultRouter()
 
 router.register(r"orders", OrderViewSet, basename="orders")
+router.register(r"sessions", TableSessionViewSet, basename="sessions")
+router.register(r"archive", ArchivedOrderViewSet, basename="archive")
 
 urlpatterns = [
+    path("cache-stats/", cache_stats, name="cache-stats"),
+    path("menu/", menu, name="menu"),
+    path(
+        "tables/<int:table_number>/balance/",
+        table_balance,
+        name="table-balance",
+    ),
+    # Асинхронные версии endpoint'ов заказов для запуска под ASGI
+    path("async/orders/", async_views.order_list, name="async-orders-list"),
+    path(
+        "async/orders/revenue/",
+        async_views.order_revenue,
+        name="async-orders-revenue",
+    ),
+    path(
+        "async/orders/<int:pk>/",
+        async_views.order_detail,
+        name="async-orders-detail",
+    ),
+    path(
+        "async/orders/<int:pk>/status/",
+        async_views.order_status,
+        name="async-orders-status",
+    ),
     path("", include(router.urls)),
 ]
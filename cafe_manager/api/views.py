@@ -1,34 +1,555 @@
-from django.db.models import Sum
-from rest_framework import viewsets, filters
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from rest_framework import filters, status, viewsets
 from rest_framework.response import Response
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import (
+    APIException,
+    NotFound,
+    ValidationError,
+)
 from rest_framework.request import Request
 
-from api.serializers import OrderSerializer
-from orders.models import Order
+from api.exceptions import Conflict, PreconditionFailed
+from api.export import stream_csv, stream_ndjson
+from api.filters import DishSearchFilter
+from api.pagination import OrderCursorPagination
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api.serializers import (
+    ArchivedOrderSerializer,
+    BulkStatusSerializer,
+    OrderReadSerializer,
+    OrderSerializer,
+    SplitBillSerializer,
+    TableSessionSerializer,
+)
+from orders import board
+from orders import cache as orders_cache
+from orders import menu as orders_menu
+from orders import revenue as orders_revenue
+from orders import sessions as orders_sessions
+from orders.filters import filter_period
+from orders.forms import OrderFilterForm, PeriodForm, RevenueReportForm
+from orders.models import (
+    ArchivedOrder,
+    InvalidStatusTransition,
+    Order,
+    OrderVersionConflict,
+    OrdersVersionConflict,
+    TableSession,
+    status_transition_error,
+)
+
+
+def order_etag(version: int) -> str:
+    """ETag заказа — его версия: "3"."""
+    return f'"{version}"'
+
+
+def check_if_match(request: Request, version: int) -> None:
+    """
+    Проверяет заголовок If-Match: его ETag должен совпадать
+    с текущей версией заказа (или быть "*"), иначе 412.
+    Без заголовка проверка не выполняется.
+    """
+    header = request.META.get("HTTP_IF_MATCH")
+    if header is None:
+        return
+    etags = parse_etags(header)
+    if "*" not in etags and order_etag(version) not in etags:
+        raise PreconditionFailed
+
+
+def if_match_version(request) -> Optional[int]:
+    """
+    Версия заказа из If-Match для условного UPDATE: None без
+    заголовка или с "*"; ETag, не похожий на версию заказа, — 412.
+    """
+    header = request.META.get("HTTP_IF_MATCH")
+    if header is None:
+        return None
+    etags = parse_etags(header)
+    if "*" in etags:
+        return None
+    if len(etags) == 1 and etags[0].strip('"').isdigit():
+        return int(etags[0].strip('"'))
+    raise PreconditionFailed
+
+
+def advance_order(request, pk: int, target: str) -> None:
+    """
+    Переводит заказ в статус target одним условным UPDATE.
+    Ошибки API: нет заказа — 404, недопустимый переход — 409,
+    версия в If-Match не совпала — 412.
+    """
+    try:
+        Order.objects.advance(pk, target, if_match_version(request))
+    except Order.DoesNotExist:
+        raise NotFound
+    except InvalidStatusTransition as error:
+        raise Conflict(str(error))
+    except OrderVersionConflict:
+        raise PreconditionFailed
+
+
+def bulk_conflict(data: list[dict], versions: dict[int, int]) -> APIException:
+    """
+    Ошибка массового изменения по позициям входных данных для заказов
+    из versions, измененных после чтения: 412, если все они переданы
+    с version, иначе 409.
+    """
+    errors, precondition = [], True
+    for item in data:
+        if item["id"] not in versions:
+            errors.append({})
+        elif "version" in item:
+            errors.append(
+                {"version": ["Версия заказа не совпадает с текущей."]}
+            )
+        else:
+            precondition = False
+            errors.append({"id": [Conflict.default_detail]})
+    return (PreconditionFailed if precondition else Conflict)(errors)
 
 
 class OrderViewSet(viewsets.ModelViewSet):
     """
     ViewSet для работы с заказами (Order).
-    Предоставляет CRUD-операции, поиск и endpoint для расчета выручки.
+    Предоставляет CRUD-операции, поиск, массовые операции
+    и endpoint для расчета выручки.
     """
 
-    queryset = Order.objects.all()
+    queryset = Order.objects.prefetch_related("order_items")
     serializer_class = OrderSerializer
-    filter_backends = [filters.SearchFilter]
+    pagination_class = OrderCursorPagination
+    filter_backends = [filters.SearchFilter, DishSearchFilter]
     search_fields = [
         "table_number",
         "status",
     ]
 
+    def is_fast_read(self) -> bool:
+        """
+        Чтение списка или одного заказа идет быстрым путем:
+        строки через values() и OrderReadSerializer.
+        """
+        return (
+            self.action in ("list", "retrieve")
+            and self.request.method == "GET"
+        )
+
+    def get_queryset(self):
+        if self.is_fast_read():
+            return Order.objects.values(*OrderReadSerializer.value_fields())
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.is_fast_read():
+            return OrderReadSerializer
+        return super().get_serializer_class()
+
+    def cached_response(self, name: str, compute) -> Response:
+        """
+        Отдает данные успешного ответа из кэша. Ключ — параметры
+        запроса, хост (ссылки пагинации абсолютные), аргументы URL
+        и поколение всех заказов.
+        """
+        response = None
+
+        def get_data():
+            nonlocal response
+            response = compute()
+            return response.data if response.status_code == 200 else None
+
+        data = orders_cache.get_or_set(
+            name,
+            [orders_cache.ALL_ORDERS],
+            f"{self.request.get_host()}|{sorted(self.kwargs.items())}|"
+            f"{orders_cache.request_params(self.request)}",
+            get_data,
+            cacheable=lambda value: value is not None,
+        )
+        return response if response is not None else Response(data)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.cached_response(
+            "orders_api_list", lambda: super(OrderViewSet, self).list(request)
+        )
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        response = self.cached_response(
+            "orders_api_retrieve",
+            lambda: super(OrderViewSet, self).retrieve(request),
+        )
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = order_etag(response.data["version"])
+        return response
+
+    def get_object(self) -> Order:
+        """
+        Заказ из URL. Перед изменением и удалением проверяется
+        If-Match: версия заказа должна совпадать с версией клиента.
+        """
+        order = super().get_object()
+        if self.request.method in ("PUT", "PATCH", "DELETE"):
+            check_if_match(self.request, order.version)
+        return order
+
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        response = super().create(request, *args, **kwargs)
+        response["ETag"] = order_etag(response.data["version"])
+        return response
+
+    def update(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Изменяет заказ условным UPDATE по версии, с которой он прочитан,
+        без блокировки строки. Если заказ изменили одновременно с
+        запросом, отвечает 412 (запрос с If-Match) или 409.
+        """
+        try:
+            response = super().update(request, *args, **kwargs)
+        except OrderVersionConflict:
+            if "HTTP_IF_MATCH" in request.META:
+                raise PreconditionFailed
+            raise Conflict
+        response["ETag"] = order_etag(response.data["version"])
+        return response
+
+    def advance(self, request: Request, pk: str, target: str) -> Response:
+        """
+        Переводит заказ в статус target и возвращает его с новым ETag.
+        Статус меняется условным UPDATE ... WHERE status = <предыдущий>
+        без чтения заказа перед записью; с If-Match — еще и по версии.
+        """
+        if not pk.isdigit():
+            raise NotFound
+        advance_order(request, int(pk), target)
+        row = (
+            Order.objects.filter(pk=pk)
+            .values(*OrderReadSerializer.value_fields())
+            .first()
+        )
+        if row is None:
+            # Заказ удалили сразу после смены статуса
+            raise NotFound
+        data = OrderReadSerializer(row).data
+        return Response(data, headers={"ETag": order_etag(data["version"])})
+
+    @action(detail=True, methods=["post"])
+    def ready(self, request: Request, pk: str = None) -> Response:
+        """Заказ готов: pending → ready. Заказ в другом статусе — 409."""
+        return self.advance(request, pk, "ready")
+
+    @action(detail=True, methods=["post"])
+    def pay(self, request: Request, pk: str = None) -> Response:
+        """Заказ оплачен: ready → paid. Заказ в другом статусе — 409."""
+        return self.advance(request, pk, "paid")
+
     @action(detail=False, methods=["get"])
     def revenue(self, request: Request) -> Response:
-        """Дополнительный endpoint - расчет выручки."""
-        total_revenue = (
-            Order.objects.filter(status="paid").aggregate(Sum("total_price"))[
-                "total_price__sum"
+        """
+        Дополнительный endpoint - расчет выручки.
+        Параметры: from, to (даты, включительно) и
+        group_by (day, hour, table, status) для разбивки по группам.
+        """
+        return self.cached_response(
+            "revenue_api", lambda: self.compute_revenue(request)
+        )
+
+    def compute_revenue(self, request: Request) -> Response:
+        """Считает ответ endpoint'а выручки."""
+        form = RevenueReportForm(request.query_params)
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        date_from, date_to = form.cleaned_data["from"], form.cleaned_data["to"]
+        group_by = form.cleaned_data["group_by"]
+
+        data = {
+            "total_revenue": orders_revenue.total_revenue(date_from, date_to)
+        }
+        if group_by:
+            data["group_by"] = group_by
+            data["results"] = orders_revenue.revenue_series(
+                group_by, date_from, date_to
+            )
+        return Response(data)
+
+    @action(detail=False, methods=["get"], url_path="open")
+    @method_decorator(cache_control(no_cache=True))
+    @method_decorator(
+        condition(
+            etag_func=board.request_etag,
+            last_modified_func=board.request_last_modified,
+        )
+    )
+    def open_orders(self, request: Request) -> Response:
+        """
+        Открытые заказы (pending и ready), сгруппированные по столам;
+        ?table= — только один стол. Ответ содержит ETag и Last-Modified:
+        пока версия доски не изменилась, запрос с If-None-Match
+        получает 304 после одного поиска по индексу.
+        """
+        revision = board.request_revision(request)
+        rows = board.open_orders(board.requested_table(request)).values(
+            *OrderReadSerializer.value_fields()
+        )
+        data = OrderReadSerializer(rows, many=True).data
+        return Response(
+            {
+                "version": revision.version,
+                "tables": board.group_by_table(data),
+            }
+        )
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request: Request) -> Response:
+        """
+        Массовое создание (POST) и обновление (PATCH) заказов.
+        Принимает список заказов; для PATCH у каждого указывается id
+        и, если нужно, version — версия, с которой клиент прочитал
+        заказ. Все заказы пишутся в одной транзакции или не пишутся
+        вовсе, ошибки возвращаются списком по позициям входных данных.
+        Заказы, измененные после чтения, — ошибки этих позиций с 412
+        (заказ передан с version) или 409.
+        """
+        instance = None
+        if request.method == "PATCH":
+            data = request.data if isinstance(request.data, list) else []
+            ids = [
+                item["id"]
+                for item in data
+                if isinstance(item, dict) and isinstance(item.get("id"), int)
             ]
-            or 0
+            if len(ids) != len(set(ids)):
+                raise ValidationError(
+                    {"id": ["Каждый заказ можно указать только один раз."]}
+                )
+            instance = Order.objects.in_bulk(ids)
+
+        serializer = self.get_serializer(
+            instance,
+            data=request.data,
+            many=True,
+            partial=request.method == "PATCH",
+            allow_empty=False,
+            max_length=settings.ORDERS_BULK_MAX_SIZE,
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except OrdersVersionConflict as error:
+            raise bulk_conflict(request.data, error.versions)
+        return Response(
+            serializer.data,
+            status=(
+                status.HTTP_201_CREATED
+                if instance is None
+                else status.HTTP_200_OK
+            ),
+        )
+
+    @action(detail=False, methods=["patch"], url_path="bulk-status")
+    def bulk_status(self, request: Request) -> Response:
+        """
+        Массовая смена статуса одним условным UPDATE ... WHERE id IN
+        (...) AND status = <предыдущий>. Для каждого ненайденного
+        заказа и заказа в другом статусе возвращается отдельная ошибка.
+        """
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        target = serializer.validated_data["status"]
+
+        updated = {
+            state.id
+            for state in Order.objects.filter(pk__in=ids).advance_status(
+                target
+            )
+        }
+        skipped = [pk for pk in ids if pk not in updated]
+        current = {}
+        if skipped:
+            current = dict(
+                Order.objects.filter(pk__in=skipped).values_list(
+                    "pk", "status"
+                )
+            )
+        errors = []
+        for pk in skipped:
+            if pk in current:
+                detail = status_transition_error(current[pk], target)
+            else:
+                detail = "Заказ с таким id не найден."
+            errors.append({"id": pk, "detail": detail})
+        return Response(
+            {
+                "updated": [pk for pk in ids if pk in updated],
+                "errors": errors,
+            }
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        Потоковая выгрузка заказов: ?format=csv|ndjson и фильтры
+        списка заказов (q, status, from, to). Строки читаются серверным
+        курсором и отправляются клиенту по мере чтения.
+        """
+        form = OrderFilterForm(request.query_params)
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        orders = form.filter(Order.objects.all())
+
+        renderer = request.accepted_renderer
+        stream = stream_csv if renderer.format == "csv" else stream_ndjson
+        response = StreamingHttpResponse(
+            stream(orders),
+            content_type=f"{renderer.media_type}; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="orders.{renderer.format}"'
         )
-        return Response({"total_revenue": total_revenue})
+        return response
+
+
+class TableSessionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Сессии столов (счета). Список — открытые сессии, один счет —
+    сессия со строками счета; закрытие счета и деление по блюдам.
+    """
+
+    queryset = TableSession.objects.all()
+    serializer_class = TableSessionSerializer
+
+    def get_queryset(self):
+        if self.action == "list":
+            return orders_sessions.open_sessions().order_by("table_number")
+        return super().get_queryset()
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Счет: сессия и блюда ее заказов с суммой по каждому."""
+        session = self.get_object()
+        return Response(
+            {
+                **self.get_serializer(session).data,
+                "items": orders_sessions.bill_lines(session),
+            }
+        )
+
+    @action(detail=True, methods=["post"])
+    def close(self, request: Request, pk=None) -> Response:
+        """
+        Закрывает счет: все неоплаченные заказы стола оплачиваются
+        одним UPDATE. Повторное закрытие — 409.
+        """
+        session = self.get_object()
+        try:
+            session = orders_sessions.close_session(session.pk)
+        except orders_sessions.SessionClosed:
+            raise Conflict("Счет уже закрыт.")
+        return Response(self.get_serializer(session).data)
+
+    @action(detail=True, methods=["post"])
+    def split(self, request: Request, pk=None) -> Response:
+        """
+        Делит счет по блюдам: {"parts": [[{"item": 1}, {"item": 2,
+        "quantity": 1}], ...]}. Возвращает сумму каждой части
+        и нераспределенный остаток; заказы не меняются.
+        """
+        session = self.get_object()
+        serializer = SplitBillSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            data = orders_sessions.split_bill(
+                session, serializer.validated_data["parts"]
+            )
+        except DjangoValidationError as error:
+            raise ValidationError({"parts": error.messages})
+        return Response(data)
+
+
+class ArchivedOrderViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Архив оплаченных заказов. Архив читается только через этот
+    endpoint: список заказов /api/orders/ его не затрагивает.
+    Поиск по номеру стола (?search=) и период ?from= и ?to=.
+    """
+
+    queryset = ArchivedOrder.objects.all()
+    serializer_class = ArchivedOrderSerializer
+    pagination_class = OrderCursorPagination
+    filter_backends = [filters.SearchFilter]
+    search_fields = ["=table_number"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+        form = PeriodForm(self.request.query_params)
+        if not form.is_valid():
+            raise ValidationError(form.errors)
+        return filter_period(
+            queryset, form.cleaned_data["from"], form.cleaned_data["to"]
+        )
+
+
+@api_view(["GET"])
+def table_balance(request: Request, table_number: int) -> Response:
+    """
+    Сколько должен стол: открытая сессия стола читается одной
+    строкой по индексу, без суммирования заказов.
+    """
+    session = orders_sessions.get_open_session(table_number)
+    return Response(
+        {
+            "table_number": table_number,
+            "session": session.pk if session else None,
+            "unpaid_total": f"{session.unpaid_total if session else 0:.2f}",
+            "orders_count": session.orders_count if session else 0,
+        }
+    )
+
+
+@api_view(["GET"])
+def cache_stats(request: Request) -> Response:
+    """
+    Счетчики попаданий и промахов кэша ответов этого процесса
+    по именам ответов: {"order_list": {"hits": 10, "misses": 2}, ...}.
+    """
+    return Response(orders_cache.stats.snapshot())
+
+
+@api_view(["GET"])
+def menu(request: Request) -> Response:
+    """
+    Меню с действующими ценами. Отдается из кэша меню процесса:
+    без запросов к базе, пока меню не менялось.
+    """
+    entries = sorted(
+        orders_menu.get_menu().get_entries().values(),
+        key=lambda entry: entry.name,
+    )
+    return Response(
+        [
+            {
+                "id": entry.id,
+                "name": entry.name,
+                "price": f"{entry.price:.2f}",
+                "is_available": entry.is_available,
+            }
+            for entry in entries
+        ]
+    )
@@ -0,0 +1,302 @@
+"""
+Бенчмарк асинхронных view API под uvicorn: запросов в секунду
+у синхронного /api/orders/ и асинхронного /api/async/orders/
+при N одновременных клиентах (по умолчанию 200). Сценарии: список,
+один заказ, выручка по дням и смена статуса.
+
+Сервер — uvicorn с cafe_manager.asgi в отдельном процессе, клиенты —
+корутины asyncio с постоянными HTTP/1.1-соединениями. --latency
+добавляет задержку к каждому SQL-запросу сервера и имитирует сетевой
+путь до БД. Смена статуса — POST /api/orders/{id}/ready/ против
+PATCH /api/async/orders/{id}/status/, оба — условный UPDATE. Ответы
+4xx и 5xx считаются ошибками: при смене статуса это 409 для заказов,
+уже переведенных из pending, то есть UPDATE, не затронувший строку.
+
+По умолчанию используется временный файл SQLite; с --database
+postgres — временная тестовая база PostgreSQL из .env.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_async [--clients 200] [--duration 10]
+        [--orders 10000] [--latency 0] [--database sqlite|postgres]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Iterator
+
+from benchmarks.utils import print_summary
+
+HOST = "127.0.0.1"
+
+SYNC_PREFIX = "/api/"
+ASYNC_PREFIX = "/api/async/"
+
+Request = tuple[str, str, bytes]
+
+
+def build_scenarios(pks: list[int]) -> dict[str, Callable[[str], Request]]:
+    """
+    Сценарии: функция от префикса API (синхронного или асинхронного)
+    возвращает очередной запрос — метод, путь и тело.
+    """
+    pk = itertools.cycle(pks).__next__
+    status = json.dumps({"status": "ready"}).encode()
+
+    def change_status(prefix: str) -> Request:
+        if prefix == ASYNC_PREFIX:
+            return "PATCH", f"{prefix}orders/{pk()}/status/", status
+        return "POST", f"{prefix}orders/{pk()}/ready/", b""
+
+    return {
+        "список": lambda prefix: (
+            "GET",
+            f"{prefix}orders/?page_size=20",
+            b"",
+        ),
+        "заказ": lambda prefix: ("GET", f"{prefix}orders/{pk()}/", b""),
+        "выручка по дням": lambda prefix: (
+            "GET",
+            f"{prefix}orders/revenue/?group_by=day",
+            b"",
+        ),
+        "смена статуса": change_status,
+    }
+
+
+async def fetch(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    request: Request,
+) -> int:
+    """Отправляет запрос по открытому соединению и читает ответ."""
+    method, path, body = request
+    head = f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+    if body:
+        head += (
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+        )
+    writer.write(head.encode() + b"\r\n" + body)
+
+    status = int((await reader.readline()).split()[1])
+    length, chunked = 0, False
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and value == "chunked":
+            chunked = True
+    if not chunked:
+        await reader.readexactly(length)
+        return status
+    while size := int((await reader.readline()).strip(), 16):
+        await reader.readexactly(size + 2)
+    await reader.readline()
+    return status
+
+
+async def run_load(
+    port: int, clients: int, duration: float, requests: Iterator[Request]
+) -> tuple[list[float], int]:
+    """
+    Держит clients одновременных клиентов duration секунд. Возвращает
+    длительности запросов в миллисекундах и число ответов с ошибкой.
+    """
+    timings: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client() -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(HOST, port)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                status = await fetch(reader, writer, next(requests))
+                timings.append((time.perf_counter() - started) * 1000)
+                if status >= 400:
+                    errors += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return timings, errors
+
+
+def free_port() -> int:
+    """Свободный TCP-порт для сервера."""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port: int, server: subprocess.Popen) -> None:
+    """Ждет, пока uvicorn начнет принимать соединения."""
+    for _ in range(100):
+        if server.poll() is not None:
+            raise RuntimeError("Сервер uvicorn завершился при запуске.")
+        try:
+            socket.create_connection((HOST, port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Сервер uvicorn не запустился.")
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Процесс сервера: uvicorn с приложением ASGI на базе args.name."""
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    os.environ["DJANGO_ASGI"] = "True"
+
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = args.name
+    settings.ORDERS_CACHE_ENABLED = False
+    settings.DEBUG = False
+
+    import uvicorn
+    from django.core.asgi import get_asgi_application
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(args.latency / 1000)
+        return execute(sql, params, many, context)
+
+    def add_latency(sender, connection, **kwargs) -> None:
+        connection.execute_wrappers.append(delay)
+
+    if args.latency:
+        connection_created.connect(add_latency, weak=False)
+    uvicorn.run(
+        get_asgi_application(),
+        host=HOST,
+        port=args.serve,
+        log_level="warning",
+        access_log=False,
+        lifespan="off",
+    )
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument(
+        "--duration", type=float, default=10, help="секунд на сценарий"
+    )
+    parser.add_argument("--warmup", type=float, default=1)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="мс на SQL-запрос"
+    )
+    parser.add_argument(
+        "--database", choices=["postgres", "sqlite"], default="sqlite"
+    )
+    parser.add_argument(
+        "--scenario",
+        default="",
+        help="запускать только сценарии, имя которых содержит строку",
+    )
+    # Параметры процесса сервера, их передает сам бенчмарк
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--settings", help=argparse.SUPPRESS)
+    parser.add_argument("--name", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args)
+
+    from benchmarks.bench_connections import setup_sqlite
+    from benchmarks.suite import setup_database, teardown_database
+
+    old_name = None
+    directory = tempfile.TemporaryDirectory()
+    if args.database == "sqlite":
+        setup_sqlite(os.path.join(directory.name, "bench.sqlite3"))
+    else:
+        old_name = setup_database("postgres")
+    server = None
+    try:
+        from django.db import connection
+
+        from benchmarks.data import generate_orders
+        from orders.models import Order
+
+        generate_orders(args.orders, with_menu=True, progress=True)
+        pks = list(
+            Order.objects.order_by("-pk").values_list("pk", flat=True)[:500]
+        )
+        name = connection.settings_dict["NAME"]
+        connection.close()
+
+        port = free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_async",
+                "--serve",
+                str(port),
+                "--settings",
+                os.environ["DJANGO_SETTINGS_MODULE"],
+                "--name",
+                name,
+                "--latency",
+                str(args.latency),
+            ]
+        )
+        wait_for_server(port, server)
+        print(
+            f"База: {connection.vendor}, заказов: {args.orders}, "
+            f"клиентов: {args.clients}, задержка SQL: {args.latency} мс"
+        )
+
+        scenarios = build_scenarios(pks)
+        for scenario, build in scenarios.items():
+            if args.scenario not in scenario:
+                continue
+            throughput = {}
+            for variant, prefix in (
+                ("sync", SYNC_PREFIX),
+                ("async", ASYNC_PREFIX),
+            ):
+                requests = iter(lambda: build(prefix), None)
+                asyncio.run(
+                    run_load(port, args.clients, args.warmup, requests)
+                )
+                started = time.perf_counter()
+                timings, errors = asyncio.run(
+                    run_load(port, args.clients, args.duration, requests)
+                )
+                elapsed = time.perf_counter() - started
+                throughput[variant] = len(timings) / elapsed
+                print_summary(f"{scenario} ({variant})", timings)
+                print(
+                    f"{'':<40} {throughput[variant]:,.0f} запросов/с, "
+                    f"ошибок: {errors}"
+                )
+            print(
+                f"{scenario}: async / sync = "
+                f"{throughput['async'] / throughput['sync']:.2f}x\n"
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        teardown_database(old_name)
+        directory.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
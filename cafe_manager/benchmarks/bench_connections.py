@@ -0,0 +1,138 @@
+"""
+Бенчмарк переиспользования соединений с БД. Запросы к заказу в API
+идут через WSGI-обработчик Django, как под gunicorn: сигналы
+request_started и request_finished закрывают соединение по
+CONN_MAX_AGE. Режимы: без переиспользования (CONN_MAX_AGE=0),
+постоянные соединения и постоянные соединения с CONN_HEALTH_CHECKS.
+
+По умолчанию используется временная тестовая база PostgreSQL
+из .env: там открытие соединения — сетевое подключение
+и аутентификация. С --database sqlite — временный файл SQLite
+(для запуска без сервера; открыть файл намного дешевле).
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_connections [--database sqlite]
+        [--requests 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import measure, print_summary, summarize
+
+MODES = {
+    "без переиспользования": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "постоянные соединения": {
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": False,
+    },
+    "постоянные + проверка": {
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+    },
+}
+
+
+def setup_sqlite(path: str) -> None:
+    """Настраивает Django на файл SQLite и создает схему БД."""
+    os.environ["DJANGO_SETTINGS_MODULE"] = "tests.settings"
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    # База в памяти исчезает при закрытии соединения
+    connection.settings_dict["NAME"] = path
+    call_command("migrate", verbosity=0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--database", choices=["postgres", "sqlite"], default="postgres"
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    from benchmarks.suite import setup_database, teardown_database
+
+    old_name = None
+    directory = tempfile.TemporaryDirectory()
+    if args.database == "sqlite":
+        setup_sqlite(os.path.join(directory.name, "bench.sqlite3"))
+    else:
+        old_name = setup_database("postgres")
+    try:
+        from django.conf import settings
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.db import connection
+        from django.db.backends.signals import connection_created
+        from django.urls import reverse
+
+        from orders.models import Order
+
+        settings.ORDERS_CACHE_ENABLED = False
+        settings.DEBUG = False
+        order = Order.objects.create(
+            table_number=1, items=[{"name": "борщ", "price": 250}]
+        )
+        application = WSGIHandler()
+        path = reverse("api:orders-detail", args=[order.pk])
+
+        def request() -> None:
+            environ = {}
+            setup_testing_defaults(environ)
+            environ["PATH_INFO"] = path
+            statuses = []
+            response = application(
+                environ, lambda status, headers: statuses.append(status)
+            )
+            try:
+                b"".join(response)
+            finally:
+                # Как WSGI-сервер: close() отправляет request_finished
+                response.close()
+            assert statuses[0].startswith("200"), statuses
+
+        opened = 0
+
+        def count_connection(sender, connection, **kwargs) -> None:
+            nonlocal opened
+            opened += 1
+
+        connection_created.connect(count_connection)
+        print(f"База: {connection.vendor}, запросов: {args.requests}")
+        results = {}
+        for name, options in MODES.items():
+            connection.close()
+            connection.settings_dict.update(options)
+            opened = 0
+            timings = measure(request, repeat=args.requests, warmup=5)
+            print_summary(name, timings)
+            print(f"{'':<40} открыто соединений: {opened}")
+            results[name] = summarize(timings)["p50"]
+        connection.close()
+    finally:
+        teardown_database(old_name)
+        directory.cleanup()
+
+    base = results["без переиспользования"]
+    reused = results["постоянные соединения"]
+    print(
+        f"p50 без переиспользования {base:.2f} мс, "
+        f"с постоянными соединениями {reused:.2f} мс "
+        f"({base / reused:.1f}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
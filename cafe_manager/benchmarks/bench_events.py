@@ -0,0 +1,126 @@
+"""
+Нагрузочный тест потока событий заказов: N подписчиков SSE
+(по умолчанию 500) через view order_events, затем серия изменений
+заказов. Измеряется задержка доставки события каждому подписчику
+от публикации брокеру до получения из потока.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_events [--subscribers 500] [--orders 50]
+        [--interval 20]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument(
+        "--interval", type=float, default=20, help="Пауза между заказами, мс."
+    )
+    args = parser.parse_args()
+
+    setup_django()
+
+    from asgiref.sync import async_to_sync, sync_to_async
+    from django.test import AsyncClient
+    from django.urls import reverse
+
+    from benchmarks.utils import print_summary
+    from orders import events
+    from orders.models import Order
+
+    published = {}
+
+    class TimingBackend(events.LocalBackend):
+        """Запоминает время публикации каждого события."""
+
+        def publish(self, order_events: list[dict]) -> None:
+            now = time.perf_counter()
+            for event in order_events:
+                published[event["id"], event["type"]] = now
+            super().publish(order_events)
+
+    broker = events.get_broker()
+    broker.backend = TimingBackend(broker)
+
+    def change_order(number: int) -> None:
+        """Создает заказ и переводит его в ready: два события."""
+        order = Order.objects.create(
+            table_number=number % args.tables + 1,
+            items=[{"name": "чай", "price": 50}],
+        )
+        order.status = "ready"
+        order.save()
+
+    async def subscriber(response, expected: int, latencies: list) -> int:
+        received = 0
+        async for chunk in response.streaming_content:
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if not chunk.startswith("event:"):
+                continue
+            now = time.perf_counter()
+            event = json.loads(chunk.split("data: ", 1)[1])
+            latencies.append(
+                (now - published[event["id"], event["type"]]) * 1000
+            )
+            received += 1
+            if received == expected:
+                return received
+        return received
+
+    async def run() -> int:
+        client = AsyncClient()
+        url = reverse("order_events")
+        # Половина подписчиков следит за одним столом, половина — за всеми
+        responses, expected = [], []
+        total_events = args.orders * 2
+        per_table = total_events // args.tables
+        for number in range(args.subscribers):
+            if number % 2:
+                params = {"table": str(number % args.tables + 1)}
+                expected.append(per_table)
+            else:
+                params = {}
+                expected.append(total_events)
+            responses.append(await client.get(url, params))
+        print(
+            f"Подписчиков: {broker.subscribers}, заказов: {args.orders}, "
+            f"событий: {total_events}"
+        )
+
+        latencies = []
+        readers = [
+            asyncio.create_task(subscriber(response, count, latencies))
+            for response, count in zip(responses, expected)
+        ]
+        started = time.perf_counter()
+        for number in range(args.orders):
+            await sync_to_async(change_order)(number)
+            await asyncio.sleep(args.interval / 1000)
+        received = await asyncio.wait_for(asyncio.gather(*readers), 60)
+        elapsed = time.perf_counter() - started
+
+        print_summary("Задержка доставки события", latencies)
+        print(
+            f"Доставлено событий: {sum(received)} за {elapsed:.2f}s "
+            f"({sum(received) / elapsed:.0f} событий/с)"
+        )
+        if received != expected:
+            print("Ошибка: часть подписчиков получила не все события")
+            return 1
+        return 0
+
+    return async_to_sync(run)()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Микробенчмарк разбора списка блюд формы заказа: 100 000 строк
+исходным разбором (re.match с некомпилированным шаблоном, цены float)
+и parse_items_text (скомпилированная грамматика, цены Decimal).
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_items_parser [--lines 100000]
+"""
+
+import argparse
+import random
+import re
+import sys
+from decimal import Decimal
+
+from benchmarks.utils import print_summary, setup_django
+
+
+def parse_reference(text: str) -> list[dict]:
+    """Исходный OrderForm.clean_items_text без формы."""
+    items = []
+    for line in text.splitlines():
+        match = re.match(r"^(.+)\s+([\d]+(\.\d{1,2})?)$", line.strip())
+        if not match:
+            raise ValueError(line)
+        name, price = match.group(1), float(match.group(2))
+        if price <= 0:
+            raise ValueError(line)
+        items.append({"name": name, "price": price})
+    return items
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from benchmarks.data import DISHES
+    from benchmarks.utils import measure, summarize
+    from orders.items import parse_items_text
+
+    rng = random.Random(0)
+    lines = []
+    for _ in range(args.lines):
+        name, price = rng.choice(DISHES)
+        price += Decimal(rng.randint(0, 99)) / 100
+        lines.append(f"{name} {price}")
+    text = "\n".join(lines)
+
+    reference = parse_reference(text)
+    parsed = parse_items_text(text)
+    exact = sum(item["price"] for item in parsed)
+    approximate = sum(item["price"] for item in reference)
+    print(
+        f"Строк: {args.lines}, сумма Decimal: {exact}, "
+        f"сумма float: {approximate!r}"
+    )
+
+    timings = {
+        "исходный разбор (float)": measure(
+            lambda: parse_reference(text), repeat=args.repeat, warmup=1
+        ),
+        "parse_items_text (Decimal)": measure(
+            lambda: parse_items_text(text), repeat=args.repeat, warmup=1
+        ),
+    }
+    for name, values in timings.items():
+        print_summary(name, values)
+        rate = args.lines / summarize(values)["p50"] * 1000
+        print(f"{'':<40} {rate:,.0f} строк/с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
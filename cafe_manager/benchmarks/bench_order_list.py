@@ -0,0 +1,139 @@
+"""
+Рендер списка заказов: исходный шаблон order_list.html (цикл по блюдам,
+get_status_display и фильтр date в каждой строке) против текущего
+view order_list с подготовленными значениями. Обе версии рендерят
+одну страницу из 5 000 заказов, HTML должен совпадать байт в байт.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_order_list [--orders 5000]
+"""
+
+import argparse
+import sys
+
+from benchmarks.utils import setup_django
+
+# Шаблон списка заказов до оптимизации — эталон для сравнения
+REFERENCE_TEMPLATE = """\
+{% extends "base.html" %}
+
+{% block title %}Список заказов{% endblock %}
+
+{% block content %}
+<h1>Список заказов</h1>
+
+<form method="get" action="{% url 'order_list' %}">
+    <label for="q">Поиск по номеру стола, статусу (pending, ready, paid) или блюду:</label>
+    <input type="text" id="q" name="q" placeholder="1, paid или борщ">
+    <button type="submit">Найти</button>
+</form>
+
+<table>
+    <thead>
+        <tr>
+            <th>ID</th>
+            <th>Номер стола</th>
+            <th>Список блюд</th>
+            <th>Общая стоимость</th>
+            <th>Статус</th>
+            <th>Создан</th>
+            <th>Действия</th>
+        </tr>
+    </thead>
+    <tbody>
+        {% for order in orders %}
+        <tr>
+            <td>{{ order.id }}</td>
+            <td>{{ order.table_number }}</td>
+            <td>
+                <ul>
+                    {% for item in order.items %}
+                    <li>{{ item.name }}{% if item.quantity %} × {{ item.quantity }}{% endif %} — {{ item.price }} руб.</li>
+                    {% endfor %}
+                </ul>
+            </td>
+            <td>{{ order.total_price }} руб.</td>
+            <td>{{ order.get_status_display }}</td>
+            <td>{{ order.created_at|date:"d.m.Y H:i" }}</td>
+            <td>
+                <a href="{% url 'order_update' order.id %}">Изменить</a> |
+                <a href="{% url 'order_delete' order.id %}">Удалить</a>
+            </td>
+        </tr>
+        {% empty %}
+        <tr>
+            <td colspan="7">Заказы отсутствуют</td>
+        </tr>
+        {% endfor %}
+    </tbody>
+</table>
+
+{% if previous_url or next_url %}
+<nav class="pagination">
+    {% if previous_url %}<a href="{{ previous_url }}">&larr; Назад</a>{% endif %}
+    {% if next_url %}<a href="{{ next_url }}">Вперёд &rarr;</a>{% endif %}
+</nav>
+{% endif %}
+{% endblock %}
+"""
+
+
+def render_reference(request, page_size: int) -> str:
+    """Рендерит список заказов исходным шаблоном."""
+    from django.template import engines
+
+    from orders.models import Order
+    from orders.pagination import paginate
+
+    page = paginate(
+        Order.objects.prefetch_related("order_items"), None, page_size
+    )
+    template = engines["django"].from_string(REFERENCE_TEMPLATE)
+    return template.render(
+        {"orders": page.object_list, "next_url": None, "previous_url": None},
+        request,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from benchmarks.data import generate_orders
+    from benchmarks.utils import measure, print_summary
+    from orders.views import order_list
+
+    settings.ORDERS_MAX_PAGE_SIZE = args.orders
+    settings.ORDERS_CACHE_ENABLED = False
+    generate_orders(args.orders)
+    request = RequestFactory().get("/", {"page_size": args.orders})
+
+    def reference() -> str:
+        return render_reference(request, args.orders)
+
+    def current() -> str:
+        return order_list(request).content.decode()
+
+    if reference() != current():
+        print("Ошибка: HTML списка заказов отличается от эталона")
+        return 1
+
+    print(f"Заказов на странице: {args.orders}")
+    reference_timings = measure(reference, repeat=args.repeat, warmup=1)
+    current_timings = measure(current, repeat=args.repeat, warmup=1)
+    print_summary("Исходный шаблон", reference_timings)
+    print_summary("order_list", current_timings)
+    speedup = sum(reference_timings) / sum(current_timings)
+    print(f"Ускорение: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Бенчмарк endpoint'а выручки /api/orders/revenue/ на годе заказов.
+Кэш ответов выключен: каждый запрос считает выручку в БД.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_revenue [--orders 110000]
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from benchmarks.utils import print_summary, percentile, setup_django
+
+BUDGET_MS = 50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=110_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.urls import reverse
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+
+    from benchmarks.data import generate_orders
+    from benchmarks.utils import measure
+
+    # Измеряется агрегация в БД, а не ответ из кэша
+    settings.ORDERS_CACHE_ENABLED = False
+    generate_orders(args.orders, days=365)
+
+    today = timezone.localdate()
+    week_ago = (today - timedelta(days=6)).isoformat()
+    year_ago = (today - timedelta(days=364)).isoformat()
+    scenarios = {
+        "total": {},
+        "day, year": {"group_by": "day", "from": year_ago},
+        "table, year": {"group_by": "table", "from": year_ago},
+        "hour, week": {"group_by": "hour", "from": week_ago},
+        "status, week": {"group_by": "status", "from": week_ago},
+        "status, year": {"group_by": "status", "from": year_ago},
+    }
+
+    client = APIClient()
+    url = reverse("api:orders-revenue")
+    failed = []
+    print(f"Заказов: {args.orders}, бюджет p95: {BUDGET_MS} мс")
+    for name, params in scenarios.items():
+        timings = measure(lambda: client.get(url, params), repeat=args.repeat)
+        print_summary(f"revenue [{name}]", timings)
+        if percentile(timings, 95) > BUDGET_MS:
+            failed.append(name)
+
+    if failed:
+        print("Превышен бюджет:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Бенчмарк поиска заказов по блюду: первая страница списка
+(50 заказов) через индекс поиска и через сравнение подстроки
+по таблице блюд для сравнения. Редкое блюдо есть в --rare заказах.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_search [--orders 200000] [--rare 20]
+"""
+
+import argparse
+import sys
+
+from benchmarks.utils import percentile, print_summary, setup_django
+
+BUDGET_MS = 100
+PAGE_SIZE = 50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--rare", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db.models import Exists, OuterRef
+
+    from benchmarks.data import generate_orders
+    from benchmarks.utils import measure
+    from orders.models import Order, OrderItem
+    from orders.search import search_orders
+
+    generate_orders(args.orders)
+    rare = [
+        Order(table_number=1, items=[{"name": "Уха по-царски", "price": 450}])
+        for _ in range(args.rare)
+    ]
+    Order.objects.bulk_create_with_items(rare)
+
+    def indexed(text: str) -> list:
+        return list(search_orders(Order.objects.all(), text)[:PAGE_SIZE])
+
+    def substring(text: str) -> list:
+        items = OrderItem.objects.filter(
+            order=OuterRef("pk"), name__icontains=text
+        )
+        return list(Order.objects.filter(Exists(items))[:PAGE_SIZE])
+
+    failed = []
+    print(f"Заказов: {args.orders + args.rare}, бюджет p95: {BUDGET_MS} мс")
+    for text in ("борщ", "пельменей", "ухи"):
+        timings = measure(lambda: indexed(text), repeat=args.repeat)
+        print_summary(f"индекс [{text}]", timings)
+        if percentile(timings, 95) > BUDGET_MS:
+            failed.append(text)
+        timings = measure(lambda: substring(text[:3]), repeat=args.repeat)
+        print_summary(f"подстрока [{text[:3]}]", timings)
+
+    if failed:
+        print("Превышен бюджет:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
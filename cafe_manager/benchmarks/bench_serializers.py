@@ -0,0 +1,56 @@
+"""
+Сравнение OrderSerializer и быстрого OrderReadSerializer
+на сериализации списка заказов (по умолчанию 10 000).
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.bench_serializers [--orders 10000]
+"""
+
+import argparse
+import sys
+
+from benchmarks.utils import setup_django
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from api.serializers import OrderReadSerializer, OrderSerializer
+    from benchmarks.data import generate_orders
+    from benchmarks.utils import measure, print_summary
+    from orders.models import Order
+
+    generate_orders(args.orders)
+    renderer = JSONRenderer()
+
+    def full() -> bytes:
+        orders = Order.objects.prefetch_related("order_items")
+        return renderer.render(OrderSerializer(orders, many=True).data)
+
+    def fast() -> bytes:
+        rows = Order.objects.values(*OrderReadSerializer.value_fields())
+        return renderer.render(OrderReadSerializer(rows, many=True).data)
+
+    if full() != fast():
+        print("Ошибка: быстрый путь отдает другой JSON")
+        return 1
+
+    print(f"Заказов: {args.orders}")
+    full_timings = measure(full, repeat=args.repeat, warmup=1)
+    fast_timings = measure(fast, repeat=args.repeat, warmup=1)
+    print_summary("OrderSerializer", full_timings)
+    print_summary("OrderReadSerializer", fast_timings)
+    speedup = sum(full_timings) / sum(fast_timings)
+    print(f"Ускорение: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from django.utils import timezone
+
+from orders.importer import load_orders
+from orders.models import MenuItem, Order
+
+DISHES = [
+    ("борщ", Decimal("250.00")),
+    ("солянка", Decimal("280.00")),
+    ("пельмени", Decimal("320.00")),
+    ("гречка", Decimal("90.00")),
+    ("котлета", Decimal("180.00")),
+    ("салат оливье", Decimal("210.00")),
+    ("блины", Decimal("160.00")),
+    ("сырники", Decimal("190.00")),
+    ("чай", Decimal("60.00")),
+    ("кофе", Decimal("140.00")),
+    ("морс", Decimal("90.00")),
+    ("хлеб", Decimal("20.00")),
+]
+
+# Популярность блюд из DISHES: напитки и хлеб берут чаще всего
+DISH_WEIGHTS = [8, 4, 6, 5, 6, 4, 3, 3, 12, 9, 6, 10]
+
+STATUSES = ["pending", "ready", "paid"]
+STATUS_WEIGHTS = [5, 5, 90]
+
+# Число разных блюд в заказе (1..8) и количество порции (1..4)
+ITEMS_WEIGHTS = [20, 30, 22, 13, 7, 4, 3, 1]
+QUANTITY_WEIGHTS = [80, 14, 4, 2]
+
+# Заказы по часам работы кафе (10:00-22:59): пики в обед и вечером
+HOURS = list(range(10, 23))
+HOUR_WEIGHTS = [3, 5, 10, 12, 10, 5, 4, 5, 8, 11, 10, 6, 3]
+
+# Блюда, которых нет в меню (цена вводится вручную), в долях заказов
+OFF_MENU_DISHES = [
+    ("сметана", Decimal("15.00")),
+    ("уха по-царски", Decimal("450.00")),
+    ("компот домашний", Decimal("70.00")),
+]
+OFF_MENU_SHARE = 0.02
+
+
+def create_menu() -> dict[str, MenuItem]:
+    """Создает меню из DISHES (если его нет) и возвращает его по названиям."""
+    existing = {item.name: item for item in MenuItem.objects.all()}
+    missing = [
+        MenuItem(name=name, price=price)
+        for name, price in DISHES
+        if name not in existing
+    ]
+    if missing:
+        MenuItem.objects.bulk_create(missing)
+        existing = {item.name: item for item in MenuItem.objects.all()}
+    return existing
+
+
+def _created_at(rng: random.Random, today: datetime, days: int) -> datetime:
+    """Время заказа: случайный день периода и час по HOUR_WEIGHTS."""
+    day = today - timedelta(days=rng.randrange(days))
+    hour = rng.choices(HOURS, HOUR_WEIGHTS)[0]
+    created_at = day.replace(
+        hour=hour, minute=rng.randrange(60), second=rng.randrange(60)
+    )
+    return min(created_at, timezone.now())
+
+
+def _items(rng: random.Random, menu: Optional[dict]) -> list[dict]:
+    """Случайный список блюд заказа без повторов названий."""
+    count = rng.choices(range(1, 9), ITEMS_WEIGHTS)[0]
+    names = set()
+    while len(names) < count:
+        names.add(rng.choices(range(len(DISHES)), DISH_WEIGHTS)[0])
+    items = []
+    for index in sorted(names):
+        name, price = DISHES[index]
+        item = {
+            "name": name,
+            "price": price,
+            "quantity": rng.choices(range(1, 5), QUANTITY_WEIGHTS)[0],
+        }
+        if menu is not None:
+            item["menu_item"] = menu[name].pk
+        items.append(item)
+    if rng.random() < OFF_MENU_SHARE:
+        name, price = rng.choice(OFF_MENU_DISHES)
+        items.append({"name": name, "price": price, "quantity": 1})
+    return items
+
+
+def generate_orders(
+    count: int,
+    days: int = 365,
+    tables: int = 30,
+    seed: int = 0,
+    batch_size: int = 5000,
+    with_menu: bool = False,
+    progress: bool = False,
+) -> None:
+    """
+    Создает count заказов, распределенных по последним days дням
+    с пиками в обед и вечером. Блюда выбираются по популярности,
+    количество порций чаще 1; изредка встречаются блюда не из меню.
+    С with_menu блюда связываются с меню (оно создается из DISHES).
+    Одинаковый seed дает одинаковые данные. Заказы пишутся пачками
+    через load_orders(): на PostgreSQL это COPY.
+    """
+    rng = random.Random(seed)
+    today = timezone.localtime()
+    menu = create_menu() if with_menu else None
+    started = time.perf_counter()
+
+    for start in range(0, count, batch_size):
+        orders = []
+        for _ in range(min(batch_size, count - start)):
+            order = Order(
+                table_number=rng.randint(1, tables),
+                status=rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                created_at=_created_at(rng, today, days),
+            )
+            order.items = _items(rng, menu)
+            orders.append(order)
+        load_orders(orders)
+        if progress:
+            done = start + len(orders)
+            elapsed = time.perf_counter() - started
+            print(
+                f"\rСоздано заказов: {done}/{count} "
+                f"({done / elapsed:,.0f}/с)",
+                end="",
+                file=sys.stderr,
+            )
+    if progress:
+        print(file=sys.stderr)
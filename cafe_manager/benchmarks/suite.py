@@ -0,0 +1,377 @@
+"""
+Нагрузочный набор сценариев работы с заказами: список, поиск,
+создание, изменение, удаление и выручка — через HTML-страницы
+и через /api/orders/. Для каждого сценария печатает p50/p95/p99,
+пропускную способность (запросов в секунду в один поток) и число
+SQL-запросов, а с --output сохраняет результаты в JSON для
+сравнения между коммитами (--compare).
+
+Данные создаются генератором benchmarks.data с фиксированным seed,
+поэтому прогоны на одном объеме сравнимы. База — SQLite в памяти
+(по умолчанию) или временная тестовая база PostgreSQL из настроек
+проекта (--database postgres), которая удаляется после прогона.
+Кэш страниц и ответов API выключен, если не передан --cache.
+
+Запуск из каталога cafe_manager:
+    python -m benchmarks.suite [--orders 10000] [--repeat 50]
+        [--database sqlite|postgres] [--scenario api]
+        [--output results.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from itertools import count
+from typing import Callable, Optional
+
+from benchmarks.utils import print_summary, summarize
+
+SETTINGS = {
+    "sqlite": "tests.settings",
+    "postgres": "cafe_manager.settings",
+}
+
+# Допустимый рост p95 относительно сравниваемого прогона, в процентах
+DEFAULT_THRESHOLD = 20
+
+ITEMS_TEXT = "борщ x2 250\nчай 60\nхлеб x3 20"
+ITEMS = [
+    {"name": "борщ", "price": 250, "quantity": 2},
+    {"name": "чай", "price": 60},
+    {"name": "хлеб", "price": 20, "quantity": 3},
+]
+
+
+class Scenario:
+    """Сценарий: вызов клиента и ожидаемый код ответа."""
+
+    def __init__(
+        self, name: str, call: Callable[[], object], status: int
+    ) -> None:
+        self.name = name
+        self.call = call
+        self.status = status
+
+    def __call__(self) -> None:
+        response = self.call()
+        if response.status_code != self.status:
+            raise RuntimeError(
+                f"{self.name}: код ответа {response.status_code}, "
+                f"ожидался {self.status}"
+            )
+
+
+def setup_database(database: str) -> Optional[str]:
+    """
+    Настраивает Django и создает схему БД. Для PostgreSQL создается
+    отдельная тестовая база: возвращается имя исходной базы, чтобы
+    вернуть ее после прогона.
+    """
+    os.environ["DJANGO_SETTINGS_MODULE"] = SETTINGS[database]
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    if database == "postgres":
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        return old_name
+    call_command("migrate", verbosity=0)
+    return None
+
+
+def teardown_database(old_name: Optional[str]) -> None:
+    """Удаляет тестовую базу PostgreSQL, созданную setup_database()."""
+    if old_name is None:
+        return
+
+    from django.db import connection
+
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def build_scenarios(pks: list[int]) -> list[Scenario]:
+    """
+    Сценарии HTML-страниц и API. Изменение идет по кругу по заказам
+    из pks, удаление — по заказам, созданным заранее для него.
+    """
+    from django.test import Client
+    from django.urls import reverse
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+
+    from orders.models import Order
+
+    client, api = Client(), APIClient()
+    year_ago = (timezone.localdate() - timedelta(days=364)).isoformat()
+    revenue = {"group_by": "day", "from": year_ago}
+
+    def cycle(values: list[int]) -> Callable[[], int]:
+        numbers = count()
+        return lambda: values[next(numbers) % len(values)]
+
+    html_pk, api_pk = cycle(pks), cycle(pks[::-1])
+
+    def victims() -> Callable[[], int]:
+        """id заказа для удаления: заказы создаются пачкой заранее."""
+        pool: list[int] = []
+
+        def take() -> int:
+            if not pool:
+                orders = [
+                    Order(table_number=1, items=ITEMS) for _ in range(200)
+                ]
+                pool.extend(
+                    order.pk
+                    for order in Order.objects.bulk_create_with_items(orders)
+                )
+            return pool.pop()
+
+        return take
+
+    html_victim, api_victim = victims(), victims()
+    form = {"table_number": 5, "status": "pending", "items_text": ITEMS_TEXT}
+    payload = {"table_number": 5, "items": ITEMS}
+
+    return [
+        Scenario(
+            "html: список",
+            lambda: client.get(reverse("order_list")),
+            200,
+        ),
+        Scenario(
+            "html: поиск по блюду",
+            lambda: client.get(reverse("order_list"), {"q": "борщ"}),
+            200,
+        ),
+        Scenario(
+            "html: поиск по столу",
+            lambda: client.get(reverse("order_list"), {"q": "7"}),
+            200,
+        ),
+        Scenario(
+            "html: создание",
+            lambda: client.post(reverse("order_create"), form),
+            302,
+        ),
+        Scenario(
+            "html: изменение",
+            lambda: client.post(
+                reverse("order_update", args=[html_pk()]),
+                {**form, "status": "ready"},
+            ),
+            302,
+        ),
+        Scenario(
+            "html: удаление",
+            lambda: client.post(reverse("order_delete", args=[html_victim()])),
+            302,
+        ),
+        Scenario(
+            "html: выручка по дням",
+            lambda: client.get(reverse("revenue_report"), revenue),
+            200,
+        ),
+        Scenario(
+            "api: список",
+            lambda: api.get(reverse("api:orders-list")),
+            200,
+        ),
+        Scenario(
+            "api: поиск по столу",
+            lambda: api.get(reverse("api:orders-list"), {"search": "7"}),
+            200,
+        ),
+        Scenario(
+            "api: поиск по блюду",
+            lambda: api.get(reverse("api:orders-list"), {"dish": "борщ"}),
+            200,
+        ),
+        Scenario(
+            "api: создание",
+            lambda: api.post(
+                reverse("api:orders-list"), payload, format="json"
+            ),
+            201,
+        ),
+        Scenario(
+            "api: изменение",
+            lambda: api.patch(
+                reverse("api:orders-detail", args=[api_pk()]),
+                {"status": "ready", "items": ITEMS},
+                format="json",
+            ),
+            200,
+        ),
+        Scenario(
+            "api: удаление",
+            lambda: api.delete(
+                reverse("api:orders-detail", args=[api_victim()])
+            ),
+            204,
+        ),
+        Scenario(
+            "api: выручка по дням",
+            lambda: api.get(reverse("api:orders-revenue"), revenue),
+            200,
+        ),
+    ]
+
+
+def run_scenario(
+    scenario: Scenario, repeat: int, warmup: int = 3
+) -> dict[str, float]:
+    """
+    Прогоняет сценарий и возвращает сводку: перцентили и среднее
+    в миллисекундах, запросов в секунду и SQL-запросов на вызов.
+    """
+    from benchmarks.utils import measure
+    from cafe_manager.instrumentation import instrument
+
+    timings = measure(scenario, repeat=repeat, warmup=warmup)
+    with instrument() as metrics:
+        scenario()
+    print_summary(scenario.name, timings)
+    return {
+        **summarize(timings),
+        "throughput": len(timings) / (sum(timings) / 1000),
+        "queries": metrics.queries,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Текущий коммит репозитория (или None вне git)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Печатает изменение p95 по сценариям относительно baseline
+    и возвращает сценарии, где p95 вырос больше threshold процентов.
+    """
+    print(
+        f"\nСравнение с {baseline['meta'].get('commit')} "
+        f"({baseline['meta']['orders']} заказов, "
+        f"{baseline['meta']['database']}):"
+    )
+    regressions = []
+    for name, summary in results["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        change = (summary["p95"] - old["p95"]) / old["p95"] * 100
+        print(
+            f"{name:<40} p95 {old['p95']:8.2f} -> "
+            f"{summary['p95']:8.2f}ms ({change:+.0f}%)"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--database", choices=sorted(SETTINGS), default="sqlite"
+    )
+    parser.add_argument(
+        "--scenario",
+        default="",
+        help="запускать только сценарии, имя которых содержит строку",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    parser.add_argument("--compare", help="JSON прошлого прогона")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    old_name = setup_database(args.database)
+    try:
+        import django
+        from django.conf import settings
+        from django.db import connection
+
+        from benchmarks.data import generate_orders
+        from orders.models import Order
+
+        settings.ORDERS_CACHE_ENABLED = args.cache
+
+        started = time.perf_counter()
+        generate_orders(
+            args.orders, seed=args.seed, with_menu=True, progress=True
+        )
+        print(
+            f"Заказов: {args.orders}, база: {connection.vendor}, "
+            f"данные за {time.perf_counter() - started:.1f} с"
+        )
+        # Изменение ставит статус ready: берутся неоплаченные заказы
+        pks = list(
+            Order.objects.exclude(status="paid")
+            .order_by("pk")
+            .values_list("pk", flat=True)[:500]
+        )
+
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "database": connection.vendor,
+                "orders": args.orders,
+                "repeat": args.repeat,
+                "seed": args.seed,
+                "cache": args.cache,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "scenarios": {},
+        }
+        for scenario in build_scenarios(pks):
+            if args.scenario in scenario.name:
+                results["scenarios"][scenario.name] = run_scenario(
+                    scenario, args.repeat
+                )
+    finally:
+        teardown_database(old_name)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"p95 вырос больше чем на {args.threshold:.0f}%:",
+                ", ".join(regressions),
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import os
+import statistics
+import time
+from typing import Callable
+
+
+def setup_django(settings_module: str = "tests.settings") -> None:
+    """
+    Настраивает Django для запуска бенчмарка вне тестов
+    и создает схему БД миграциями.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def measure(
+    func: Callable[[], object], repeat: int = 50, warmup: int = 3
+) -> list[float]:
+    """Вызывает func repeat раз и возвращает длительности в миллисекундах."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentile(timings: list[float], percent: float) -> float:
+    """Возвращает перцентиль длительностей (метод ближайшего ранга)."""
+    ordered = sorted(timings)
+    index = max(0, round(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Сводка по длительностям: среднее и перцентили в миллисекундах."""
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+    }
+
+
+def print_summary(name: str, timings: list[float]) -> None:
+    """Печатает строку отчета по одному сценарию."""
+    summary = summarize(timings)
+    print(
+        f"{name:<40} "
+        + " ".join(f"{key}={value:8.2f}ms" for key, value in summary.items())
+    )
@@ -3,5 +3,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cafe_manager.settings")
+# Настройки соединений с БД зависят от интерфейса сервера
+os.environ["DJANGO_ASGI"] = "True"
 
 application = get_asgi_application()
@@ -0,0 +1,357 @@
+"""
+Измерение запросов: число SQL-запросов, время в БД, рендеринга
+шаблонов и сериализации ответов API. Результаты отдаются заголовком
+Server-Timing и гистограммами по именам URL в формате Prometheus.
+Включается настройкой INSTRUMENTATION_ENABLED; когда она выключена,
+middleware не подключается, запросы к БД не оборачиваются, а бэкенд
+шаблонов и /metrics/ не устанавливаются.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, PermissionDenied
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal
+from django.http import HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends import django as django_backend
+from rest_framework.response import Response
+
+# Отправляется после каждого измеренного запроса:
+# view_name (имя URL) и metrics (RequestMetrics)
+request_measured = Signal()
+
+# Границы корзин гистограмм: время в секундах и число SQL-запросов
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNRESOLVED_VIEW = "unresolved"
+
+
+class RequestMetrics:
+    """Измерения одного запроса (или блока кода в instrument())."""
+
+    __slots__ = (
+        "queries",
+        "db_time",
+        "template_time",
+        "serialization_time",
+        "started",
+        "total_time",
+    )
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.serialization_time = 0.0
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+
+    def finish(self) -> None:
+        self.total_time = time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing (длительности в мс)."""
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} SQL"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+            f"ser;dur={self.serialization_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ]
+        return ", ".join(parts)
+
+
+# Измерения текущего запроса; переменная контекста доступна
+# и в потоках sync_to_async, где асинхронные view ходят в БД
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def _record_query(execute, sql, params, many, context):
+    """Обертка выполнения SQL: считает запросы и время в БД."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+
+
+def _install_wrapper(connection) -> None:
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    _install_wrapper(connection)
+
+
+def enable_query_recording() -> None:
+    """
+    Подключает обертку SQL к соединениям: уже открытым в этом потоке
+    и ко всем новым. До вызова запросы к БД не оборачиваются.
+    """
+    connection_created.connect(
+        _on_connection_created, dispatch_uid="instrumentation"
+    )
+    for connection in connections.all():
+        _install_wrapper(connection)
+
+
+@contextmanager
+def instrument() -> Iterator[RequestMetrics]:
+    """
+    Измеряет блок кода: SQL-запросы, время в БД, рендеринг шаблонов
+    и сериализацию ответов API.
+
+        with instrument() as metrics:
+            client.get("/")
+        assert metrics.queries <= 3
+    """
+    enable_query_recording()
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+        metrics.finish()
+
+
+class Template(django_backend.Template):
+    """Шаблон, время рендеринга которого учитывается в измерениях."""
+
+    def render(self, context=None, request=None) -> str:
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """
+    Бэкенд шаблонов Django, измеряющий время рендеринга. Вложенные
+    шаблоны (extends, include) рендерятся внутри корневого и отдельно
+    не учитываются.
+    """
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django_backend.reraise(exc, self)
+
+
+class Histogram:
+    """Гистограмма Prometheus: счетчики корзин, сумма и количество."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+# Метрики запроса: имя, описание, корзины и значение из RequestMetrics
+METRICS: tuple[tuple[str, str, tuple, Callable], ...] = (
+    (
+        "cafe_request_duration_seconds",
+        "Время обработки запроса.",
+        DURATION_BUCKETS,
+        lambda metrics: metrics.total_time,
+    ),
+    (
+        "cafe_request_db_seconds",
+        "Время выполнения SQL-запросов за запрос.",
+        DURATION_BUCKETS,
+        lambda metrics: metrics.db_time,
+    ),
+    (
+        "cafe_request_template_seconds",
+        "Время рендеринга шаблонов за запрос.",
+        DURATION_BUCKETS,
+        lambda metrics: metrics.template_time,
+    ),
+    (
+        "cafe_request_serialization_seconds",
+        "Время сериализации ответа API.",
+        DURATION_BUCKETS,
+        lambda metrics: metrics.serialization_time,
+    ),
+    (
+        "cafe_request_queries",
+        "Число SQL-запросов за запрос.",
+        QUERY_BUCKETS,
+        lambda metrics: metrics.queries,
+    ),
+)
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    """Гистограммы метрик запросов по именам URL (в процессе)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+
+    def observe(self, view_name: str, metrics: RequestMetrics) -> None:
+        with self._lock:
+            for name, _, buckets, value in METRICS:
+                histogram = self._histograms.get((name, view_name))
+                if histogram is None:
+                    histogram = Histogram(buckets)
+                    self._histograms[name, view_name] = histogram
+                histogram.observe(value(metrics))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines = []
+        with self._lock:
+            for name, description, buckets, _ in METRICS:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                views = sorted(
+                    view for metric, view in self._histograms if metric == name
+                )
+                for view in views:
+                    histogram = self._histograms[name, view]
+                    label = f'view="{_escape_label(view)}"'
+                    cumulative = 0
+                    for bound, count in zip(
+                        (*buckets, "+Inf"), histogram.counts
+                    ):
+                        cumulative += count
+                        le = (
+                            bound if bound == "+Inf" else _format_number(bound)
+                        )
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{le}"}} {cumulative}'
+                        )
+                    lines.append(
+                        f"{name}_sum{{{label}}} "
+                        f"{_format_number(histogram.sum)}"
+                    )
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class InstrumentationMiddleware:
+    """
+    Измеряет каждый запрос: добавляет заголовок Server-Timing
+    и записывает метрики в гистограммы по имени URL. Время
+    сериализации — рендеринг ответов DRF (JSON, CSV и т.п.).
+    Подключается первой в MIDDLEWARE, чтобы учитывать всю обработку.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        enable_query_recording()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        with instrument() as metrics:
+            response = self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with instrument() as metrics:
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        """Засекает рендеринг ответа DRF (он идет после view)."""
+        metrics = _current.get()
+        if metrics is not None and isinstance(response, Response):
+            started = time.perf_counter()
+
+            def rendered(response: HttpResponse) -> None:
+                metrics.serialization_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+    ) -> HttpResponse:
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else UNRESOLVED_VIEW
+        response["Server-Timing"] = metrics.server_timing()
+        registry.observe(view_name, metrics)
+        request_measured.send(
+            sender=self.__class__, view_name=view_name, metrics=metrics
+        )
+        return response
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Гистограммы запросов процесса в формате Prometheus. Доступны
+    персоналу и адресам из INSTRUMENTATION_METRICS_IPS (сборщику
+    метрик), остальным — 403.
+    """
+    if (
+        request.META.get("REMOTE_ADDR")
+        not in settings.INSTRUMENTATION_METRICS_IPS
+        and not request.user.is_staff
+    ):
+        raise PermissionDenied
+    return HttpResponse(
+        registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -25,7 +25,20 @@ INSTALLED_APPS = [
     "orders",
 ]
 
+# Измерение запросов: Server-Timing и метрики Prometheus на /metrics/.
+# Бэкенд шаблонов и /metrics/ подключаются только при включенной
+# настройке; /metrics/ доступен персоналу и адресам из списка
+INSTRUMENTATION_ENABLED = (
+    os.environ.get("INSTRUMENTATION_ENABLED", "False") == "True"
+)
+
+INSTRUMENTATION_METRICS_IPS = os.environ.get(
+    "INSTRUMENTATION_METRICS_IPS", "127.0.0.1,::1"
+).split(",")
+
 MIDDLEWARE = [
+    # Первой, чтобы измерять всю обработку запроса
+    "cafe_manager.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -39,10 +52,26 @@ ROOT_URLCONF = "cafe_manager.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # С измерением запросов — DjangoTemplates, измеряющий
+        # время рендеринга шаблонов
+        "BACKEND": (
+            "cafe_manager.instrumentation.DjangoTemplates"
+            if INSTRUMENTATION_ENABLED
+            else "django.template.backends.django.DjangoTemplates"
+        ),
+        "NAME": "django",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Шаблоны компилируются один раз на процесс
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -55,6 +84,17 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "cafe_manager.wsgi.application"
 
+# Время жизни соединения с БД между запросами, в секундах:
+# 0 — закрывать после каждого запроса, None — не ограничивать
+DATABASE_CONN_MAX_AGE = os.environ.get("DATABASE_CONN_MAX_AGE", "60")
+
+# Под ASGI каждый запрос ходит в БД из своего потока sync_to_async,
+# и постоянные соединения не переиспользуются, а копятся до сборки
+# мусора. Поэтому там соединения закрываются после запроса,
+# а переиспользует их пул PgBouncer (DATABASE_PGBOUNCER)
+if os.environ.get("DJANGO_ASGI") == "True":
+    DATABASE_CONN_MAX_AGE = "0"
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -63,6 +103,46 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("DATABASE_HOST"),
         "PORT": os.environ.get("DATABASE_PORT"),
+        "CONN_MAX_AGE": (
+            None
+            if DATABASE_CONN_MAX_AGE == "None"
+            else int(DATABASE_CONN_MAX_AGE)
+        ),
+        # Проверять переиспользуемое соединение перед первым запросом
+        # в очередном запросе и переподключаться, если оно разорвано
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "True") == "True"
+        ),
+        # PgBouncer в режиме transaction не сохраняет курсоры
+        # между транзакциями: серверные курсоры нужно отключить
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.environ.get("DATABASE_PGBOUNCER", "False") == "True"
+        ),
+    }
+}
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[os.environ.get("CACHE_BACKEND", "locmem")],
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+        "TIMEOUT": None,
+        # Для locmem и file — предел числа записей, при превышении
+        # вытесняется 1/CULL_FREQUENCY записей; для Redis размер
+        # ограничивается maxmemory и политикой вытеснения сервера
+        "OPTIONS": (
+            {}
+            if os.environ.get("CACHE_BACKEND") == "redis"
+            else {
+                "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 10000)),
+                "CULL_FREQUENCY": 4,
+            }
+        ),
     }
 }
 
@@ -92,3 +172,53 @@ USE_TZ = True
 STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+ORDERS_PAGE_SIZE = int(os.environ.get("ORDERS_PAGE_SIZE", 50))
+
+ORDERS_MAX_PAGE_SIZE = int(os.environ.get("ORDERS_MAX_PAGE_SIZE", 500))
+
+ORDERS_BULK_MAX_SIZE = int(os.environ.get("ORDERS_BULK_MAX_SIZE", 1000))
+
+ORDERS_EXPORT_CHUNK_SIZE = int(
+    os.environ.get("ORDERS_EXPORT_CHUNK_SIZE", 2000)
+)
+
+ORDERS_EVENTS_BACKEND = os.environ.get(
+    "ORDERS_EVENTS_BACKEND", "orders.events.LocalBackend"
+)
+
+ORDERS_EVENTS_QUEUE_SIZE = int(
+    os.environ.get("ORDERS_EVENTS_QUEUE_SIZE", 1000)
+)
+
+ORDERS_EVENTS_KEEPALIVE = int(os.environ.get("ORDERS_EVENTS_KEEPALIVE", 15))
+
+ORDERS_EVENTS_MAX_AGE = int(os.environ.get("ORDERS_EVENTS_MAX_AGE", 300))
+
+ORDERS_CACHE_ENABLED = os.environ.get("ORDERS_CACHE_ENABLED", "True") == "True"
+
+ORDERS_CACHE_ALIAS = "default"
+
+ORDERS_CACHE_TIMEOUT = None
+
+# Архив: оплаченные заказы старше этого числа дней переносятся
+# командой archive_orders пачками по ORDERS_ARCHIVE_BATCH_SIZE
+ORDERS_ARCHIVE_AFTER_DAYS = int(
+    os.environ.get("ORDERS_ARCHIVE_AFTER_DAYS", 365)
+)
+
+ORDERS_ARCHIVE_BATCH_SIZE = int(
+    os.environ.get("ORDERS_ARCHIVE_BATCH_SIZE", 1000)
+)
+
+# Список заказов в админке: выборки больше этого числа строк
+# на PostgreSQL не считаются через COUNT(*), а оцениваются
+ORDERS_ADMIN_EXACT_COUNT_LIMIT = int(
+    os.environ.get("ORDERS_ADMIN_EXACT_COUNT_LIMIT", 100000)
+)
+
+# Принимать в заказах только блюда из меню (иначе блюдо не из меню
+# сохраняется с ценой, указанной в заказе)
+ORDERS_MENU_REQUIRED = (
+    os.environ.get("ORDERS_MENU_REQUIRED", "False") == "True"
+)
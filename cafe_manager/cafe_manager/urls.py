@@ -1,9 +1,15 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
+from cafe_manager.instrumentation import metrics_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("orders.urls")),
     path("api/", include("api.urls", namespace="api")),
 ]
+
+if settings.INSTRUMENTATION_ENABLED:
+    urlpatterns.append(path("metrics/", metrics_view, name="metrics"))
@@ -1,9 +1,205 @@
-from django.contrib import admin
-from .models import Order
+from datetime import date, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ERROR_FLAG, PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .filters import filter_query
+from .models import (
+    PREVIOUS_STATUS,
+    ArchivedOrder,
+    MenuItem,
+    Order,
+    OrderItem,
+    OrderQuerySet,
+    TableSession,
+)
+
+
+def table_row_estimate(queryset: QuerySet) -> Optional[int]:
+    """
+    Оценка числа строк таблицы из статистики PostgreSQL
+    (pg_class.reltuples) — без чтения таблицы. None, если
+    статистики еще нет (таблицу не анализировали).
+    """
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+def plan_row_estimate(queryset: QuerySet) -> int:
+    """Оценка числа строк выборки из плана запроса PostgreSQL."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+def estimated_count(queryset: QuerySet) -> int:
+    """
+    Число строк для списка в админке. На PostgreSQL большие выборки
+    не считаются через COUNT(*): для всей таблицы берется оценка
+    из pg_class.reltuples, для отфильтрованной — из плана запроса.
+    Если оценка меньше ORDERS_ADMIN_EXACT_COUNT_LIMIT, а также
+    на остальных базах (SQLite) число строк считается точно.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        if queryset.query.where:
+            estimate = plan_row_estimate(queryset)
+        else:
+            estimate = table_row_estimate(queryset)
+        if estimate and estimate >= settings.ORDERS_ADMIN_EXACT_COUNT_LIMIT:
+            return estimate
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, который на больших таблицах берет оценку числа строк."""
+
+    @cached_property
+    def count(self) -> int:
+        return estimated_count(self.object_list)
+
+
+def _periods(first: date, last: date, kind: str) -> list[date]:
+    """Начала периодов kind (year, month, day) от first до last."""
+    if kind == "year":
+        return [date(year, 1, 1) for year in range(first.year, last.year + 1)]
+    if kind == "month":
+        months = range(
+            first.year * 12 + first.month - 1, last.year * 12 + last.month
+        )
+        return [date(month // 12, month % 12 + 1, 1) for month in months]
+    return [
+        first + timedelta(days=days) for days in range((last - first).days + 1)
+    ]
+
+
+class OrderAdminQuerySet(OrderQuerySet):
+    """
+    QuerySet списка заказов в админке. Периоды для date_hierarchy
+    строятся от первой до последней даты выборки (MIN и MAX идут
+    по индексу created_at), а не через SELECT DISTINCT по всем
+    заказам; в списке могут оказаться периоды без заказов.
+    """
+
+    def datetimes(
+        self, field_name, kind, order="ASC", tzinfo=None, is_dst=None
+    ) -> list[date]:
+        bounds = self.aggregate(first=Min(field_name), last=Max(field_name))
+        if bounds["first"] is None:
+            return []
+        periods = _periods(
+            timezone.localtime(bounds["first"]).date(),
+            timezone.localtime(bounds["last"]).date(),
+            kind,
+        )
+        return periods[::-1] if order == "DESC" else periods
+
+
+class RangeFilter(admin.FieldListFilter):
+    """
+    Фильтр по диапазону значений числового поля: «от» и «до»
+    (field__gte, field__lte). В отличие от фильтра по значениям,
+    не выбирает все различные значения поля из таблицы.
+    """
+
+    template = "admin/orders/range_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_gte = f"{field_path}__gte"
+        self.lookup_lte = f"{field_path}__lte"
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    def expected_parameters(self) -> list[str]:
+        return [self.lookup_gte, self.lookup_lte]
+
+    def choices(self, changelist):
+        yield {
+            "gte": (
+                self.lookup_gte,
+                self.used_parameters.get(self.lookup_gte),
+            ),
+            "lte": (
+                self.lookup_lte,
+                self.used_parameters.get(self.lookup_lte),
+            ),
+            # Остальные параметры списка сохраняются скрытыми полями
+            "params": [
+                (name, value)
+                for name, value in changelist.params.items()
+                if name
+                not in (self.lookup_gte, self.lookup_lte, PAGE_VAR, ERROR_FLAG)
+            ],
+            "reset_url": changelist.get_query_string(
+                remove=[self.lookup_gte, self.lookup_lte]
+            ),
+        }
+
+
+def status_action(status: str, label: str):
+    """
+    Действие админки: перевести выбранные заказы в статус status
+    одним условным UPDATE. Заказы не в предыдущем статусе
+    пропускаются.
+    """
+
+    def action(modeladmin, request, queryset) -> None:
+        updated = len(queryset.advance_status(status))
+        modeladmin.message_user(
+            request, f"Статус «{label}» установлен у заказов: {updated}."
+        )
+        skipped = queryset.count() - updated
+        if skipped:
+            previous = dict(Order.STATUS_CHOICES)[PREVIOUS_STATUS[status]]
+            modeladmin.message_user(
+                request,
+                f"Пропущено заказов не в статусе «{previous}»: {skipped}.",
+                messages.WARNING,
+            )
+
+    action.__name__ = f"mark_{status}"
+    return admin.action(
+        description=f"Перевести в статус «{label}»", permissions=["change"]
+    )(action)
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    min_num = 1
+    autocomplete_fields = ("menu_item",)
+
+
+@admin.register(MenuItem)
+class MenuItemAdmin(admin.ModelAdmin):
+    list_display = ("name", "price", "is_available")
+    list_editable = ("price", "is_available")
+    list_filter = ("is_available",)
+    search_fields = ("name",)
 
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
+    """
+    Заказы в админке рассчитаны на миллионы строк: оценка числа
+    заказов вместо COUNT(*), фильтр стола диапазоном, поиск
+    по индексам и date_hierarchy без сканирования таблицы.
+    """
+
     list_display = (
         "id",
         "table_number",
@@ -11,5 +207,83 @@ class OrderAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     )
-    list_filter = ("status", "table_number")
+    list_filter = ("status", ("table_number", RangeFilter))
     search_fields = ("table_number",)
+    search_help_text = (
+        "Номер стола, код статуса (pending, ready, paid) или название блюда."
+    )
+    date_hierarchy = "created_at"
+    paginator = EstimatedCountPaginator
+    # Без второго COUNT(*) по всей таблице для «показать все»
+    show_full_result_count = False
+    actions = [
+        status_action(value, label)
+        for value, label in Order.STATUS_CHOICES
+        if value in PREVIOUS_STATUS
+    ]
+    readonly_fields = ("total_price", "version", "session")
+    inlines = (OrderItemInline,)
+
+    def get_queryset(self, request) -> OrderAdminQuerySet:
+        queryset = super().get_queryset(request)
+        return OrderAdminQuerySet(
+            model=queryset.model, query=queryset.query, using=queryset.db
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Поиск как в списке заказов: номер стола — точное совпадение
+        по индексу, код статуса — статус, иначе — блюдо по индексу
+        полнотекстового поиска. Дубликатов строк поиск не дает.
+        """
+        return filter_query(queryset, search_term.strip()), False
+
+    def save_related(self, request, form, formsets, change) -> None:
+        """Пересчитывает общую стоимость после сохранения блюд."""
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_total_price()
+
+
+@admin.register(TableSession)
+class TableSessionAdmin(admin.ModelAdmin):
+    """Счета столов только для просмотра: суммы ведут изменения заказов."""
+
+    list_display = (
+        "id",
+        "table_number",
+        "opened_at",
+        "closed_at",
+        "unpaid_total",
+        "orders_count",
+        "paid_total",
+    )
+    list_filter = (("closed_at", admin.EmptyFieldListFilter),)
+    readonly_fields = list_display[1:]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    """Архив заказов только для просмотра: его пополняет archive_orders."""
+
+    list_display = (
+        "id",
+        "table_number",
+        "total_price",
+        "created_at",
+        "archived_at",
+    )
+    list_filter = (("table_number", RangeFilter),)
+    date_hierarchy = "created_at"
+    show_full_result_count = False
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
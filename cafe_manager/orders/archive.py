@@ -0,0 +1,111 @@
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from . import cache
+from .models import ArchivedOrder, Order, OrderItem, OrderState
+from .revenue import PAID
+
+ARCHIVED_FIELDS = [
+    *OrderState._fields,
+    "version",
+    "ready_at",
+    "paid_at",
+    "session_id",
+]
+
+
+def archive_cutoff(days: Optional[int] = None) -> datetime:
+    """Граница архива: заказы, созданные раньше нее, считаются старыми."""
+    if days is None:
+        days = settings.ORDERS_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable(cutoff: datetime) -> QuerySet:
+    """Оплаченные заказы, созданные раньше cutoff."""
+    return Order.objects.filter(status=PAID, created_at__lt=cutoff)
+
+
+def _item_dicts(pks: list[int]) -> dict[int, list[dict]]:
+    """Блюда заказов в формате поля items архива."""
+    items = defaultdict(list)
+    rows = OrderItem.objects.filter(order_id__in=pks).values_list(
+        "order_id", "name", "price", "quantity", "menu_item_id"
+    )
+    for order_id, name, price, quantity, menu_item in rows.order_by("id"):
+        items[order_id].append(
+            {
+                "name": name,
+                "price": str(price),
+                "quantity": quantity,
+                "menu_item": menu_item,
+            }
+        )
+    return items
+
+
+def archive_batch(cutoff: datetime, batch_size: int) -> int:
+    """
+    Переносит в архив одну пачку старых оплаченных заказов в своей
+    короткой транзакции: строки блокируются с SKIP LOCKED, так что
+    заказы, которые сейчас кто-то меняет, остаются до следующего
+    прохода, а остальные запросы не ждут архивации.
+
+    Заказы и их блюда удаляются без сигналов orders_changed:
+    оплаченный заказ уже учтен в агрегатах выручки, в открытых
+    сессиях и на доске его нет, а в архиве он остается для пересчета
+    выручки. Сбрасывается только кэш ответов. Возвращает число
+    перенесенных заказов.
+    """
+    with transaction.atomic():
+        rows = list(
+            archivable(cutoff)
+            .select_for_update(skip_locked=True)
+            .order_by("created_at", "id")
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        pks = [row["id"] for row in rows]
+        items = _item_dicts(pks)
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder(items=items[row["id"]], **row) for row in rows]
+        )
+        using = router.db_for_write(Order)
+        OrderItem.objects.filter(order_id__in=pks)._raw_delete(using)
+        Order.objects.filter(pk__in=pks)._raw_delete(using)
+        cache.invalidate(
+            [
+                (OrderState(*(row[f] for f in OrderState._fields)), None)
+                for row in rows
+            ]
+        )
+    return len(rows)
+
+
+def archive_orders(
+    days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause: float = 0,
+) -> int:
+    """
+    Переносит в архив все оплаченные заказы старше days дней
+    пачками по batch_size, делая паузу pause секунд между пачками.
+    Возвращает число перенесенных заказов.
+    """
+    cutoff = archive_cutoff(days)
+    batch_size = batch_size or settings.ORDERS_ARCHIVE_BATCH_SIZE
+    archived = 0
+    while count := archive_batch(cutoff, batch_size):
+        archived += count
+        if count < batch_size:
+            break
+        time.sleep(pause)
+    return archived
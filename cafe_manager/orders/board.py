@@ -0,0 +1,122 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from .models import BoardRevision, Order, OrderState
+
+OPEN_STATUSES = ("pending", "ready")
+
+Change = tuple[Optional[OrderState], Optional[OrderState]]
+
+
+class Revision(NamedTuple):
+    """Версия доски открытых заказов и время ее изменения."""
+
+    version: int
+    updated_at: Optional[datetime]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+def _is_open(state: Optional[OrderState]) -> bool:
+    return state is not None and state.status in OPEN_STATUSES
+
+
+def apply_changes(changes: list[Change]) -> None:
+    """
+    Увеличивает версии доски для столов, на которых появился,
+    изменился или исчез открытый заказ, и общую версию доски.
+    Изменения оплаченных заказов доску не затрагивают.
+    """
+    tables = set()
+    for old, new in changes:
+        if not (_is_open(old) or _is_open(new)):
+            continue
+        for state in (old, new):
+            if state is not None:
+                tables.add(state.table_number)
+    if not tables:
+        return
+    now = timezone.now()
+    keys = [BoardRevision.ALL_TABLES, *tables]
+    rows = BoardRevision.objects.filter(table_number__in=keys)
+    values = {"version": F("version") + 1, "updated_at": now}
+    if rows.update(**values) == len(keys):
+        return
+    # Недостающие строки создаются с нулевой версией; повторный UPDATE
+    # увеличивает и их, и (еще раз) уже существующие — версии лишь
+    # должны меняться, а не идти подряд
+    BoardRevision.objects.bulk_create(
+        [BoardRevision(table_number=key, updated_at=now) for key in keys],
+        ignore_conflicts=True,
+    )
+    rows.update(**values)
+
+
+def get_revision(table_number: Optional[int] = None) -> Revision:
+    """
+    Версия доски стола (или всех столов) — один запрос
+    по уникальному индексу.
+    """
+    if table_number is None:
+        table_number = BoardRevision.ALL_TABLES
+    row = (
+        BoardRevision.objects.filter(table_number=table_number)
+        .values_list("version", "updated_at")
+        .first()
+    )
+    return Revision(*row) if row else Revision(0, None)
+
+
+def open_orders(table_number: Optional[int] = None) -> QuerySet:
+    """Открытые заказы (стола) в порядке поступления."""
+    orders = Order.objects.filter(status__in=OPEN_STATUSES)
+    if table_number is not None:
+        orders = orders.filter(table_number=table_number)
+    return orders.order_by("created_at", "id")
+
+
+def group_by_table(orders) -> list[dict]:
+    """
+    Группирует заказы (модели или строки values()) по столам:
+    [{"table_number": 1, "orders": [...]}, ...].
+    """
+    tables = {}
+    for order in orders:
+        if isinstance(order, dict):
+            table_number = order["table_number"]
+        else:
+            table_number = order.table_number
+        tables.setdefault(table_number, []).append(order)
+    return [
+        {"table_number": table_number, "orders": tables[table_number]}
+        for table_number in sorted(tables)
+    ]
+
+
+def requested_table(request) -> Optional[int]:
+    """Номер стола из параметра ?table= (None — все столы)."""
+    table = request.GET.get("table", "")
+    return int(table) if table.isdigit() else None
+
+
+def request_revision(request) -> Revision:
+    """
+    Версия доски для запроса. Запоминается в запросе, чтобы ETag
+    и Last-Modified брались из одного и того же запроса к базе.
+    """
+    if not hasattr(request, "_board_revision"):
+        request._board_revision = get_revision(requested_table(request))
+    return request._board_revision
+
+
+def request_etag(request, *args, **kwargs) -> str:
+    return request_revision(request).etag
+
+
+def request_last_modified(request, *args, **kwargs) -> Optional[datetime]:
+    return request_revision(request).updated_at
@@ -0,0 +1,190 @@
+import hashlib
+import threading
+import uuid
+from collections import Counter
+from functools import partial, wraps
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+
+from .models import OrderState
+
+Change = tuple[Optional[OrderState], Optional[OrderState]]
+
+# Поколение всех заказов; у каждого стола есть и свое поколение
+ALL_ORDERS = "all"
+
+_MISSING = object()
+
+
+def get_cache():
+    return caches[settings.ORDERS_CACHE_ALIAS]
+
+
+def table_scope(table_number: int) -> str:
+    return f"table:{table_number}"
+
+
+def _generation_key(scope: str) -> str:
+    return f"orders:generation:{scope}"
+
+
+def _new_token() -> str:
+    """
+    Новое поколение — случайная метка, а не счетчик: если метку
+    вытеснят из кэша или две записи заменят ее одновременно,
+    новая все равно не совпадет ни с одной из прежних.
+    """
+    return uuid.uuid4().hex[:16]
+
+
+def get_generation(scopes: Iterable[str]) -> str:
+    """Текущие поколения областей одной строкой для ключа кэша."""
+    cache = get_cache()
+    keys = [_generation_key(scope) for scope in scopes]
+    tokens = cache.get_many(keys)
+    for key in keys:
+        if key not in tokens:
+            cache.add(key, _new_token(), timeout=None)
+            tokens[key] = cache.get(key) or _new_token()
+    return ".".join(tokens[key] for key in keys)
+
+
+def bump_scopes(scopes: Iterable[str]) -> None:
+    """Меняет поколения областей."""
+    get_cache().set_many(
+        {_generation_key(scope): _new_token() for scope in scopes},
+        timeout=None,
+    )
+
+
+def bump(tables: Iterable[int]) -> None:
+    """Меняет поколение всех заказов и поколения столов."""
+    bump_scopes([ALL_ORDERS, *(table_scope(table) for table in tables)])
+
+
+def invalidate(changes: list[Change]) -> None:
+    """
+    Сбрасывает кэш для изменившихся заказов: сразу (чтобы изменения
+    видела своя транзакция) и еще раз после фиксации, чтобы ответы,
+    закэшированные параллельными запросами до фиксации, не пережили ее.
+    """
+    tables = {
+        state.table_number
+        for change in changes
+        for state in change
+        if state is not None
+    }
+    bump(tables)
+    transaction.on_commit(partial(bump, tables))
+
+
+class CacheStats:
+    """Счетчики попаданий и промахов кэша по именам ответов (в процессе)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def record(self, name: str, hit: bool) -> None:
+        with self._lock:
+            (self.hits if hit else self.misses)[name] += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                name: {"hits": self.hits[name], "misses": self.misses[name]}
+                for name in sorted(self.hits.keys() | self.misses.keys())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+stats = CacheStats()
+
+
+def make_key(name: str, scopes: Iterable[str], params: str) -> str:
+    """Ключ ответа: имя, поколения областей и хэш параметров запроса."""
+    digest = hashlib.sha1(params.encode()).hexdigest()
+    return f"orders:{name}:{get_generation(scopes)}:{digest}"
+
+
+def request_params(request: HttpRequest) -> str:
+    """
+    Параметры GET-запроса в каноническом порядке. Ключи и значения
+    кодируются, поэтому «&» и «=» внутри значения не совпадают
+    с разделителями параметров.
+    """
+    return urlencode(sorted(request.GET.lists()), doseq=True)
+
+
+def get_or_set(
+    name: str,
+    scopes: Iterable[str],
+    params: str,
+    compute: Callable[[], Any],
+    cacheable: Callable[[Any], bool] = lambda value: True,
+) -> Any:
+    """
+    Возвращает значение из кэша или вычисляет и сохраняет его.
+    Записи не устаревают по времени: их делает недоступными
+    смена поколения, а место освобождает вытеснение бэкенда кэша.
+    """
+    if not settings.ORDERS_CACHE_ENABLED:
+        return compute()
+    cache = get_cache()
+    key = make_key(name, scopes, params)
+    value = cache.get(key, _MISSING)
+    stats.record(name, hit=value is not _MISSING)
+    if value is _MISSING:
+        value = compute()
+        if cacheable(value):
+            cache.set(key, value, timeout=settings.ORDERS_CACHE_TIMEOUT)
+    return value
+
+
+def cache_view(
+    name: str, scopes: Callable[[HttpRequest], list[str]]
+) -> Callable:
+    """
+    Кэширует успешные ответы GET функционального view по параметрам
+    запроса и поколениям областей, которые возвращает scopes(request).
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method != "GET":
+                return view(request, *args, **kwargs)
+            response = None
+
+            def compute() -> Optional[tuple[bytes, str]]:
+                nonlocal response
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return None
+                return response.content, response["Content-Type"]
+
+            cached = get_or_set(
+                name,
+                scopes(request),
+                request_params(request),
+                compute,
+                cacheable=lambda value: value is not None,
+            )
+            if response is not None:
+                return response
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        return wrapper
+
+    return decorator
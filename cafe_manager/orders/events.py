@@ -0,0 +1,232 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import cache
+from typing import AsyncIterator, Iterable, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+from .models import OrderState
+
+Change = tuple[Optional[OrderState], Optional[OrderState]]
+
+CREATED = "created"
+UPDATED = "updated"
+STATUS_CHANGED = "status_changed"
+DELETED = "deleted"
+
+
+def _state_data(state: OrderState) -> dict:
+    return {
+        "id": state.id,
+        "table_number": state.table_number,
+        "status": state.status,
+        "total_price": f"{state.total_price:.2f}",
+        "created_at": state.created_at,
+    }
+
+
+def events_from_changes(changes: Iterable[Change]) -> list[dict]:
+    """
+    Превращает изменения заказов в события для подписчиков:
+    created, updated, status_changed и deleted. У изменений
+    существующего заказа есть прежние стол и статус.
+    """
+    events = []
+    for old, new in changes:
+        if old is None:
+            events.append({"type": CREATED, **_state_data(new)})
+            continue
+        if new is None:
+            events.append({"type": DELETED, **_state_data(old)})
+            continue
+        event_type = STATUS_CHANGED if old.status != new.status else UPDATED
+        events.append(
+            {
+                "type": event_type,
+                **_state_data(new),
+                "previous_status": old.status,
+                "previous_table_number": old.table_number,
+            }
+        )
+    return events
+
+
+class Subscription:
+    """
+    Подписка одного клиента: очередь событий в его цикле asyncio
+    и фильтры по столам и статусам (пустой фильтр — все).
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[int] = (),
+        statuses: Iterable[str] = (),
+        maxsize: Optional[int] = None,
+    ) -> None:
+        self.tables = frozenset(tables)
+        self.statuses = frozenset(statuses)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(
+            maxsize or settings.ORDERS_EVENTS_QUEUE_SIZE
+        )
+        self.overflowed = False
+
+    def matches(self, event: dict) -> bool:
+        """
+        Проверяет фильтры: событие подходит, если стол или статус
+        заказа подходят до или после изменения.
+        """
+        if self.tables and not self.tables & {
+            event["table_number"],
+            event.get("previous_table_number"),
+        }:
+            return False
+        if self.statuses and not self.statuses & {
+            event["status"],
+            event.get("previous_status"),
+        }:
+            return False
+        return True
+
+    def put(self, events: list[dict]) -> None:
+        """
+        Кладет подходящие события в очередь (вызывается в цикле
+        подписчика). Если клиент не успевает читать, очередь
+        очищается и поток событий закрывается: клиент переподключится
+        и перечитает актуальное состояние.
+        """
+        if self.overflowed:
+            return
+        for event in events:
+            if not self.matches(event):
+                continue
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(None)
+                return
+
+
+class LocalBackend:
+    """
+    Транспорт событий внутри одного процесса: опубликованные события
+    сразу раздаются подписчикам брокера. Транспорт между процессами
+    (Redis, LISTEN/NOTIFY) реализует тот же метод publish и вызывает
+    broker.deliver() в каждом процессе.
+    """
+
+    def __init__(self, broker: "Broker") -> None:
+        self.broker = broker
+
+    def publish(self, events: list[dict]) -> None:
+        self.broker.deliver(events)
+
+
+class Broker:
+    """
+    Раздает события изменений заказов подписчикам процесса.
+    Публикация может идти из любого потока (синхронные view, команды),
+    события передаются в цикл asyncio подписчиков одним вызовом
+    на цикл.
+    """
+
+    def __init__(self, backend: Optional[str] = None) -> None:
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+        backend_class = import_string(
+            backend or settings.ORDERS_EVENTS_BACKEND
+        )
+        self.backend = backend_class(self)
+
+    def subscribe(
+        self, tables: Iterable[int] = (), statuses: Iterable[str] = ()
+    ) -> Subscription:
+        """Создает подписку в текущем цикле asyncio."""
+        subscription = Subscription(tables, statuses)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, events: list[dict]) -> None:
+        """Отправляет события через транспорт."""
+        if events:
+            self.backend.publish(events)
+
+    def deliver(self, events: list[dict]) -> None:
+        """Раздает полученные от транспорта события подписчикам."""
+        by_loop = defaultdict(list)
+        with self._lock:
+            for subscription in self._subscriptions:
+                by_loop[subscription.loop].append(subscription)
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_put_all, subscriptions, events)
+            except RuntimeError:
+                # Цикл подписчиков уже закрыт
+                with self._lock:
+                    self._subscriptions.difference_update(subscriptions)
+
+
+def _put_all(subscriptions: list[Subscription], events: list[dict]) -> None:
+    for subscription in subscriptions:
+        subscription.put(events)
+
+
+@cache
+def get_broker() -> Broker:
+    """Брокер событий процесса."""
+    return Broker()
+
+
+def format_event(event: dict) -> str:
+    """Форматирует событие для text/event-stream."""
+    data = json.dumps(event, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+async def stream_events(
+    subscription: Subscription,
+    broker: Broker,
+    keepalive: Optional[float] = None,
+    max_age: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Поток Server-Sent Events для подписки. Раз в keepalive секунд
+    отправляется комментарий, чтобы прокси не закрывали соединение;
+    через max_age секунд поток завершается и браузер переподключается
+    сам — так подписки отключившихся клиентов не живут вечно.
+    """
+    keepalive = keepalive or settings.ORDERS_EVENTS_KEEPALIVE
+    max_age = max_age or settings.ORDERS_EVENTS_MAX_AGE
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    try:
+        yield "retry: 1000\n\n"
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), min(keepalive, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,43 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import Order
+from .search import search_orders
+
+
+def filter_query(queryset: QuerySet, query: Optional[str]) -> QuerySet:
+    """
+    Поиск из списка заказов: число — номер стола, код статуса —
+    статус заказа, иначе — название блюда.
+    """
+    if not query:
+        return queryset
+    if query.isdigit():
+        return queryset.filter(table_number=query)
+    if query in dict(Order.STATUS_CHOICES):
+        return queryset.filter(status=query)
+    return search_orders(queryset, query)
+
+
+def filter_period(
+    queryset: QuerySet,
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> QuerySet:
+    """Заказы, созданные за период (границы включительно)."""
+    if date_from:
+        queryset = queryset.filter(
+            created_at__gte=timezone.make_aware(
+                datetime.combine(date_from, time.min)
+            )
+        )
+    if date_to:
+        queryset = queryset.filter(
+            created_at__lt=timezone.make_aware(
+                datetime.combine(date_to + timedelta(days=1), time.min)
+            )
+        )
+    return queryset
@@ -1,8 +1,13 @@
-import re
+from typing import Any
 
 from django import forms
+from django.db.models import QuerySet
 
-from .models import Order
+from .filters import filter_period, filter_query
+from .items import format_item_line, parse_items_text
+from .menu import get_menu, price_items
+from .models import Order, can_change_status
+from .revenue import GROUP_BY_CHOICES
 
 
 class OrderForm(forms.ModelForm):
@@ -16,11 +21,23 @@ class OrderForm(forms.ModelForm):
         widget=forms.Textarea(
             attrs={
                 "rows": 5,
-                "placeholder": "борщ 100\nгречка 20\nсметана 15.0\nрис 25.70",
+                "placeholder": (
+                    "борщ 100\nгречка 20\nсметана 15.0\nрис 25.70\nхлеб x3 5"
+                ),
             }
         ),
         required=True,
-        help_text="Введите список блюд с ценами",
+        help_text=(
+            "Введите список блюд с ценами, количество — через x "
+            "(«хлеб x3 5»); для блюд из меню цену можно не указывать — "
+            "она берется из меню"
+        ),
+    )
+
+    version = forms.IntegerField(
+        widget=forms.HiddenInput,
+        required=False,
+        min_value=1,
     )
 
     class Meta:
@@ -34,40 +51,122 @@ class OrderForm(forms.ModelForm):
         """
         super().__init__(*args, **kwargs)
         if self.instance and self.instance.pk:
+            self.fields["version"].initial = self.instance.version
+            # Только текущий статус и следующий за ним
+            self.fields["status"].choices = [
+                (value, label)
+                for value, label in Order.STATUS_CHOICES
+                if can_change_status(self.instance.status, value)
+            ]
             items = self.instance.items
             if items:
                 # Преобразуем JSON в построчный текст
                 self.fields["items_text"].initial = "\n".join(
-                    f"{item['name']} {item['price']}" for item in items
+                    format_item_line(item) for item in items
                 )
         self.fields["table_number"].widget.attrs.update({"min": 1})
 
-    def clean_items_text(self) -> list[dict[str, float]]:
+    def clean_items_text(self) -> list[dict[str, Any]]:
         """
         Проверяет и преобразует введенный текст
-        в список словарей с блюдами и ценами.
+        в список словарей с блюдами и ценами (цены блюд из меню
+        берутся из меню).
         """
-        data = self.cleaned_data["items_text"]
-        items = []
-        for line in data.splitlines():
-            match = re.match(r"^(.+)\s+([\d]+(\.\d{1,2})?)$", line.strip())
-            if not match:
-                raise forms.ValidationError(
-                    f"Некорректный формат строки: '{line}'. "
-                    "Ожидается примерно следующее 'сметана 50'."
-                )
-            name, price = match.group(1), float(match.group(2))
-            if price <= 0:
-                raise forms.ValidationError("Цена блюда должна быть больше 0.")
-            items.append({"name": name, "price": price})
-        return items
+        menu = get_menu()
+        return price_items(
+            parse_items_text(self.cleaned_data["items_text"], menu)
+        )
+
+    def is_stale(self) -> bool:
+        """
+        Форма открыта до чужого изменения заказа: версия в ней
+        не совпадает с текущей версией заказа.
+        """
+        version = getattr(self, "cleaned_data", {}).get("version")
+        return bool(
+            self.instance.pk and version and version != self.instance.version
+        )
 
     def save(self, commit: bool = True) -> Order:
         """
         Сохраняет форму, преобразуя текст блюд в JSON
-        и вычисляя общую цену заказа.
+        и вычисляя общую цену заказа. Заказ изменяется, только если
+        его версия совпадает с версией, открытой в форме; иначе
+        выбрасывается OrderVersionConflict.
         """
+        version = self.cleaned_data.get("version")
+        if self.instance.pk and version:
+            self.instance.version = version
         items = self.cleaned_data.get("items_text", [])
         self.instance.items = items
         self.instance.calculate_total_price()
         return super().save(commit=commit)
+
+
+class PeriodForm(forms.Form):
+    """Базовая форма с периодом from–to (даты включительно)."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Добавляет поля периода: "from" — зарезервированное слово Python,
+        поэтому их нельзя объявить атрибутами класса.
+        """
+        super().__init__(*args, **kwargs)
+        self.fields["from"] = forms.DateField(
+            label="С",
+            required=False,
+            widget=forms.DateInput(attrs={"type": "date"}),
+        )
+        self.fields["to"] = forms.DateField(
+            label="По",
+            required=False,
+            widget=forms.DateInput(attrs={"type": "date"}),
+        )
+
+    def clean(self) -> dict:
+        """Проверяет, что начало периода не позже его конца."""
+        cleaned_data = super().clean()
+        date_from, date_to = cleaned_data.get("from"), cleaned_data.get("to")
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError(
+                "Начало периода должно быть не позже его конца."
+            )
+        return cleaned_data
+
+
+class RevenueReportForm(PeriodForm):
+    """
+    Параметры отчета о выручке: период (from, to) и группировка.
+    Используется и HTML-отчетом, и endpoint'ом API.
+    """
+
+    group_by = forms.ChoiceField(
+        label="Группировка",
+        choices=[("", "Без группировки")] + GROUP_BY_CHOICES,
+        required=False,
+    )
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.order_fields(["from", "to", "group_by"])
+
+
+class OrderFilterForm(PeriodForm):
+    """
+    Фильтры списка заказов: поиск q (номер стола, статус или блюдо),
+    статус и период. Используются списком заказов и выгрузкой.
+    """
+
+    q = forms.CharField(required=False)
+    status = forms.ChoiceField(
+        choices=[("", "Все")] + Order.STATUS_CHOICES,
+        required=False,
+    )
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        """Применяет к заказам фильтры, прошедшие проверку."""
+        data = self.cleaned_data if self.is_valid() else {}
+        queryset = filter_query(queryset, data.get("q"))
+        if data.get("status"):
+            queryset = queryset.filter(status=data["status"])
+        return filter_period(queryset, data.get("from"), data.get("to"))
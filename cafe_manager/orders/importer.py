@@ -0,0 +1,188 @@
+import csv
+import io
+import json
+from typing import Any, Iterator, TextIO
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .items import parse_items_text, validate_items
+from .models import Order, OrderItem, _take_pending_items
+from .signals import orders_changed
+
+FORMAT_CHOICES = ["csv", "ndjson"]
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[tuple[int, Any]]:
+    """
+    Читает исходные строки потоком и возвращает пары
+    (номер строки в файле, строка). Для NDJSON строка — результат
+    json.loads (или None, если строку не удалось разобрать).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_num, None
+
+
+def parse_items_cell(value: str) -> list[dict]:
+    """
+    Разбирает ячейку items из CSV-выгрузки:
+    "борщ 100.00; хлеб x3 5.00" — строки в формате ввода заказа.
+    """
+    return parse_items_text(value, separator=";")
+
+
+def build_order(row: Any) -> Order:
+    """
+    Проверяет исходную строку и создает несохраненный заказ.
+    Блюда проверяются теми же правилами, что в форме (текст)
+    и в API (JSON); общая стоимость считается при загрузке пачки.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError("Строка не является объектом заказа.")
+
+    items = row.get("items")
+    if isinstance(items, str):
+        items = parse_items_cell(items)
+    else:
+        items = validate_items(items)
+
+    table_number = Order._meta.get_field("table_number").clean(
+        row.get("table_number"), None
+    )
+    status = Order._meta.get_field("status").clean(
+        row.get("status") or "pending", None
+    )
+    created_at = timezone.now()
+    if row.get("created_at"):
+        created_at = Order._meta.get_field("created_at").to_python(
+            row["created_at"]
+        )
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+
+    order = Order(
+        table_number=table_number, status=status, created_at=created_at
+    )
+    # Когда заказ получил статус, в истории неизвестно: берется
+    # время создания
+    order.stamp_status(created_at)
+    order.items = items
+    return order
+
+
+def _copy(cursor, table: str, columns: list[str], rows: list[list]) -> None:
+    """Записывает строки в таблицу через COPY FROM STDIN (CSV)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    sql = "COPY %s (%s) FROM STDIN WITH (FORMAT csv)" % (
+        table,
+        ", ".join(columns),
+    )
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy_expert"):
+        # psycopg2
+        buffer.seek(0)
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        # psycopg 3
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _copy_orders(orders: list[Order], using: str) -> list[Order]:
+    """
+    Загружает заказы и блюда через COPY. id заказов берутся
+    из последовательности заранее, чтобы привязать к ним блюда.
+    """
+    connection = connections[using]
+    order_table = Order._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+            "FROM generate_series(1, %s)",
+            [order_table, len(orders)],
+        )
+        for order, (pk,) in zip(orders, cursor.fetchall()):
+            order.pk = pk
+            order._state.adding = False
+            order._state.db = using
+        _copy(
+            cursor,
+            order_table,
+            [
+                "id",
+                "table_number",
+                "total_price",
+                "status",
+                "created_at",
+                "ready_at",
+                "paid_at",
+                "version",
+            ],
+            [
+                [
+                    order.pk,
+                    order.table_number,
+                    order.total_price,
+                    order.status,
+                    order.created_at.isoformat(),
+                    order.ready_at and order.ready_at.isoformat(),
+                    order.paid_at and order.paid_at.isoformat(),
+                    order.version,
+                ]
+                for order in orders
+            ],
+        )
+        _copy(
+            cursor,
+            OrderItem._meta.db_table,
+            ["order_id", "menu_item_id", "name", "price", "quantity"],
+            [
+                [
+                    item.order_id,
+                    item.menu_item_id,
+                    item.name,
+                    item.price,
+                    item.quantity,
+                ]
+                for item in _take_pending_items(orders)
+            ],
+        )
+    # COPY минует ORM: сообщаем об изменениях сами
+    for order in orders:
+        order._loaded_state = order.get_state()
+    orders_changed.send(
+        sender=Order,
+        changes=[(None, order._loaded_state) for order in orders],
+        publish=False,
+    )
+    return orders
+
+
+def load_orders(orders: list[Order], using: str = "default") -> list[Order]:
+    """
+    Записывает пачку заказов с блюдами в одной транзакции:
+    на PostgreSQL через COPY FROM STDIN, на остальных базах
+    через bulk_create_with_items. Агрегаты выручки, сессии и доска
+    обновляются, но события подписчикам /events/ не публикуются:
+    исторические заказы не должны приходить на доску как новые.
+    """
+    with transaction.atomic(using=using):
+        if connections[using].vendor == "postgresql":
+            for order in orders:
+                order.calculate_total_price()
+            return _copy_orders(orders, using)
+        return Order.objects.using(using).bulk_create_with_items(
+            orders, publish=False
+        )
@@ -0,0 +1,162 @@
+import re
+from decimal import Decimal
+from typing import Any, Optional
+
+from django.core.exceptions import ValidationError
+
+from .menu import MenuCache
+
+# Грамматика строки блюда: <название> [x<количество>] [<цена>],
+# например "борщ 100" или "хлеб x3 5.50". Строка делится на токены
+# с конца, и каждый токен проверяется своим скомпилированным шаблоном:
+# это быстрее одного шаблона с ленивым названием, которому пришлось бы
+# перебирать позиции внутри названия. У блюда из меню цену можно
+# не указывать: "борщ", "борщ x2"
+PRICE_RE = re.compile(r"\d+(?:\.\d{1,2})?")
+QUANTITY_RE = re.compile(r"[xXхХ×](\d+)")
+
+# Точность цены: копейки
+CENT = Decimal("0.01")
+
+FORMAT_ERROR = (
+    "Некорректный формат строки: '{line}'. "
+    "Ожидается примерно следующее 'сметана 50' или 'хлеб x3 5.50'."
+)
+PRICE_ERROR = "Цена блюда должна быть больше 0."
+QUANTITY_ERROR = "Количество блюда должно быть целым числом больше 0."
+
+
+def parse_item_line(
+    line: str, menu: Optional[MenuCache] = None
+) -> dict[str, Any]:
+    """
+    Разбирает строку вида "сметана 50" или "хлеб x3 5.50" в словарь
+    блюда с ценой Decimal. Если передано меню, строка может
+    не содержать цену блюда из меню: ее назначит price_items().
+    """
+    line = line.strip()
+    parts = line.rsplit(None, 1)
+    if len(parts) == 2 and PRICE_RE.fullmatch(parts[1]):
+        name, price = parts[0], Decimal(parts[1])
+        if not price:
+            raise ValidationError(PRICE_ERROR)
+        item = {"name": name, "price": price}
+    else:
+        name, item = line, {"name": line}
+    # Количество оканчивается цифрой, названия блюд — почти никогда
+    if name and name[-1].isdigit():
+        parts = name.rsplit(None, 1)
+        match = len(parts) == 2 and QUANTITY_RE.fullmatch(parts[1])
+        if match:
+            item["name"] = parts[0]
+            item["quantity"] = int(match[1])
+            if not item["quantity"]:
+                raise ValidationError(QUANTITY_ERROR)
+    if "price" not in item and (
+        menu is None or menu.get(item["name"]) is None
+    ):
+        raise ValidationError(FORMAT_ERROR.format(line=line))
+    return item
+
+
+def parse_items_text(
+    text: str,
+    menu: Optional[MenuCache] = None,
+    separator: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Разбирает список блюд за один проход: построчно или, если задан
+    separator, по частям через него. Пустые части пропускаются;
+    ошибки всех частей собираются в одну ValidationError с номерами.
+    """
+    if separator is None:
+        lines, label = text.splitlines(), "Строка"
+    else:
+        lines, label = text.split(separator), "Блюдо"
+    items, errors = [], []
+    for number, line in enumerate(lines, start=1):
+        if not line or line.isspace():
+            continue
+        try:
+            items.append(parse_item_line(line, menu))
+        except ValidationError as error:
+            errors.extend(
+                f"{label} {number}: {message}" for message in error.messages
+            )
+    if errors:
+        raise ValidationError(errors)
+    if not items:
+        raise ValidationError("Список блюд не может быть пустым.")
+    return items
+
+
+def format_item_line(item: dict) -> str:
+    """Строка блюда в формате ввода: обратное parse_item_line()."""
+    quantity = item.get("quantity", 1)
+    if quantity != 1:
+        return f"{item['name']} x{quantity} {item['price']}"
+    return f"{item['name']} {item['price']}"
+
+
+def _validate_item(item: Any) -> dict[str, Any]:
+    """Проверяет одно блюдо в формате JSON и приводит цену к Decimal."""
+    if not isinstance(item, dict) or "name" not in item:
+        raise ValidationError(
+            "Каждый элемент списка должен содержать 'name' и 'price'."
+        )
+    name, price = item["name"], item.get("price")
+    if not isinstance(name, str) or (
+        price is not None
+        and (
+            isinstance(price, bool)
+            or not isinstance(price, (int, float, Decimal))
+        )
+    ):
+        raise ValidationError(
+            "Поле 'name' должно быть строкой, а 'price' числом."
+        )
+    result = {"name": name}
+    if price is not None:
+        # float из JSON переводится через строку: Decimal(0.1) неточен
+        price = Decimal(str(price) if isinstance(price, float) else price)
+        if price <= 0:
+            raise ValidationError(PRICE_ERROR)
+        if price != price.quantize(CENT):
+            raise ValidationError(
+                "Цена блюда должна содержать не больше двух знаков "
+                "после запятой."
+            )
+        result["price"] = price
+    if "quantity" in item:
+        quantity = item["quantity"]
+        if (
+            isinstance(quantity, bool)
+            or not isinstance(quantity, int)
+            or quantity < 1
+        ):
+            raise ValidationError(QUANTITY_ERROR)
+        result["quantity"] = quantity
+    return result
+
+
+def validate_items(value: Any) -> list[dict[str, Any]]:
+    """
+    Проверяет список блюд в формате JSON:
+    [{"name": "борщ", "price": 100, "quantity": 2}, ...] и приводит
+    цены к Decimal. Цену блюда из меню можно не указывать: ее назначит
+    price_items(). Ошибки всех блюд собираются в одну ValidationError.
+    """
+    if not isinstance(value, list) or not value:
+        raise ValidationError("Список блюд не может быть пустым.")
+
+    items, errors = [], []
+    for number, item in enumerate(value, start=1):
+        try:
+            items.append(_validate_item(item))
+        except ValidationError as error:
+            errors.extend(
+                f"Блюдо {number}: {message}" for message in error.messages
+            )
+    if errors:
+        raise ValidationError(errors)
+    return items
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from orders import archive
+
+
+class Command(BaseCommand):
+    """
+    Переносит старые оплаченные заказы в архив ArchivedOrder.
+
+    Заказы переносятся короткими транзакциями по --batch-size штук,
+    поэтому таблица заказов не блокируется надолго. С --interval
+    команда не завершается и повторяет перенос каждые N секунд —
+    так ее можно держать отдельным процессом вместо cron.
+    """
+
+    help = "Переносит оплаченные заказы старше N дней в архив."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ORDERS_ARCHIVE_AFTER_DAYS,
+            help="Возраст заказа в днях, после которого он архивируется.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ORDERS_ARCHIVE_BATCH_SIZE,
+            help="Количество заказов в одной транзакции.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Пауза между пачками в секундах.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Повторять перенос каждые N секунд.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только посчитать заказы, которые попадут в архив.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["days"] < 0 or options["batch_size"] < 1:
+            raise CommandError(
+                "--days не может быть отрицательным, "
+                "а --batch-size должен быть больше нуля."
+            )
+        if options["dry_run"]:
+            count = archive.archivable(
+                archive.archive_cutoff(options["days"])
+            ).count()
+            self.stdout.write(f"Заказов для архива: {count}")
+            return
+
+        while True:
+            archived = archive.archive_orders(
+                options["days"], options["batch_size"], options["pause"]
+            )
+            self.stdout.write(f"Перенесено в архив заказов: {archived}")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
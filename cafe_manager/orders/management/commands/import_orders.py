@@ -0,0 +1,141 @@
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.importer import FORMAT_CHOICES, build_order, load_orders, read_rows
+
+
+class Command(BaseCommand):
+    """
+    Загружает историю заказов из CSV или NDJSON.
+
+    Файл читается потоком, строки проверяются по тем же правилам,
+    что и в форме и API, и пишутся пачками (COPY на PostgreSQL,
+    bulk_create на остальных базах). После каждой пачки прогресс
+    сохраняется в файл, поэтому прерванный импорт продолжается
+    с первой незаписанной пачки.
+    """
+
+    help = "Импортирует заказы из CSV или NDJSON пачками."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", help="Путь к файлу CSV или NDJSON.")
+        parser.add_argument(
+            "--format",
+            choices=FORMAT_CHOICES,
+            help="Формат файла (по умолчанию — по расширению).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Количество заказов в одной пачке.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только проверить файл, ничего не записывая.",
+        )
+        parser.add_argument(
+            "--progress-file",
+            help="Файл прогресса (по умолчанию <path>.progress).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Начать импорт заново, игнорируя сохраненный прогресс.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"Файл не найден: {path}")
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt not in FORMAT_CHOICES:
+            raise CommandError(
+                "Не удалось определить формат файла, укажите --format."
+            )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть больше 0.")
+
+        dry_run = options["dry_run"]
+        progress_path = Path(options["progress_file"] or f"{path}.progress")
+        progress = {"rows": 0, "created": 0, "errors": 0}
+        if not dry_run and not options["restart"]:
+            progress = self.read_progress(progress_path, path) or progress
+            if progress["rows"]:
+                self.stdout.write(
+                    f"Продолжаем импорт с записи {progress['rows'] + 1}."
+                )
+
+        with path.open(encoding="utf-8", newline="") as stream:
+            rows = islice(read_rows(stream, fmt), progress["rows"], None)
+            while batch := list(islice(rows, options["batch_size"])):
+                orders = []
+                for line_num, row in batch:
+                    try:
+                        orders.append(build_order(row))
+                    except ValidationError as error:
+                        progress["errors"] += 1
+                        self.stderr.write(
+                            f"Строка {line_num}: {'; '.join(error.messages)}"
+                        )
+                progress["rows"] += len(batch)
+                progress["created"] += len(orders)
+                if dry_run:
+                    continue
+                if orders:
+                    load_orders(orders)
+                self.write_progress(progress_path, path, progress)
+                self.stdout.write(
+                    f"Загружено заказов: {progress['created']} "
+                    f"(прочитано записей: {progress['rows']})"
+                )
+
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Проверка завершена: корректных заказов "
+                    f"{progress['created']}, ошибок {progress['errors']}."
+                )
+            )
+            return
+        if progress_path.exists():
+            progress_path.unlink()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Импорт завершен: создано заказов {progress['created']}, "
+                f"пропущено строк с ошибками {progress['errors']}."
+            )
+        )
+
+    def read_progress(self, progress_path: Path, path: Path) -> Optional[dict]:
+        """Читает сохраненный прогресс импорта этого файла."""
+        if not progress_path.exists():
+            return None
+        data = json.loads(progress_path.read_text())
+        if data.get("source") != str(path.resolve()):
+            raise CommandError(
+                f"Файл прогресса {progress_path} относится к другому "
+                f"источнику, используйте --restart."
+            )
+        return {key: data[key] for key in ("rows", "created", "errors")}
+
+    def write_progress(
+        self, progress_path: Path, path: Path, progress: dict
+    ) -> None:
+        """
+        Сохраняет прогресс после записи пачки. Файл заменяется
+        атомарно; если процесс прервется между фиксацией транзакции
+        и записью файла, последняя пачка будет загружена повторно.
+        """
+        tmp_path = progress_path.with_name(progress_path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"source": str(path.resolve()), **progress})
+        )
+        os.replace(tmp_path, progress_path)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from orders import revenue
+from orders.models import DailyRevenue
+
+
+class Command(BaseCommand):
+    """
+    Пересобирает агрегаты выручки DailyRevenue с нуля
+    и сверяет их с суммой по таблице заказов.
+    """
+
+    help = "Пересобирает агрегаты выручки и сверяет их с Sum() по заказам."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только сверить агрегаты, не пересобирая их.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not options["check"]:
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # Параллельные изменения заказов дождутся пересборки
+                    # и применят свои дельты уже к новым строкам
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "LOCK TABLE %s IN EXCLUSIVE MODE"
+                            % DailyRevenue._meta.db_table
+                        )
+                DailyRevenue.objects.all().delete()
+                rows = DailyRevenue.objects.bulk_create(
+                    revenue.live_rollup(), batch_size=1000
+                )
+            self.stdout.write(f"Пересобрано строк агрегата: {len(rows)}")
+
+        rollup_total = revenue.total_revenue()
+        live_total = revenue.live_total_revenue()
+        if rollup_total != live_total:
+            raise CommandError(
+                f"Агрегаты выручки расходятся с заказами: "
+                f"{rollup_total} != {live_total}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Выручка сходится: {rollup_total}")
+        )
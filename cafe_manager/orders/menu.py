@@ -0,0 +1,116 @@
+import threading
+from decimal import Decimal
+from functools import cache, partial
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import cache as orders_cache
+from .models import MenuItem
+
+# Область поколения кэша для меню
+MENU = "menu"
+
+
+class MenuEntry(NamedTuple):
+    """Блюдо меню в кэше процесса."""
+
+    id: int
+    name: str
+    price: Decimal
+    is_available: bool
+
+
+def normalize_name(name: str) -> str:
+    """
+    Ключ поиска блюда в меню: без учета регистра, лишних пробелов
+    и различия «е» и «ё».
+    """
+    return " ".join(name.lower().replace("ё", "е").split())
+
+
+class MenuCache:
+    """
+    Копия меню в памяти процесса: словарь нормализованное название ->
+    MenuEntry. Меню читается из базы одним запросом и перечитывается,
+    только когда меняется его поколение в общем кэше, — изменения
+    меню в любом процессе видны всем процессам.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generation: Optional[str] = None
+        self._entries: dict[str, MenuEntry] = {}
+
+    def get_entries(self) -> dict[str, MenuEntry]:
+        """Возвращает актуальное меню."""
+        generation = orders_cache.get_generation([MENU])
+        if generation != self._generation:
+            entries = {
+                normalize_name(entry.name): entry
+                for entry in map(
+                    MenuEntry._make,
+                    MenuItem.objects.values_list(*MenuEntry._fields),
+                )
+            }
+            with self._lock:
+                self._entries, self._generation = entries, generation
+        return self._entries
+
+    def get(self, name: str) -> Optional[MenuEntry]:
+        """Ищет блюдо меню по названию."""
+        return self.get_entries().get(normalize_name(name))
+
+
+@cache
+def get_menu() -> MenuCache:
+    """Кэш меню процесса."""
+    return MenuCache()
+
+
+def invalidate() -> None:
+    """
+    Меняет поколение меню сразу и еще раз после фиксации, чтобы
+    процессы не закэшировали меню, прочитанное до фиксации.
+    """
+    orders_cache.bump_scopes([MENU])
+    transaction.on_commit(partial(orders_cache.bump_scopes, [MENU]))
+
+
+def price_items(items: list[dict]) -> list[dict]:
+    """
+    Назначает цены блюдам заказа по меню: у блюда из меню цена
+    и название берутся из меню, а в "menu_item" записывается его id.
+    Блюдо не из меню принимается с указанной ценой, если меню
+    не обязательно (ORDERS_MENU_REQUIRED). Ошибки по всем блюдам
+    сообщаются вместе.
+    """
+    entries = get_menu().get_entries()
+    priced, errors = [], []
+    for item in items:
+        entry = entries.get(normalize_name(item["name"]))
+        if entry is None:
+            if settings.ORDERS_MENU_REQUIRED:
+                errors.append(f"Блюда «{item['name']}» нет в меню.")
+            elif "price" not in item:
+                errors.append(
+                    f"Блюда «{item['name']}» нет в меню, укажите цену."
+                )
+            else:
+                priced.append(item)
+        elif not entry.is_available:
+            errors.append(f"Блюдо «{entry.name}» сейчас недоступно.")
+        else:
+            priced.append(
+                {
+                    **item,
+                    "name": entry.name,
+                    "price": entry.price,
+                    "menu_item": entry.id,
+                }
+            )
+    if errors:
+        raise ValidationError(errors)
+    return priced
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Order",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table_number",
+                    models.PositiveSmallIntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(1)
+                        ],
+                        verbose_name="Номер стола",
+                    ),
+                ),
+                (
+                    "items",
+                    models.JSONField(
+                        verbose_name="Заказанные блюда (с ценами)"
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=10,
+                        verbose_name="Общая стоимость",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В ожидании"),
+                            ("ready", "Готово"),
+                            ("paid", "Оплачено"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Статус заказа",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Время создания заказа"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Заказ",
+                "verbose_name_plural": "Заказы",
+                "ordering": ["-created_at", "-id"],
+            },
+        ),
+    ]
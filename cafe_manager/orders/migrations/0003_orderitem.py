@@ -0,0 +1,138 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:16
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def copy_items_to_rows(apps, schema_editor):
+    """Переносит блюда из JSON-поля items в таблицу OrderItem."""
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    db_alias = schema_editor.connection.alias
+
+    rows = []
+    orders = Order.objects.using(db_alias).values_list("pk", "items")
+    for order_id, items in orders.iterator(chunk_size=BATCH_SIZE):
+        for item in items or []:
+            rows.append(
+                OrderItem(
+                    order_id=order_id,
+                    name=item["name"],
+                    price=Decimal(str(item["price"])),
+                    quantity=item.get("quantity", 1),
+                )
+            )
+        if len(rows) >= BATCH_SIZE:
+            OrderItem.objects.using(db_alias).bulk_create(rows)
+            rows = []
+    OrderItem.objects.using(db_alias).bulk_create(rows)
+
+
+def copy_rows_to_items(apps, schema_editor):
+    """Восстанавливает JSON-поле items из таблицы OrderItem."""
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    db_alias = schema_editor.connection.alias
+
+    items_by_order = {}
+    rows = (
+        OrderItem.objects.using(db_alias)
+        .order_by("order_id", "id")
+        .values_list("order_id", "name", "price", "quantity")
+    )
+    for order_id, name, price, quantity in rows.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        item = {"name": name, "price": float(price)}
+        if quantity != 1:
+            item["quantity"] = quantity
+        items_by_order.setdefault(order_id, []).append(item)
+
+    orders = []
+    for order in Order.objects.using(db_alias).only("pk").iterator():
+        order.items = items_by_order.get(order.pk, [])
+        orders.append(order)
+    Order.objects.using(db_alias).bulk_update(
+        orders, ["items"], batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0002_order_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        db_index=True,
+                        max_length=255,
+                        verbose_name="Название блюда",
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=10,
+                        validators=[
+                            django.core.validators.MinValueValidator(
+                                Decimal("0.01")
+                            )
+                        ],
+                        verbose_name="Цена за единицу",
+                    ),
+                ),
+                (
+                    "quantity",
+                    models.PositiveIntegerField(
+                        default=1,
+                        validators=[
+                            django.core.validators.MinValueValidator(1)
+                        ],
+                        verbose_name="Количество",
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_items",
+                        to="orders.order",
+                        verbose_name="Заказ",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Блюдо в заказе",
+                "verbose_name_plural": "Блюда в заказе",
+                "ordering": ["id"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="items",
+            field=models.JSONField(
+                null=True, verbose_name="Заказанные блюда (с ценами)"
+            ),
+        ),
+        migrations.RunPython(copy_items_to_rows, copy_rows_to_items),
+    ]
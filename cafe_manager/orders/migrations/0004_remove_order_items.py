@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:16
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_orderitem"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="order",
+            name="items",
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:18
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_revenue(apps, schema_editor):
+    """Заполняет агрегаты выручки по уже существующим заказам."""
+    Order = apps.get_model("orders", "Order")
+    DailyRevenue = apps.get_model("orders", "DailyRevenue")
+    db_alias = schema_editor.connection.alias
+
+    rows = (
+        Order.objects.using(db_alias)
+        .filter(status="paid")
+        .annotate(date=TruncDate("created_at"))
+        .values("date", "table_number")
+        .annotate(total=Sum("total_price"), orders_count=Count("id"))
+        .order_by()
+    )
+    DailyRevenue.objects.using(db_alias).bulk_create(
+        DailyRevenue(**row) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_remove_order_items"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRevenue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Дата")),
+                (
+                    "table_number",
+                    models.PositiveSmallIntegerField(
+                        verbose_name="Номер стола"
+                    ),
+                ),
+                (
+                    "total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Выручка",
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.IntegerField(
+                        default=0, verbose_name="Количество оплаченных заказов"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Выручка за день",
+                "verbose_name_plural": "Выручка по дням",
+                "ordering": ["date", "table_number"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrevenue",
+            constraint=models.UniqueConstraint(
+                fields=("date", "table_number"),
+                name="daily_revenue_date_table_uniq",
+            ),
+        ),
+        migrations.RunPython(fill_daily_revenue, migrations.RunPython.noop),
+    ]
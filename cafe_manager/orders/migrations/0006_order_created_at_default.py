@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:19
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_dailyrevenue"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="order",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Время создания заказа",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0006_order_created_at_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoardRevision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table_number",
+                    models.PositiveSmallIntegerField(
+                        unique=True, verbose_name="Номер стола"
+                    ),
+                ),
+                (
+                    "version",
+                    models.BigIntegerField(default=0, verbose_name="Версия"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Время изменения",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Версия доски заказов",
+                "verbose_name_plural": "Версии доски заказов",
+            },
+        ),
+    ]
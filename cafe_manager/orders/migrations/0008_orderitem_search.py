@@ -0,0 +1,77 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Функциональный индекс: вектор вычисляет сама БД при любой записи
+# строки (save, bulk_create, COPY, админка), отдельное поле не нужно
+SEARCH_INDEX = GinIndex(
+    SearchVector("name", config="russian"),
+    name="orderitem_name_search_idx",
+)
+
+# Названия блюд пишутся в FTS5 с «е» вместо «ё», регистр приводит
+# токенизатор unicode61
+FTS_NAME = "replace(replace({0}.name, 'ё', 'е'), 'Ё', 'Е')"
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE orders_orderitem_fts USING fts5("
+    "name, content='', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER orders_orderitem_fts_insert AFTER INSERT "
+    "ON orders_orderitem BEGIN "
+    "INSERT INTO orders_orderitem_fts(rowid, name) "
+    f"VALUES (new.id, {FTS_NAME.format('new')}); END",
+    "CREATE TRIGGER orders_orderitem_fts_delete AFTER DELETE "
+    "ON orders_orderitem BEGIN "
+    "INSERT INTO orders_orderitem_fts(orders_orderitem_fts, rowid, name) "
+    f"VALUES ('delete', old.id, {FTS_NAME.format('old')}); END",
+    "CREATE TRIGGER orders_orderitem_fts_update AFTER UPDATE OF name "
+    "ON orders_orderitem BEGIN "
+    "INSERT INTO orders_orderitem_fts(orders_orderitem_fts, rowid, name) "
+    f"VALUES ('delete', old.id, {FTS_NAME.format('old')}); "
+    "INSERT INTO orders_orderitem_fts(rowid, name) "
+    f"VALUES (new.id, {FTS_NAME.format('new')}); END",
+    "INSERT INTO orders_orderitem_fts(rowid, name) "
+    f"SELECT id, {FTS_NAME.format('orders_orderitem')} FROM orders_orderitem",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER orders_orderitem_fts_insert",
+    "DROP TRIGGER orders_orderitem_fts_delete",
+    "DROP TRIGGER orders_orderitem_fts_update",
+    "DROP TABLE orders_orderitem_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Создает индекс поиска по названиям блюд: GIN со стеммингом
+    на PostgreSQL, таблицу FTS5 с триггерами на SQLite.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        OrderItem = apps.get_model("orders", "OrderItem")
+        schema_editor.add_index(OrderItem, SEARCH_INDEX)
+    elif vendor == "sqlite":
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        OrderItem = apps.get_model("orders", "OrderItem")
+        schema_editor.remove_index(OrderItem, SEARCH_INDEX)
+    elif vendor == "sqlite":
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0007_boardrevision"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:54
+
+from decimal import Decimal
+from importlib import import_module
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+search = import_module("orders.migrations.0008_orderitem_search")
+
+# Триггеры FTS5 из 0008: между созданием таблицы и ее заполнением
+SQLITE_TRIGGERS = search.SQLITE_CREATE[1:-1]
+
+
+def restore_search_triggers(apps, schema_editor):
+    """
+    Удаление внешнего ключа menu_item на SQLite пересоздает таблицу
+    блюд, и вместе со старой таблицей пропадают триггеры FTS5 из 0008.
+    Возвращает их, чтобы поиск работал и 0008 откатывалась.
+    """
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQLITE_TRIGGERS:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0008_orderitem_search"),
+    ]
+
+    operations = [
+        # При откате выполняется последней, уже после пересоздания таблицы
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.CreateModel(
+            name="MenuItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Название"
+                    ),
+                ),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=10,
+                        validators=[
+                            django.core.validators.MinValueValidator(
+                                Decimal("0.01")
+                            )
+                        ],
+                        verbose_name="Цена",
+                    ),
+                ),
+                (
+                    "is_available",
+                    models.BooleanField(
+                        default=True, verbose_name="Доступно для заказа"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Блюдо меню",
+                "verbose_name_plural": "Меню",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="orderitem",
+            name="menu_item",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="order_items",
+                to="orders.menuitem",
+                verbose_name="Блюдо меню",
+            ),
+        ),
+    ]
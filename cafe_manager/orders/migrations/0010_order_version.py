@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0009_menuitem"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Увеличивается при каждом изменении заказа.",
+                verbose_name="Версия",
+            ),
+        ),
+    ]
@@ -0,0 +1,124 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:21
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def open_table_sessions(apps, schema_editor):
+    """Открывает сессии столов, у которых есть неоплаченные заказы."""
+    Order = apps.get_model("orders", "Order")
+    TableSession = apps.get_model("orders", "TableSession")
+    db_alias = schema_editor.connection.alias
+
+    rows = (
+        Order.objects.using(db_alias)
+        .filter(status__in=["pending", "ready"])
+        .values("table_number")
+        .annotate(
+            opened_at=Min("created_at"),
+            unpaid_total=Sum("total_price"),
+            orders_count=Count("id"),
+        )
+        .order_by()
+    )
+    TableSession.objects.using(db_alias).bulk_create(
+        TableSession(**row) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0010_order_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableSession",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table_number",
+                    models.PositiveSmallIntegerField(
+                        verbose_name="Номер стола"
+                    ),
+                ),
+                (
+                    "opened_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Время открытия",
+                    ),
+                ),
+                (
+                    "closed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Время закрытия"
+                    ),
+                ),
+                (
+                    "unpaid_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Не оплачено",
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.IntegerField(
+                        default=0,
+                        verbose_name="Количество неоплаченных заказов",
+                    ),
+                ),
+                (
+                    "paid_total",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Оплачено при закрытии",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Счет стола",
+                "verbose_name_plural": "Счета столов",
+                "ordering": ["-opened_at", "-id"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="tablesession",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("closed_at__isnull", True)),
+                fields=("table_number",),
+                name="table_session_open_uniq",
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="session",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                help_text="Сессия стола, при закрытии которой заказ оплачен.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="orders",
+                to="orders.tablesession",
+                verbose_name="Счет стола",
+            ),
+        ),
+        migrations.RunPython(open_table_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0011_tablesession"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "table_number",
+                    models.PositiveSmallIntegerField(
+                        verbose_name="Номер стола"
+                    ),
+                ),
+                (
+                    "items",
+                    models.JSONField(default=list, verbose_name="Блюда"),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=10,
+                        verbose_name="Общая стоимость",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "В ожидании"),
+                            ("ready", "Готово"),
+                            ("paid", "Оплачено"),
+                        ],
+                        max_length=20,
+                        verbose_name="Статус заказа",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(verbose_name="Время создания заказа"),
+                ),
+                (
+                    "version",
+                    models.PositiveIntegerField(verbose_name="Версия"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Время переноса в архив",
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_orders",
+                        to="orders.tablesession",
+                        verbose_name="Счет стола",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивный заказ",
+                "verbose_name_plural": "Архив заказов",
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["-created_at", "-id"],
+                        name="archived_order_created_idx",
+                    ),
+                    models.Index(
+                        fields=["table_number", "-created_at", "-id"],
+                        name="archived_order_table_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0012_archivedorder"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedorder",
+            name="paid_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Время оплаты"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorder",
+            name="ready_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Время готовности"
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="paid_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Время оплаты",
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="ready_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Время готовности",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from importlib import import_module
+
+from django.db import migrations
+
+search = import_module("orders.migrations.0008_orderitem_search")
+menu = import_module("orders.migrations.0009_menuitem")
+
+
+def repair_search_index(apps, schema_editor):
+    """
+    Восстанавливает триггеры FTS5 на SQLite и заново заполняет индекс.
+    Нужна базам, которые откатывались до 0008 раньше, чем 0009 научилась
+    возвращать триггеры: после этого поиск не видел новых блюд.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in menu.SQLITE_TRIGGERS:
+        schema_editor.execute(
+            sql.replace("CREATE TRIGGER", "CREATE TRIGGER IF NOT EXISTS", 1)
+        )
+    schema_editor.execute(
+        "INSERT INTO orders_orderitem_fts(orders_orderitem_fts) "
+        "VALUES ('delete-all')"
+    )
+    schema_editor.execute(search.SQLITE_CREATE[-1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0013_order_status_reached_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_search_index, migrations.RunPython.noop),
+    ]
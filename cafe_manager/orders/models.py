@@ -1,6 +1,356 @@
-from django.db import models
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
+
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .signals import menu_changed, orders_changed
+
+# Ограничение размера списка в pk__in для одного запроса
+PK_BATCH_SIZE = 500
+
+# Статусы заказ проходит по порядку pending → ready → paid:
+# из какого статуса заказ переводится в данный
+PREVIOUS_STATUS = {"ready": "pending", "paid": "ready"}
+
+# Поле с временем, когда заказ получил статус
+STATUS_REACHED_AT = {"ready": "ready_at", "paid": "paid_at"}
+
+
+class OrderVersionConflict(Exception):
+    """
+    Заказ изменили после того, как его прочитали: условный
+    UPDATE ... WHERE version = n не затронул ни одной строки.
+    """
+
+    def __init__(self, pk: int, version: int) -> None:
+        super().__init__(
+            f"Заказ #{pk} уже изменен: его версия больше {version}."
+        )
+        self.pk = pk
+        self.version = version
+
+
+class OrdersVersionConflict(Exception):
+    """
+    Массовое изменение: часть заказов изменили или удалили после того,
+    как их прочитали. versions — {id заказа: прочитанная версия}.
+    """
+
+    def __init__(self, versions: dict[int, int]) -> None:
+        super().__init__(
+            "Заказы уже изменены: "
+            + ", ".join(f"#{pk}" for pk in versions)
+            + "."
+        )
+        self.versions = versions
+
+
+class InvalidStatusTransition(Exception):
+    """
+    Заказ нельзя перевести в запрошенный статус: условный
+    UPDATE ... WHERE status = <предыдущий статус> не затронул строку.
+    """
+
+    def __init__(self, pk: int, status: str, target: str) -> None:
+        super().__init__(status_transition_error(status, target))
+        self.pk = pk
+        self.status = status
+        self.target = target
+
+
+def can_change_status(status: str, target: str) -> bool:
+    """Можно ли перевести заказ из status в target (или оставить)."""
+    return target == status or PREVIOUS_STATUS.get(target) == status
+
+
+def status_transition_error(status: str, target: str) -> str:
+    """Сообщение о недопустимой смене статуса."""
+    labels = dict(Order.STATUS_CHOICES)
+    return (
+        f"Заказ в статусе «{labels.get(status, status)}» нельзя "
+        f"перевести в статус «{labels.get(target, target)}»."
+    )
+
+
+class OrderState(NamedTuple):
+    """
+    Снимок полей заказа, от которых зависят производные данные
+    (агрегаты выручки и т.п.).
+    """
+
+    id: int
+    table_number: int
+    status: str
+    total_price: Decimal
+    created_at: datetime
+
+
+class OrderQuerySet(models.QuerySet):
+    """
+    QuerySet заказов, сообщающий об изменениях через orders_changed
+    и для массовых операций.
+    """
+
+    def get_states(self) -> list[OrderState]:
+        """Возвращает снимки состояния выбранных заказов."""
+        return [
+            OrderState(*row) for row in self.values_list(*OrderState._fields)
+        ]
+
+    def get_states_by_pk(self, pks: Iterable[int]) -> list[OrderState]:
+        """Возвращает снимки состояния заказов по списку id пачками."""
+        pks = list(pks)
+        states = []
+        for start in range(0, len(pks), PK_BATCH_SIZE):
+            batch = pks[start : start + PK_BATCH_SIZE]
+            states.extend(self.model.objects.filter(pk__in=batch).get_states())
+        return states
+
+    def update(self, **kwargs) -> int:
+        """
+        Обновляет заказы одним запросом, увеличивает их версии
+        и рассылает orders_changed.
+        """
+        kwargs.setdefault("version", models.F("version") + 1)
+        reached_at = STATUS_REACHED_AT.get(kwargs.get("status"))
+        if reached_at is not None:
+            # Время получения статуса не перезаписывается у заказов,
+            # которые уже были в этом статусе
+            kwargs.setdefault(
+                reached_at,
+                Coalesce(
+                    reached_at,
+                    models.Value(timezone.now()),
+                    output_field=models.DateTimeField(),
+                ),
+            )
+        with transaction.atomic(using=self.db, savepoint=False):
+            before = {
+                state.id: state
+                for state in self.select_for_update().get_states()
+            }
+            rows = super().update(**kwargs)
+            if before:
+                after = self.get_states_by_pk(before)
+                orders_changed.send(
+                    sender=self.model,
+                    changes=[(before[state.id], state) for state in after],
+                )
+        return rows
+
+    update.alters_data = True
+
+    def advance_status(
+        self, target: str, version: Optional[int] = None
+    ) -> list[OrderState]:
+        """
+        Переводит выбранные заказы в статус target одним условным
+        UPDATE ... SET status = target WHERE status = <предыдущий>:
+        пишутся только статус, время его получения и версия, блюда
+        и стоимость не перечитываются. Заказы в другом статусе, в том
+        числе измененные параллельным запросом, не затрагиваются;
+        с version — и заказы другой версии. Возвращает снимки
+        переведенных заказов и рассылает по ним orders_changed.
+        """
+        source = PREVIOUS_STATUS.get(target)
+        if source is None:
+            raise ValueError(f"В статус {target} заказ не переводится.")
+        reached_at = STATUS_REACHED_AT[target]
+        now = timezone.now()
+        conditions = {"status": source}
+        if version is not None:
+            conditions["version"] = version
+        with transaction.atomic(using=self.db, savepoint=False):
+            updated = models.QuerySet.update(
+                self.filter(**conditions),
+                status=target,
+                version=models.F("version") + 1,
+                **{reached_at: now},
+            )
+            if not updated:
+                return []
+            # Переведенные этим запросом строки отличает время перехода
+            states = self.filter(
+                status=target, **{reached_at: now}
+            ).get_states()
+            orders_changed.send(
+                sender=self.model,
+                changes=[
+                    (state._replace(status=source), state) for state in states
+                ],
+            )
+        return states
+
+    advance_status.alters_data = True
+
+    def advance(
+        self, pk: int, target: str, version: Optional[int] = None
+    ) -> OrderState:
+        """
+        Переводит один заказ в статус target через advance_status();
+        с version — только если версия заказа не изменилась.
+        Если строка не обновилась, выясняет причину: нет заказа —
+        DoesNotExist, другой статус — InvalidStatusTransition,
+        другая версия — OrderVersionConflict.
+        """
+        if target in PREVIOUS_STATUS:
+            states = self.filter(pk=pk).advance_status(target, version)
+            if states:
+                return states[0]
+        status = self.filter(pk=pk).values_list("status", flat=True).first()
+        if status is None:
+            raise self.model.DoesNotExist(f"Заказ #{pk} не найден.")
+        if status != PREVIOUS_STATUS.get(target):
+            raise InvalidStatusTransition(pk, status, target)
+        raise OrderVersionConflict(pk, version)
+
+    advance.alters_data = True
+
+    def bulk_create(
+        self, objs, *args, publish: bool = True, **kwargs
+    ) -> list["Order"]:
+        """
+        Создает заказы пачкой и рассылает orders_changed;
+        с publish=False — без событий подписчикам.
+        """
+        objs = list(objs)
+        for obj in objs:
+            obj.stamp_status()
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            orders_changed.send(
+                sender=self.model,
+                changes=[(None, obj.get_state()) for obj in objs],
+                publish=publish,
+            )
+            for obj in objs:
+                obj._loaded_state = obj.get_state()
+        return objs
+
+    bulk_create.alters_data = True
+
+    def bulk_create_with_items(
+        self,
+        orders: list["Order"],
+        batch_size: Optional[int] = None,
+        publish: bool = True,
+    ) -> list["Order"]:
+        """
+        Создает заказы вместе с их блюдами (назначенными через items):
+        общая стоимость считается заранее, заказы и строки OrderItem
+        пишутся двумя bulk_create в одной транзакции. publish — как
+        в bulk_create().
+        """
+        with transaction.atomic(using=self.db, savepoint=False):
+            for order in orders:
+                order.calculate_total_price()
+            orders = self.bulk_create(
+                orders, batch_size=batch_size, publish=publish
+            )
+            OrderItem.objects.using(self.db).bulk_create(
+                _take_pending_items(orders), batch_size=batch_size
+            )
+        return orders
+
+    bulk_create_with_items.alters_data = True
+
+    def bulk_update_with_items(
+        self,
+        orders: list["Order"],
+        fields: Iterable[str] = ("table_number",),
+        batch_size: Optional[int] = None,
+    ) -> list["Order"]:
+        """
+        Обновляет заказы пачкой: поля fields пишутся через bulk_update,
+        у заказов с новым списком блюд строки OrderItem заменяются
+        одним DELETE и одним bulk_create. Заказы пишутся только с той
+        версией, с которой их прочитали (order.version): строки этих
+        версий блокируются, и UPDATE условный — WHERE version = <n>
+        для каждого заказа. Если хотя бы один заказ изменили или
+        удалили, ничего не пишется и вызывается OrdersVersionConflict.
+        Статус так не пишется: его меняет advance_status().
+        """
+        fields = set(fields)
+        if "status" in fields:
+            raise ValueError("Статус заказов меняется через advance_status().")
+        versions = {order.pk: order.version for order in orders}
+        read = self.filter(
+            pk__in=versions,
+            version=models.Case(
+                *(
+                    models.When(pk=pk, then=models.Value(version))
+                    for pk, version in versions.items()
+                )
+            ),
+        )
+        with transaction.atomic(using=self.db):
+            locked = set(read.select_for_update().values_list("pk", flat=True))
+            if len(locked) != len(versions):
+                raise OrdersVersionConflict(
+                    {
+                        pk: version
+                        for pk, version in versions.items()
+                        if pk not in locked
+                    }
+                )
+            with_items = [o for o in orders if o._pending_items is not None]
+            for order in with_items:
+                order.calculate_total_price()
+            if with_items:
+                fields.add("total_price")
+            if fields:
+                fields.add("version")
+                for order in orders:
+                    order.version += 1
+                read.bulk_update(orders, sorted(fields), batch_size=batch_size)
+            for order in orders:
+                order._loaded_state = order.get_state()
+            if with_items:
+                OrderItem.objects.using(self.db).filter(
+                    order__in=with_items
+                ).delete()
+                OrderItem.objects.using(self.db).bulk_create(
+                    _take_pending_items(with_items), batch_size=batch_size
+                )
+        return orders
+
+    bulk_update_with_items.alters_data = True
+
+    def with_status_label(self) -> "OrderQuerySet":
+        """
+        Добавляет status_label — название статуса, вычисленное в БД
+        (аналог get_status_display() без вызова на каждую строку).
+        """
+        return self.annotate(
+            status_label=models.Case(
+                *(
+                    models.When(status=value, then=models.Value(label))
+                    for value, label in Order.STATUS_CHOICES
+                ),
+                default=models.F("status"),
+                output_field=models.CharField(),
+            )
+        )
+
+
+def _take_pending_items(orders: list["Order"]) -> list["OrderItem"]:
+    """
+    Привязывает несохраненные блюда к заказам и переносит их
+    в кэш строк заказа, чтобы чтение items не ходило в базу.
+    """
+    rows = []
+    for order in orders:
+        items = order._pending_items or []
+        for item in items:
+            item.order = order
+        order._cache_item_rows(items)
+        rows.extend(items)
+    return rows
 
 
 class Order(models.Model):
@@ -20,9 +370,6 @@ class Order(models.Model):
         verbose_name="Номер стола",
         validators=[MinValueValidator(1)],
     )
-    items = models.JSONField(
-        verbose_name="Заказанные блюда (с ценами)",
-    )
     total_price = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -36,27 +383,540 @@ class Order(models.Model):
         verbose_name="Статус заказа",
     )
     created_at = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name="Время создания заказа",
     )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="Версия",
+        help_text="Увеличивается при каждом изменении заказа.",
+    )
+    ready_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Время готовности",
+    )
+    paid_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Время оплаты",
+    )
+    session = models.ForeignKey(
+        "TableSession",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="orders",
+        verbose_name="Счет стола",
+        help_text="Сессия стола, при закрытии которой заказ оплачен.",
+    )
+
+    objects = OrderQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Заказ"
         verbose_name_plural = "Заказы"
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Сортировка по умолчанию и keyset-пагинация
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="order_created_idx",
+            ),
+            # Поиск по статусу с сортировкой по времени
+            models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="order_status_created_idx",
+            ),
+            # Поиск по номеру стола с сортировкой по времени
+            models.Index(
+                fields=["table_number", "-created_at", "-id"],
+                name="order_table_created_idx",
+            ),
+            # Выручка: сумма только по оплаченным заказам без чтения таблицы
+            models.Index(
+                fields=["created_at", "total_price"],
+                condition=models.Q(status="paid"),
+                name="order_paid_revenue_idx",
+            ),
+        ]
+
+    # Блюда, назначенные через items и еще не записанные в OrderItem
+    _pending_items: Optional[list["OrderItem"]] = None
+    # Состояние заказа на момент загрузки из базы или последнего save()
+    _loaded_state: Optional[OrderState] = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Order":
+        """Запоминает состояние загруженного заказа."""
+        instance = super().from_db(db, field_names, values)
+        if set(OrderState._fields) <= set(field_names):
+            instance._loaded_state = instance.get_state()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """Перечитывает заказ и обновляет запомненное состояние."""
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_state = self.get_state()
+
+    def get_state(self) -> OrderState:
+        """Возвращает снимок текущих значений полей заказа."""
+        return OrderState(*(getattr(self, f) for f in OrderState._fields))
+
+    @property
+    def items(self) -> list[dict]:
+        """
+        Заказанные блюда в формате [{"name": ..., "price": ...}].
+        Читаются из OrderItem (используйте prefetch_related("order_items")
+        для списков заказов).
+        """
+        return [item.as_dict() for item in self.get_item_rows()]
+
+    @items.setter
+    def items(self, value: list[dict]) -> None:
+        """Заменяет список блюд; строки OrderItem пишутся при save()."""
+        self._pending_items = [OrderItem.from_dict(item) for item in value]
+
+    def _cache_item_rows(self, rows: list["OrderItem"]) -> None:
+        """Запоминает сохраненные строки блюд как результат prefetch."""
+        self._pending_items = None
+        queryset = self.order_items.all()
+        queryset._result_cache = rows
+        queryset._prefetch_done = True
+        if not hasattr(self, "_prefetched_objects_cache"):
+            self._prefetched_objects_cache = {}
+        self._prefetched_objects_cache["order_items"] = queryset
+
+    def get_item_rows(self) -> list["OrderItem"]:
+        """Возвращает строки блюд: еще не сохраненные или из базы."""
+        if self._pending_items is not None:
+            return self._pending_items
+        if self.pk is None:
+            return []
+        return list(self.order_items.all())
 
     def clean(self) -> None:
-        """Проверяет, что номер стола больше 0."""
+        """
+        Проверяет, что номер стола больше 0 и что статус меняется
+        только по порядку pending → ready → paid.
+        """
         if self.table_number == 0:
             raise ValidationError("Номер стола должен быть больше 0.")
+        if self._loaded_state is not None and not can_change_status(
+            self._loaded_state.status, self.status
+        ):
+            raise ValidationError(
+                {
+                    "status": status_transition_error(
+                        self._loaded_state.status, self.status
+                    )
+                }
+            )
+
+    def stamp_status(self, at: Optional[datetime] = None) -> Optional[str]:
+        """
+        Запоминает время at (по умолчанию — сейчас), когда заказ
+        получил текущий статус, если оно еще не записано.
+        Возвращает имя поля времени или None для pending.
+        """
+        field = STATUS_REACHED_AT.get(self.status)
+        if field is not None and getattr(self, field) is None:
+            setattr(self, field, at or timezone.now())
+        return field
 
     def calculate_total_price(self) -> None:
         """
-        Вычисляет и устанавливает общую стоимость заказа на основе списка блюд.
+        Вычисляет и устанавливает общую стоимость заказа по строкам блюд.
         """
-        self.total_price = sum(item["price"] for item in self.items)
+        self.total_price = sum(
+            (item.price * item.quantity for item in self.get_item_rows()),
+            Decimal("0"),
+        )
 
     def save(self, *args, **kwargs) -> None:
-        """Сохраняет заказ, предварительно рассчитывая общую стоимость."""
+        """
+        Сохраняет заказ. Если список блюд менялся, пересчитывает общую
+        стоимость и перезаписывает строки OrderItem одним bulk_create.
+        Изменение существующего заказа — условный UPDATE по версии,
+        с которой заказ был прочитан (без блокировки строки); если
+        заказ уже изменили, выбрасывается OrderVersionConflict.
+        """
+        pending_items = self._pending_items
+        conflict = None
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            if pending_items is not None:
+                self.calculate_total_price()
+            reached_at = self.stamp_status()
+            adding = self._state.adding
+            old_state = None
+            if not adding:
+                old_state = self._loaded_state or next(
+                    iter(Order.objects.filter(pk=self.pk).get_states()), None
+                )
+                if kwargs.get("update_fields") is not None:
+                    kwargs["update_fields"] = {
+                        *kwargs["update_fields"],
+                        "version",
+                    }
+                    if "status" in kwargs["update_fields"] and reached_at:
+                        kwargs["update_fields"].add(reached_at)
+                self.version += 1
+            try:
+                super().save(*args, **kwargs)
+            except OrderVersionConflict as error:
+                # Условный UPDATE ничего не записал и ошибки БД не было:
+                # транзакцию не нужно откатывать, исключение выбрасывается
+                # после блока, чтобы вызывающий код мог продолжить работу
+                transaction.set_rollback(
+                    False, using=kwargs.get("using") or self._state.db
+                )
+                self.version -= 1
+                conflict = error
+            else:
+                self._loaded_state = self.get_state()
+                orders_changed.send(
+                    sender=Order, changes=[(old_state, self._loaded_state)]
+                )
+                if pending_items is not None:
+                    if not adding:
+                        OrderItem.objects.filter(order=self).delete()
+                    OrderItem.objects.bulk_create(_take_pending_items([self]))
+        if conflict is not None:
+            raise conflict
+
+    def _do_update(
+        self, base_qs, using, pk_val, values, update_fields, forced_update
+    ) -> bool:
+        """
+        UPDATE ... WHERE id = %s AND version = %s: строка обновляется,
+        только если ее версия не изменилась с момента чтения заказа.
+        """
+        if self._state.adding:
+            return super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+        expected = self.version - 1
+        if base_qs.filter(pk=pk_val, version=expected)._update(values):
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise OrderVersionConflict(pk_val, expected)
+        return False
+
+    def refresh_total_price(self) -> None:
+        """Пересчитывает общую стоимость по сохраненным строкам блюд."""
         self.calculate_total_price()
-        super().save(*args, **kwargs)
+        self.save(update_fields=["total_price"])
+
+
+class MenuItemQuerySet(models.QuerySet):
+    """QuerySet меню, сообщающий о массовых изменениях через menu_changed."""
+
+    def update(self, **kwargs) -> int:
+        rows = super().update(**kwargs)
+        menu_changed.send(sender=self.model)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs) -> list["MenuItem"]:
+        objs = super().bulk_create(objs, *args, **kwargs)
+        menu_changed.send(sender=self.model)
+        return objs
+
+    bulk_create.alters_data = True
+
+
+class MenuItem(models.Model):
+    """
+    Блюдо меню с действующей ценой. Цены блюд из меню в заказах
+    берутся отсюда, а не из введенных данных.
+    """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name="Название",
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal("0.01"))],
+        verbose_name="Цена",
+    )
+    is_available = models.BooleanField(
+        default=True,
+        verbose_name="Доступно для заказа",
+    )
+
+    objects = MenuItemQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Блюдо меню"
+        verbose_name_plural = "Меню"
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.price}"
+
+
+class OrderItem(models.Model):
+    """
+    Блюдо в заказе: название, цена за единицу и количество.
+    Позволяет искать и агрегировать заказы по блюдам средствами БД.
+    """
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="order_items",
+        verbose_name="Заказ",
+    )
+    menu_item = models.ForeignKey(
+        MenuItem,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="order_items",
+        verbose_name="Блюдо меню",
+    )
+    name = models.CharField(
+        max_length=255,
+        db_index=True,
+        verbose_name="Название блюда",
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal("0.01"))],
+        verbose_name="Цена за единицу",
+    )
+    quantity = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        verbose_name="Количество",
+    )
+
+    class Meta:
+        verbose_name = "Блюдо в заказе"
+        verbose_name_plural = "Блюда в заказе"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.name} {self.price}"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OrderItem":
+        """
+        Создает несохраненную строку из словаря {"name", "price"};
+        необязательные ключи — "quantity" и "menu_item" (id блюда меню).
+        """
+        return cls(
+            menu_item_id=data.get("menu_item"),
+            name=data["name"],
+            price=Decimal(str(data["price"])),
+            quantity=data.get("quantity", 1),
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Представляет строку в прежнем формате JSON-поля items.
+        Количество добавляется, только если оно отличается от 1.
+        """
+        data = {"name": self.name, "price": self.price}
+        if self.quantity != 1:
+            data["quantity"] = self.quantity
+        return data
+
+
+class DailyRevenue(models.Model):
+    """
+    Выручка по оплаченным заказам за день в разрезе столов.
+    Поддерживается инкрементально при каждом изменении заказов,
+    поэтому отчеты о выручке не суммируют всю историю заказов.
+    """
+
+    date = models.DateField(verbose_name="Дата")
+    table_number = models.PositiveSmallIntegerField(
+        verbose_name="Номер стола",
+    )
+    total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Выручка",
+    )
+    orders_count = models.IntegerField(
+        default=0,
+        verbose_name="Количество оплаченных заказов",
+    )
+
+    class Meta:
+        verbose_name = "Выручка за день"
+        verbose_name_plural = "Выручка по дням"
+        ordering = ["date", "table_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "table_number"],
+                name="daily_revenue_date_table_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} / стол {self.table_number}: {self.total}"
+
+
+class BoardRevision(models.Model):
+    """
+    Версия доски открытых заказов (pending и ready) для стола
+    или для всех столов (table_number = 0). Увеличивается в той же
+    транзакции, что и изменение открытого заказа, поэтому проверка
+    «изменилось ли что-нибудь» — один поиск по уникальному индексу.
+    """
+
+    ALL_TABLES = 0
+
+    table_number = models.PositiveSmallIntegerField(
+        unique=True,
+        verbose_name="Номер стола",
+    )
+    version = models.BigIntegerField(default=0, verbose_name="Версия")
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Время изменения",
+    )
+
+    class Meta:
+        verbose_name = "Версия доски заказов"
+        verbose_name_plural = "Версии доски заказов"
+
+    def __str__(self) -> str:
+        return f"Стол {self.table_number}: {self.version}"
+
+
+class TableSession(models.Model):
+    """
+    Сессия стола (счет): открывается с первым неоплаченным заказом
+    стола и закрывается оплатой всех его неоплаченных заказов.
+    Сумма и число неоплаченных заказов поддерживаются в той же
+    транзакции, что и изменение заказов, поэтому «сколько должен
+    стол» — чтение одной строки, а не сумма по заказам.
+    """
+
+    table_number = models.PositiveSmallIntegerField(
+        verbose_name="Номер стола",
+    )
+    opened_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Время открытия",
+    )
+    closed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Время закрытия",
+    )
+    unpaid_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Не оплачено",
+    )
+    orders_count = models.IntegerField(
+        default=0,
+        verbose_name="Количество неоплаченных заказов",
+    )
+    paid_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name="Оплачено при закрытии",
+    )
+
+    class Meta:
+        verbose_name = "Счет стола"
+        verbose_name_plural = "Счета столов"
+        ordering = ["-opened_at", "-id"]
+        constraints = [
+            # Открытая сессия у стола одна: поиск по этому индексу
+            models.UniqueConstraint(
+                fields=["table_number"],
+                condition=models.Q(closed_at__isnull=True),
+                name="table_session_open_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Стол {self.table_number}: {self.unpaid_total}"
+
+    @property
+    def is_open(self) -> bool:
+        return self.closed_at is None
+
+
+class ArchivedOrder(models.Model):
+    """
+    Оплаченный заказ, перенесенный из Order в архив командой
+    archive_orders. id сохраняется, блюда хранятся в самой строке
+    (items: name, price, quantity, menu_item). Архив читается только
+    явно: списки заказов и их индексы содержат лишь горячие заказы,
+    а выручка учитывает обе таблицы.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    table_number = models.PositiveSmallIntegerField(
+        verbose_name="Номер стола",
+    )
+    items = models.JSONField(default=list, verbose_name="Блюда")
+    total_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name="Общая стоимость",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Order.STATUS_CHOICES,
+        verbose_name="Статус заказа",
+    )
+    created_at = models.DateTimeField(verbose_name="Время создания заказа")
+    version = models.PositiveIntegerField(verbose_name="Версия")
+    ready_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Время готовности"
+    )
+    paid_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Время оплаты"
+    )
+    session = models.ForeignKey(
+        TableSession,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_orders",
+        verbose_name="Счет стола",
+    )
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Время переноса в архив",
+    )
+
+    class Meta:
+        verbose_name = "Архивный заказ"
+        verbose_name_plural = "Архив заказов"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # Сортировка, keyset-пагинация и выручка по часам за период
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="archived_order_created_idx",
+            ),
+            models.Index(
+                fields=["table_number", "-created_at", "-id"],
+                name="archived_order_table_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Заказ #{self.id} (архив)"
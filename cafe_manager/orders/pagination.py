@@ -0,0 +1,156 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Курсор пагинации не удалось разобрать."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Позиция в списке заказов: ключ (created_at, id) последней
+    показанной строки и направление перехода.
+    """
+
+    created_at: datetime
+    pk: int
+    reverse: bool = False
+
+    def encode(self) -> str:
+        """Кодирует курсор в непрозрачную строку для URL."""
+        payload = {"c": self.created_at.isoformat(), "i": self.pk}
+        if self.reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        """Восстанавливает курсор из строки, полученной от клиента."""
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            payload = json.loads(raw)
+            return cls(
+                created_at=datetime.fromisoformat(payload["c"]),
+                pk=int(payload["i"]),
+                reverse=bool(payload.get("r", False)),
+            )
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            TypeError,
+            KeyError,
+        ):
+            raise InvalidCursor(value)
+
+
+@dataclass
+class KeysetPage:
+    """Страница заказов и курсоры соседних страниц."""
+
+    object_list: list
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+
+def get_page_size(value: Optional[str] = None) -> int:
+    """
+    Возвращает размер страницы из параметра запроса,
+    ограниченный настройкой ORDERS_MAX_PAGE_SIZE.
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return settings.ORDERS_PAGE_SIZE
+    if size < 1:
+        return settings.ORDERS_PAGE_SIZE
+    return min(size, settings.ORDERS_MAX_PAGE_SIZE)
+
+
+def _position(obj: Any, reverse: bool = False) -> Cursor:
+    """
+    Строит курсор, указывающий на переданную строку
+    (модель или словарь из values()).
+    """
+    if isinstance(obj, dict):
+        return Cursor(obj["created_at"], obj["id"], reverse=reverse)
+    return Cursor(created_at=obj.created_at, pk=obj.pk, reverse=reverse)
+
+
+def _page_rows(
+    queryset: QuerySet, position: Optional[Cursor], page_size: int
+) -> QuerySet:
+    """
+    Запрос строк страницы: на одну строку больше page_size, чтобы
+    узнать, есть ли следующая (при обратном переходе — предыдущая).
+    """
+    if position is None:
+        return queryset.order_by("-created_at", "-id")[: page_size + 1]
+    if not position.reverse:
+        return queryset.filter(
+            Q(created_at__lt=position.created_at)
+            | Q(created_at=position.created_at, id__lt=position.pk)
+        ).order_by("-created_at", "-id")[: page_size + 1]
+    return queryset.filter(
+        Q(created_at__gt=position.created_at)
+        | Q(created_at=position.created_at, id__gt=position.pk)
+    ).order_by("created_at", "id")[: page_size + 1]
+
+
+def _build_page(
+    rows: list, position: Optional[Cursor], page_size: int
+) -> KeysetPage:
+    """Собирает страницу и курсоры соседних страниц из строк запроса."""
+    has_more = len(rows) > page_size
+    if position is None or not position.reverse:
+        rows = rows[:page_size]
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=_position(rows[-1]).encode() if has_more else None,
+            previous_cursor=(
+                _position(rows[0], reverse=True).encode()
+                if position is not None and rows
+                else None
+            ),
+        )
+    rows = rows[:page_size][::-1]
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=_position(rows[-1]).encode() if rows else None,
+        previous_cursor=(
+            _position(rows[0], reverse=True).encode() if has_more else None
+        ),
+    )
+
+
+def paginate(
+    queryset: QuerySet, cursor: Optional[str], page_size: int
+) -> KeysetPage:
+    """
+    Возвращает страницу заказов, отсортированных по (-created_at, -id).
+
+    Вместо OFFSET используется условие по ключу последней показанной
+    строки, поэтому стоимость перехода не зависит от глубины страницы,
+    а новые заказы не сдвигают уже просмотренные страницы.
+    """
+    position = Cursor.decode(cursor) if cursor else None
+    rows = list(_page_rows(queryset, position, page_size))
+    return _build_page(rows, position, page_size)
+
+
+async def apaginate(
+    queryset: QuerySet, cursor: Optional[str], page_size: int
+) -> KeysetPage:
+    """Асинхронный вариант paginate() для асинхронных view."""
+    position = Cursor.decode(cursor) if cursor else None
+    rows = [row async for row in _page_rows(queryset, position, page_size)]
+    return _build_page(rows, position, page_size)
@@ -0,0 +1,82 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import board, cache, events, menu, revenue, sessions
+from .models import MenuItem, Order
+from .signals import menu_changed, orders_changed
+
+
+@receiver(pre_delete, sender=Order)
+def lock_deleted_order(sender, instance: Order, using: str, **kwargs) -> None:
+    """
+    Блокирует строку удаляемого заказа в транзакции удаления
+    и запоминает ее текущее состояние: экземпляр мог устареть
+    (заказ оплатили или перенесли за другой стол после чтения),
+    а агрегаты должны вычесть то, что удаляется на самом деле.
+    """
+    states = (
+        Order.objects.using(using)
+        .filter(pk=instance.pk)
+        .select_for_update()
+        .get_states()
+    )
+    instance._deleted_state = states[0] if states else None
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance: Order, **kwargs) -> None:
+    """
+    Сообщает об удалении заказа, в том числе через QuerySet.delete().
+    Заказ, который уже удалил параллельный запрос, не вычитается
+    второй раз.
+    """
+    state = instance.__dict__.pop("_deleted_state", None)
+    if state is not None:
+        orders_changed.send(sender=Order, changes=[(state, None)])
+
+
+@receiver(orders_changed, sender=Order)
+def update_revenue(sender, changes, **kwargs) -> None:
+    """Поддерживает агрегаты выручки в актуальном состоянии."""
+    revenue.apply_changes(changes)
+
+
+@receiver(orders_changed, sender=Order)
+def update_table_sessions(sender, changes, **kwargs) -> None:
+    """Поддерживает суммы неоплаченных заказов в открытых сессиях."""
+    sessions.apply_changes(changes)
+
+
+@receiver(orders_changed, sender=Order)
+def update_board_revision(sender, changes, **kwargs) -> None:
+    """Увеличивает версию доски открытых заказов."""
+    board.apply_changes(changes)
+
+
+@receiver(orders_changed, sender=Order)
+def publish_events(sender, changes, publish: bool = True, **kwargs) -> None:
+    """
+    Публикует события изменений заказов подписчикам
+    после фиксации транзакции (кроме изменений с publish=False).
+    """
+    if not publish:
+        return
+    order_events = events.events_from_changes(changes)
+    transaction.on_commit(partial(events.get_broker().publish, order_events))
+
+
+@receiver(orders_changed, sender=Order)
+def invalidate_cache(sender, changes, **kwargs) -> None:
+    """Меняет поколения кэша ответов для изменившихся заказов."""
+    cache.invalidate(changes)
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(menu_changed, sender=MenuItem)
+def invalidate_menu(sender, **kwargs) -> None:
+    """Сбрасывает кэш меню в процессах после изменения блюд меню."""
+    menu.invalidate()
@@ -0,0 +1,303 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .filters import filter_period
+from .models import ArchivedOrder, DailyRevenue, Order, OrderState
+
+PAID = "paid"
+
+GROUP_BY_CHOICES = [
+    ("day", "По дням"),
+    ("hour", "По часам"),
+    ("table", "По столам"),
+    ("status", "По статусам"),
+]
+
+Change = tuple[Optional[OrderState], Optional[OrderState]]
+
+# С какого числа затронутых строк агрегата обновлять их пачкой
+BULK_THRESHOLD = 20
+
+
+def _rollup_key(state: OrderState) -> tuple[date, int]:
+    """Возвращает строку агрегата, в которую попадает заказ."""
+    return timezone.localdate(state.created_at), state.table_number
+
+
+def apply_changes(changes: list[Change]) -> None:
+    """
+    Переносит изменения заказов в агрегаты выручки.
+    Оплаченный заказ в старом состоянии вычитается, в новом — прибавляется;
+    изменения группируются, чтобы на каждую строку был один UPDATE.
+    """
+    deltas = defaultdict(lambda: [Decimal("0"), 0])
+    for old, new in changes:
+        if old is not None and old.status == PAID:
+            delta = deltas[_rollup_key(old)]
+            delta[0] -= old.total_price
+            delta[1] -= 1
+        if new is not None and new.status == PAID:
+            delta = deltas[_rollup_key(new)]
+            delta[0] += new.total_price
+            delta[1] += 1
+
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if len(deltas) > BULK_THRESHOLD:
+        try:
+            with transaction.atomic():
+                _add_many(deltas)
+            return
+        except IntegrityError:
+            # Параллельный запрос создал одну из строк — идем построчно
+            pass
+    for (day, table_number), (amount, count) in deltas.items():
+        _add(day, table_number, amount, count)
+
+
+def _add(day: date, table_number: int, amount: Decimal, count: int) -> None:
+    """Прибавляет выручку к строке агрегата, создавая ее при необходимости."""
+    rows = DailyRevenue.objects.filter(date=day, table_number=table_number)
+    values = {
+        "total": F("total") + amount,
+        "orders_count": F("orders_count") + count,
+    }
+    if rows.update(**values):
+        return
+    try:
+        with transaction.atomic():
+            DailyRevenue.objects.create(
+                date=day,
+                table_number=table_number,
+                total=amount,
+                orders_count=count,
+            )
+    except IntegrityError:
+        # Строку успел создать параллельный запрос
+        rows.update(**values)
+
+
+def _rollup_rows(
+    date_from: Optional[date], date_to: Optional[date]
+) -> QuerySet:
+    """Строки агрегата выручки за период (границы включительно)."""
+    rows = DailyRevenue.objects.all()
+    if date_from:
+        rows = rows.filter(date__gte=date_from)
+    if date_to:
+        rows = rows.filter(date__lte=date_to)
+    return rows
+
+
+def _add_many(deltas: dict[tuple[date, int], list]) -> None:
+    """
+    Применяет много дельт сразу: существующие строки блокируются
+    и обновляются через bulk_update, недостающие создаются bulk_create.
+    """
+    days = {day for day, _ in deltas}
+    existing = [
+        row
+        for row in DailyRevenue.objects.select_for_update().filter(
+            date__in=days
+        )
+        if (row.date, row.table_number) in deltas
+    ]
+    for row in existing:
+        amount, count = deltas[row.date, row.table_number]
+        row.total += amount
+        row.orders_count += count
+    DailyRevenue.objects.bulk_update(
+        existing, ["total", "orders_count"], batch_size=500
+    )
+
+    existing_keys = {(row.date, row.table_number) for row in existing}
+    DailyRevenue.objects.bulk_create(
+        [
+            DailyRevenue(
+                date=day,
+                table_number=table_number,
+                total=amount,
+                orders_count=count,
+            )
+            for (day, table_number), (amount, count) in deltas.items()
+            if (day, table_number) not in existing_keys
+        ],
+        batch_size=500,
+    )
+
+
+def total_revenue(
+    date_from: Optional[date] = None, date_to: Optional[date] = None
+) -> Decimal:
+    """Возвращает выручку по оплаченным заказам из агрегатов за период."""
+    return _rollup_rows(date_from, date_to).aggregate(total=Sum("total"))[
+        "total"
+    ] or Decimal("0")
+
+
+async def atotal_revenue(
+    date_from: Optional[date] = None, date_to: Optional[date] = None
+) -> Decimal:
+    """Асинхронный вариант total_revenue()."""
+    result = await _rollup_rows(date_from, date_to).aaggregate(
+        total=Sum("total")
+    )
+    return result["total"] or Decimal("0")
+
+
+def _series_rows(
+    group_by: str, date_from: Optional[date], date_to: Optional[date]
+) -> QuerySet:
+    """
+    Запрос строк выручки по группам: key, total_sum, orders_sum.
+    Группировки по дням и столам читаются из агрегатов DailyRevenue,
+    по часам — из частичного индекса оплаченных заказов и из архива.
+    Для статусов
+    суммируются только неоплаченные заказы (по индексу статуса):
+    оплаченные берутся из агрегатов через _paid_sums().
+    """
+    if group_by in ("day", "table"):
+        key = "date" if group_by == "day" else "table_number"
+        return (
+            _rollup_rows(date_from, date_to)
+            .filter(orders_count__gt=0)
+            .values(key=F(key))
+            .annotate(total_sum=Sum("total"), orders_sum=Sum("orders_count"))
+            .order_by("key")
+        )
+
+    orders = filter_period(Order.objects.all(), date_from, date_to)
+    if group_by == "hour":
+        return _hour_rows(orders.filter(status=PAID), date_from, date_to)
+    elif group_by == "status":
+        unpaid_statuses = [
+            status for status, _ in Order.STATUS_CHOICES if status != PAID
+        ]
+        orders = orders.filter(status__in=unpaid_statuses).values(
+            key=F("status")
+        )
+    else:
+        raise ValueError(f"Неизвестная группировка: {group_by}")
+    return orders.annotate(
+        total_sum=Sum("total_price"), orders_sum=Count("id")
+    ).order_by("key")
+
+
+def _hour_rows(
+    orders: QuerySet, date_from: Optional[date], date_to: Optional[date]
+) -> QuerySet:
+    """
+    Выручка по часам: оплаченные заказы вместе с архивными
+    одним UNION ALL, строки одного часа складываются в _series().
+    """
+
+    def by_hour(rows: QuerySet) -> QuerySet:
+        return (
+            rows.values(key=TruncHour("created_at"))
+            .annotate(total_sum=Sum("total_price"), orders_sum=Count("id"))
+            .order_by()
+        )
+
+    archived = filter_period(ArchivedOrder.objects.all(), date_from, date_to)
+    return by_hour(orders).union(by_hour(archived), all=True).order_by("key")
+
+
+def _paid_sums() -> dict[str, Sum]:
+    """Агрегаты оплаченных заказов для группировки по статусам."""
+    return {"total": Sum("total"), "orders_count": Sum("orders_count")}
+
+
+def _series(rows: list[dict], paid: Optional[dict]) -> list[dict]:
+    """
+    Строки ответа key, total, orders_count; для группировки
+    по статусам к ним добавляются оплаченные заказы paid.
+    """
+    merged = {}
+    for row in rows:
+        # Один час может прийти и из заказов, и из архива
+        line = merged.setdefault(
+            row["key"], {"key": row["key"], "total": 0, "orders_count": 0}
+        )
+        line["total"] += row["total_sum"]
+        line["orders_count"] += row["orders_sum"]
+    series = list(merged.values())
+    if paid is not None and paid["orders_count"]:
+        series.append({"key": PAID, **paid})
+        series.sort(key=lambda row: row["key"])
+    return series
+
+
+def revenue_series(
+    group_by: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> list[dict]:
+    """
+    Возвращает выручку за период, сгруппированную в БД.
+    Группировки по дням и столам читаются из агрегатов DailyRevenue,
+    по часам — из оплаченных и архивных заказов, по статусам —
+    из агрегатов для оплаченных и из заказов для остальных статусов.
+    Каждая строка: key, total, orders_count.
+    """
+    rows = list(_series_rows(group_by, date_from, date_to))
+    paid = None
+    if group_by == "status":
+        paid = _rollup_rows(date_from, date_to).aggregate(**_paid_sums())
+    return _series(rows, paid)
+
+
+async def arevenue_series(
+    group_by: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> list[dict]:
+    """Асинхронный вариант revenue_series()."""
+    rows = [row async for row in _series_rows(group_by, date_from, date_to)]
+    paid = None
+    if group_by == "status":
+        paid = await _rollup_rows(date_from, date_to).aaggregate(
+            **_paid_sums()
+        )
+    return _series(rows, paid)
+
+
+def live_rollup() -> list[DailyRevenue]:
+    """Считает агрегаты выручки заново по заказам и архиву."""
+    rollup = defaultdict(lambda: [Decimal("0"), 0])
+    for orders in (Order.objects.filter(status=PAID), ArchivedOrder.objects):
+        rows = (
+            orders.annotate(date=TruncDate("created_at"))
+            .values("date", "table_number")
+            .annotate(total=Sum("total_price"), orders_count=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            line = rollup[row["date"], row["table_number"]]
+            line[0] += row["total"]
+            line[1] += row["orders_count"]
+    return [
+        DailyRevenue(
+            date=day, table_number=table_number, total=total, orders_count=n
+        )
+        for (day, table_number), (total, n) in rollup.items()
+    ]
+
+
+def live_total_revenue() -> Decimal:
+    """Считает общую выручку напрямую по заказам и архиву."""
+    return sum(
+        (
+            orders.aggregate(total=Sum("total_price"))["total"] or 0
+            for orders in (
+                Order.objects.filter(status=PAID),
+                ArchivedOrder.objects.all(),
+            )
+        ),
+        Decimal("0"),
+    )
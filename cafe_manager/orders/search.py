@@ -0,0 +1,107 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import OrderItem
+
+# Конфигурация полнотекстового поиска PostgreSQL (стемминг snowball)
+SEARCH_CONFIG = "russian"
+
+# Функциональный GIN-индекс PostgreSQL по названиям блюд
+SEARCH_INDEX_NAME = "orderitem_name_search_idx"
+
+# Таблица FTS5 с названиями блюд для SQLite, rowid = id строки OrderItem
+FTS_TABLE = "orders_orderitem_fts"
+
+# Минимальная длина основы слова после отбрасывания окончания
+MIN_STEM_LENGTH = 3
+
+# Окончания существительных и прилагательных, от длинных к коротким
+ENDINGS = sorted(
+    (
+        "ами ями ого его ому ему ыми ими ах ях ам ям ом ем ой ей ий ый "
+        "ая яя ое ее ые ие ую юю ов ев а я о е ы и у ю ь"
+    ).split(),
+    key=len,
+    reverse=True,
+)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def search_vector() -> SearchVector:
+    """
+    Вектор поиска по названию блюда. Выражение совпадает
+    с выражением индекса SEARCH_INDEX_NAME, поэтому запрос
+    идет по индексу, а не по таблице.
+    """
+    return SearchVector("name", config=SEARCH_CONFIG)
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр для стемминга и «е» вместо «ё», как в FTS5."""
+    return text.lower().replace("ё", "е")
+
+
+def stem(word: str) -> str:
+    """
+    Упрощенный стемминг для SQLite: отбрасывает окончание,
+    если остается основа не короче MIN_STEM_LENGTH символов.
+    """
+    for ending in ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[: -len(ending)]
+    return word
+
+
+def fts_query(text: str) -> str:
+    """
+    Запрос FTS5: каждое слово — префикс своей основы («борщом» ->
+    "борщ"*), слова объединяются через AND. Кавычки исключают
+    синтаксис FTS5 из пользовательского текста.
+    """
+    return " ".join(
+        f'"{stem(word)}"*' for word in WORD_RE.findall(normalize(text))
+    )
+
+
+def matching_items(text: str, using: str) -> QuerySet:
+    """
+    Строки блюд, название которых подходит под запрос: на PostgreSQL
+    через GIN-индекс со стеммингом, на SQLite через FTS5, на других
+    БД — сравнением подстроки.
+    """
+    items = OrderItem.objects.using(using)
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        return items.annotate(search=search_vector()).filter(
+            search=SearchQuery(text, config=SEARCH_CONFIG)
+        )
+    if vendor == "sqlite":
+        query = fts_query(text)
+        if not query:
+            return items.none()
+        return items.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [query],
+            )
+        )
+    return items.filter(name__icontains=text)
+
+
+def search_orders(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Заказы, в которых есть блюдо, подходящее под запрос. Заказы
+    выбираются по id из найденных строк блюд: проверка EXISTS
+    для каждого заказа в порядке сортировки обходила бы всю таблицу
+    заказов, если подходящих блюд мало.
+    """
+    items = matching_items(text, queryset.db)
+    return queryset.filter(pk__in=items.values("order_id"))
@@ -0,0 +1,281 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DecimalField,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.utils import timezone
+
+from .board import OPEN_STATUSES
+from .models import Order, OrderItem, OrderState, TableSession
+from .revenue import PAID
+
+Change = tuple[Optional[OrderState], Optional[OrderState]]
+
+
+class SessionClosed(Exception):
+    """Сессию стола уже закрыли."""
+
+    def __init__(self, pk: int) -> None:
+        super().__init__(f"Счет #{pk} уже закрыт.")
+        self.pk = pk
+
+
+def _is_unpaid(state: Optional[OrderState]) -> bool:
+    return state is not None and state.status in OPEN_STATUSES
+
+
+def open_sessions() -> QuerySet:
+    """Открытые сессии столов."""
+    return TableSession.objects.filter(closed_at__isnull=True)
+
+
+def apply_changes(changes: list[Change]) -> None:
+    """
+    Переносит изменения заказов в открытые сессии столов.
+    Неоплаченный заказ в старом состоянии вычитается из сессии
+    своего стола, в новом — прибавляется; оплаченный заказ
+    добавляется к оплаченной сумме сессии и привязывается к ней.
+    Изменения группируются по столам и пишутся не больше чем тремя
+    запросами: столы, где неоплаченных заказов стало больше, —
+    одним INSERT ... ON CONFLICT (сессия открывается, если ее
+    не было), остальные — одним UPDATE, который закрывает сессии
+    без неоплаченных заказов; привязка оплаченных — одним UPDATE.
+    """
+    deltas = defaultdict(lambda: [Decimal("0"), 0, Decimal("0")])
+    paid = []
+    for old, new in changes:
+        if _is_unpaid(old):
+            delta = deltas[old.table_number]
+            delta[0] -= old.total_price
+            delta[1] -= 1
+            if new is not None and new.status == PAID:
+                delta[2] += old.total_price
+                paid.append(new.id)
+        if _is_unpaid(new):
+            delta = deltas[new.table_number]
+            delta[0] += new.total_price
+            delta[1] += 1
+
+    if paid:
+        _link_paid(paid)
+    opening = {key: delta for key, delta in deltas.items() if delta[1] > 0}
+    if opening:
+        _upsert(opening)
+    updates = {
+        key: delta
+        for key, delta in deltas.items()
+        if delta[1] <= 0 and any(delta)
+    }
+    if updates:
+        _update(updates)
+
+
+def _link_paid(pks: list[int]) -> None:
+    """
+    Привязывает оплаченные заказы к открытой сессии их стола, чтобы
+    они остались в счете после ее закрытия. Пишется только session_id,
+    без orders_changed.
+    """
+    QuerySet.update(
+        Order.objects.filter(pk__in=pks, session__isnull=True),
+        session=Subquery(
+            open_sessions()
+            .filter(table_number=OuterRef("table_number"))
+            .values("pk")[:1]
+        ),
+    )
+
+
+def _upsert(deltas: dict[int, list]) -> None:
+    """
+    Прибавляет дельты к открытым сессиям столов, открывая
+    недостающие: конфликт по частичному уникальному индексу
+    открытых сессий превращает вставку в увеличение суммы.
+    """
+    table = connection.ops.quote_name(TableSession._meta.db_table)
+    now = timezone.now()
+    params = []
+    for table_number, (amount, count, paid) in deltas.items():
+        params.extend([table_number, now, amount, count, paid])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (table_number, opened_at, unpaid_total, "
+            f"orders_count, paid_total) "
+            f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(deltas))} "
+            f"ON CONFLICT (table_number) WHERE closed_at IS NULL "
+            f"DO UPDATE SET "
+            f"unpaid_total = {table}.unpaid_total + excluded.unpaid_total, "
+            f"orders_count = {table}.orders_count + excluded.orders_count, "
+            f"paid_total = {table}.paid_total + excluded.paid_total",
+            params,
+        )
+
+
+def _update(deltas: dict[int, list]) -> None:
+    """
+    Прибавляет дельты к открытым сессиям столов одним UPDATE.
+    Сессия, в которой не осталось неоплаченных заказов, в том же
+    UPDATE закрывается: оплаченная сумма уже накоплена в paid_total.
+    """
+
+    def by_table(index: int, output_field) -> Case:
+        return Case(
+            *(
+                When(table_number=table_number, then=Value(delta[index]))
+                for table_number, delta in deltas.items()
+            ),
+            output_field=output_field,
+        )
+
+    now = timezone.now()
+    open_sessions().filter(table_number__in=deltas).update(
+        unpaid_total=F("unpaid_total") + by_table(0, DecimalField()),
+        orders_count=F("orders_count") + by_table(1, IntegerField()),
+        paid_total=F("paid_total") + by_table(2, DecimalField()),
+        # Справа в SET — значения строки до UPDATE
+        closed_at=Case(
+            *(
+                When(
+                    table_number=table_number,
+                    orders_count__lte=-delta[1],
+                    then=Value(now),
+                )
+                for table_number, delta in deltas.items()
+            ),
+            default=None,
+            output_field=DateTimeField(),
+        ),
+    )
+
+
+def get_open_session(table_number: int) -> Optional[TableSession]:
+    """
+    Открытая сессия стола — одна строка по уникальному частичному
+    индексу; None, если неоплаченных заказов у стола не было.
+    """
+    try:
+        return open_sessions().get(table_number=table_number)
+    except TableSession.DoesNotExist:
+        return None
+
+
+def session_orders(session: TableSession) -> QuerySet:
+    """
+    Заказы счета: у открытой сессии — неоплаченные заказы стола,
+    у закрытой — заказы, оплаченные при ее закрытии.
+    """
+    if session.is_open:
+        return Order.objects.filter(
+            table_number=session.table_number, status__in=OPEN_STATUSES
+        )
+    return session.orders.all()
+
+
+def close_session(pk: int) -> TableSession:
+    """
+    Закрывает сессию: все неоплаченные заказы стола оплачиваются
+    одним UPDATE, и сессия закрывается вместе с оплатой последнего
+    из них (см. _update). Заказ, созданный одновременно с закрытием,
+    попадает уже в новую сессию стола.
+    """
+    with transaction.atomic():
+        session = TableSession.objects.select_for_update().get(pk=pk)
+        if not session.is_open:
+            raise SessionClosed(pk)
+        session_orders(session).update(status=PAID, session=session)
+        session.refresh_from_db()
+        if session.is_open:
+            # Неоплаченных заказов у стола не осталось раньше
+            session.closed_at = timezone.now()
+            session.save(update_fields=["closed_at"])
+    return session
+
+
+def bill_lines(session: TableSession) -> list[dict]:
+    """Строки счета: блюда заказов сессии с суммой по каждому."""
+    items = OrderItem.objects.filter(
+        order__in=session_orders(session)
+    ).order_by("order_id", "id")
+    return [_line(item, item.quantity) for item in items]
+
+
+def _line(item: OrderItem, quantity: int) -> dict:
+    return {
+        "item": item.pk,
+        "order": item.order_id,
+        "name": item.name,
+        "price": item.price,
+        "quantity": quantity,
+        "total": item.price * quantity,
+    }
+
+
+def _part(lines: list[dict]) -> dict:
+    return {
+        "items": lines,
+        "total": sum((line["total"] for line in lines), Decimal("0")),
+    }
+
+
+def split_bill(session: TableSession, parts: list[list[dict]]) -> dict:
+    """
+    Делит счет по блюдам. Каждая часть — список {"item": id строки
+    счета, "quantity": сколько порций}; без quantity берутся все
+    порции блюда. Что не попало ни в одну часть, возвращается
+    в remainder. Ошибки по всем частям сообщаются вместе.
+    """
+    items = {
+        item.pk: item
+        for item in OrderItem.objects.filter(
+            order__in=session_orders(session)
+        ).order_by("order_id", "id")
+    }
+    left = {pk: item.quantity for pk, item in items.items()}
+    result, errors = [], []
+    for number, part in enumerate(parts, start=1):
+        lines = []
+        for entry in part:
+            item = items.get(entry["item"])
+            if item is None:
+                errors.append(
+                    f"Часть {number}: блюда {entry['item']} нет в счете."
+                )
+                continue
+            quantity = entry.get("quantity") or item.quantity
+            if quantity > left[item.pk]:
+                errors.append(
+                    f"Часть {number}: порций «{item.name}» осталось "
+                    f"{left[item.pk]}, а не {quantity}."
+                )
+                continue
+            left[item.pk] -= quantity
+            lines.append(_line(item, quantity))
+        result.append(_part(lines))
+    if errors:
+        raise ValidationError(errors)
+
+    remainder = _part(
+        [
+            _line(items[pk], quantity)
+            for pk, quantity in left.items()
+            if quantity
+        ]
+    )
+    return {
+        "parts": result,
+        "remainder": remainder,
+        "total": sum((part["total"] for part in result), remainder["total"]),
+    }
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Отправляется внутри транзакции после любого изменения заказов:
+# сохранения, удаления, bulk_create и update() на уровне QuerySet.
+# Аргумент changes — список пар (было, стало) из OrderState;
+# для нового заказа "было" равно None, для удаленного — "стало".
+# Необязательный аргумент publish=False (импорт исторических заказов)
+# обновляет агрегаты и доску, но не публикует события подписчикам.
+orders_changed = Signal()
+
+# Отправляется после изменения меню (MenuItem) через QuerySet.update()
+# и bulk_create, для которых Django не отправляет post_save.
+menu_changed = Signal()
@@ -7,5 +7,7 @@ urlpatterns = [
     path("create/", views.order_create, name="order_create"),
     path("<int:pk>/update/", views.order_update, name="order_update"),
     path("<int:pk>/delete/", views.order_delete, name="order_delete"),
+    path("kitchen/", views.kitchen_board, name="kitchen_board"),
+    path("events/", views.order_events, name="order_events"),
     path("revenue/", views.revenue_report, name="revenue_report"),
 ]
@@ -1,24 +1,118 @@
 from typing import Optional
 
-from django.db.models import Sum
-from django.http import HttpRequest, HttpResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
-from .forms import OrderForm
-from .models import Order
+from . import board, cache, events, revenue
+from .display import prepare_order_rows
+from .forms import OrderFilterForm, OrderForm, RevenueReportForm
+from .items import format_item_line
+from .models import Order, OrderVersionConflict
+from .pagination import InvalidCursor, get_page_size, paginate
 
 
+def _page_url(request: HttpRequest, cursor: Optional[str]) -> Optional[str]:
+    """Строит ссылку на соседнюю страницу, сохраняя параметры поиска."""
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return f"?{params.urlencode()}"
+
+
+def _list_scopes(request: HttpRequest) -> list[str]:
+    """
+    Список, отфильтрованный по номеру стола, зависит только от заказов
+    этого стола; остальные варианты — от всех заказов.
+    """
+    query = request.GET.get("q", "")
+    if query.isdigit():
+        return [cache.table_scope(int(query))]
+    return [cache.ALL_ORDERS]
+
+
+@cache.cache_view("order_list", _list_scopes)
 def order_list(request: HttpRequest) -> HttpResponse:
-    """Отображает список всех заказов."""
-    orders = Order.objects.all()
-    query = request.GET.get("q")
-    if query:
-        if query.isdigit():
-            orders = orders.filter(table_number=query)
-        else:
-            orders = orders.filter(status=query)
+    """Отображает список заказов постранично."""
+    orders = OrderFilterForm(request.GET).filter(
+        Order.objects.with_status_label()
+    )
+
+    try:
+        page = paginate(
+            orders,
+            request.GET.get("cursor"),
+            get_page_size(request.GET.get("page_size")),
+        )
+    except InvalidCursor:
+        raise Http404("Некорректный курсор.")
+    prepare_order_rows(page.object_list)
 
-    return render(request, "orders/order_list.html", {"orders": orders})
+    return render(
+        request,
+        "orders/order_list.html",
+        {
+            "orders": page.object_list,
+            "next_url": _page_url(request, page.next_cursor),
+            "previous_url": _page_url(request, page.previous_cursor),
+        },
+    )
+
+
+@cache_control(no_cache=True)
+@condition(
+    etag_func=board.request_etag,
+    last_modified_func=board.request_last_modified,
+)
+def kitchen_board(request: HttpRequest) -> HttpResponse:
+    """
+    Доска открытых заказов для кухни, сгруппированная по столам
+    (?table= — только один стол). Пока версия доски не изменилась,
+    повторный запрос получает 304 без выборки заказов и рендера.
+    """
+    table_number = board.requested_table(request)
+    orders = board.open_orders(table_number).prefetch_related("order_items")
+    return render(
+        request,
+        "orders/kitchen_board.html",
+        {
+            "tables": board.group_by_table(orders),
+            "table_number": table_number,
+        },
+    )
+
+
+async def order_events(request: HttpRequest) -> HttpResponse:
+    """
+    Поток событий изменений заказов (Server-Sent Events).
+    Подписка фильтруется параметрами ?table= и ?status=,
+    каждый можно указать несколько раз.
+    """
+    tables = request.GET.getlist("table")
+    statuses = request.GET.getlist("status")
+    if not all(table.isdigit() for table in tables):
+        return HttpResponseBadRequest("Некорректный номер стола.")
+    if not set(statuses) <= dict(Order.STATUS_CHOICES).keys():
+        return HttpResponseBadRequest("Некорректный статус.")
+
+    broker = events.get_broker()
+    subscription = broker.subscribe(map(int, tables), statuses)
+    response = StreamingHttpResponse(
+        events.stream_events(subscription, broker),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def order_create(
@@ -34,23 +128,66 @@ def order_create(
         form = OrderForm(request.POST or None)
         order = None
     if form.is_valid():
-        order = form.save(commit=False)
-        order.save()
-        return redirect("order_list")
+        return _save_order(request, form)
+    if form.is_stale():
+        return _conflict(request, form)
 
     return render(
         request, "orders/order_form.html", {"form": form, "order": order}
     )
 
 
+def _save_order(request: HttpRequest, form: OrderForm) -> HttpResponse:
+    """
+    Сохраняет заказ из формы и возвращает к списку. Если заказ успели
+    изменить после открытия формы, отвечает через _conflict().
+    """
+    try:
+        form.save()
+    except OrderVersionConflict:
+        return _conflict(request, form)
+    return redirect("order_list")
+
+
+def _conflict(request: HttpRequest, form: OrderForm) -> HttpResponse:
+    """
+    Ответ 409 на форму, открытую до чужого изменения заказа:
+    введенные данные остаются, а рядом — сохраненная версия заказа.
+    Версия в форме обновляется, поэтому повторная отправка осознанно
+    перезапишет заказ. Так же отвечает и устаревшая форма с ошибками:
+    например, статус в ней проверен уже относительно чужих изменений.
+    """
+    current = get_object_or_404(Order, pk=form.instance.pk)
+    form.data = form.data.copy()
+    form.data["version"] = current.version
+    items = "; ".join(format_item_line(item) for item in current.items)
+    form.add_error(
+        None,
+        "Заказ уже изменил другой пользователь: сейчас в нем "
+        f"стол {current.table_number}, статус "
+        f"«{current.get_status_display()}», блюда: {items}. "
+        "Проверьте свои изменения и сохраните заказ еще раз.",
+    )
+    return render(
+        request,
+        "orders/order_form.html",
+        {"form": form, "order": current},
+        status=409,
+    )
+
+
 def order_update(request: HttpRequest, pk: int) -> HttpResponse:
-    """Обновляет существующий заказ."""
+    """
+    Обновляет существующий заказ. Одновременные изменения не
+    перезаписывают друг друга: см. _save_order().
+    """
     order = get_object_or_404(Order, pk=pk)
     if request.method == "POST":
         form = OrderForm(request.POST, instance=order)
         if form.is_valid():
-            form.save()
-            return redirect("order_list")
+            return _save_order(request, form)
+        if form.is_stale():
+            return _conflict(request, form)
     else:
         form = OrderForm(instance=order)
 
@@ -69,15 +206,40 @@ def order_delete(request: HttpRequest, pk: int) -> HttpResponse:
     )
 
 
+def _series_label(group_by: str, key) -> str:
+    """Подпись строки отчета о выручке."""
+    if group_by == "day":
+        return key.strftime("%d.%m.%Y")
+    if group_by == "hour":
+        return timezone.localtime(key).strftime("%d.%m.%Y %H:00")
+    if group_by == "table":
+        return f"Стол {key}"
+    return dict(Order.STATUS_CHOICES).get(key, key)
+
+
+@cache.cache_view("revenue_report", lambda request: [cache.ALL_ORDERS])
 def revenue_report(request: HttpRequest) -> HttpResponse:
-    """Отображает отчет о выручке."""
-    total_revenue = (
-        Order.objects.filter(status="paid").aggregate(
-            total=Sum("total_price")
-        )["total"]
-        or 0
-    )
+    """Отображает отчет о выручке за период с группировкой."""
+    form = RevenueReportForm(request.GET)
+    params = form.cleaned_data if form.is_valid() else {}
+    date_from, date_to = params.get("from"), params.get("to")
+    group_by = params.get("group_by")
+
+    total_revenue = revenue.total_revenue(date_from, date_to)
+    series = []
+    if group_by:
+        series = [
+            {**row, "label": _series_label(group_by, row["key"])}
+            for row in revenue.revenue_series(group_by, date_from, date_to)
+        ]
 
     return render(
-        request, "orders/revenue_report.html", {"total_revenue": total_revenue}
+        request,
+        "orders/revenue_report.html",
+        {
+            "form": form,
+            "total_revenue": total_revenue,
+            "group_by": group_by,
+            "series": series,
+        },
     )
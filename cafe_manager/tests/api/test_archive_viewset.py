@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders import archive
+from orders.models import Order
+
+
+@pytest.mark.django_db
+def test_archive_is_opt_in(create_test_orders):
+    """Тест: архив не виден в списке заказов и читается отдельно."""
+    client = APIClient()
+    paid = create_test_orders[2]
+    Order.objects.filter(pk=paid.pk).update(
+        created_at=timezone.now() - timedelta(days=400)
+    )
+    archive.archive_orders()
+
+    response = client.get(reverse("api:orders-list"))
+    assert paid.pk not in [order["id"] for order in response.data["results"]]
+    response = client.get(reverse("api:orders-detail", args=[paid.pk]))
+    assert response.status_code == 404
+
+    response = client.get(reverse("api:archive-list"))
+    assert response.status_code == 200
+    assert [order["id"] for order in response.data["results"]] == [paid.pk]
+    assert response.data["results"][0]["items"][0]["name"] == "Салат"
+
+    response = client.get(reverse("api:archive-list"), {"search": "1"})
+    assert response.data["results"] == []
+    response = client.get(
+        reverse("api:archive-list"), {"from": timezone.localdate()}
+    )
+    assert response.data["results"] == []
+    response = client.get(reverse("api:archive-list"), {"from": "вчера"})
+    assert response.status_code == 400
+
+    response = client.get(reverse("api:archive-detail", args=[paid.pk]))
+    assert response.data["total_price"] == "200.00"
+    assert (
+        client.get(reverse("api:orders-revenue")).data["total_revenue"] == 200
+    )
@@ -0,0 +1,156 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.models import Order
+
+
+def async_request(method: str, path: str, *args, **kwargs):
+    """Выполняет запрос к асинхронному view через AsyncClient."""
+
+    async def request():
+        return await getattr(AsyncClient(), method)(path, *args, **kwargs)
+
+    return async_to_sync(request)()
+
+
+@pytest.mark.django_db
+def test_async_order_list_matches_sync(create_test_orders):
+    """Тест списка: JSON совпадает с синхронным API, включая пагинацию."""
+    sync = APIClient().get(reverse("api:orders-list"), {"page_size": 2})
+    response = async_request(
+        "get", reverse("api:async-orders-list"), {"page_size": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == sync.json()["results"]
+    assert data["previous"] is None
+
+    response = async_request("get", data["next"])
+    assert [order["id"] for order in response.json()["results"]] == [
+        create_test_orders[0].pk
+    ]
+    assert response.json()["next"] is None
+
+    response = async_request(
+        "get", reverse("api:async-orders-list"), {"search": "ready"}
+    )
+    assert [order["id"] for order in response.json()["results"]] == [
+        create_test_orders[1].pk
+    ]
+    response = async_request(
+        "get", reverse("api:async-orders-list"), {"cursor": "broken"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_order_detail_and_create(create_test_order):
+    """Тест чтения и создания заказа асинхронными view."""
+    url = reverse("api:async-orders-detail", args=[create_test_order.pk])
+    response = async_request("get", url)
+    assert response.status_code == 200
+    assert (
+        response.json()
+        == APIClient()
+        .get(reverse("api:orders-detail", args=[create_test_order.pk]))
+        .json()
+    )
+    assert response["ETag"] == '"1"'
+    assert (
+        async_request(
+            "get", reverse("api:async-orders-detail", args=[0])
+        ).status_code
+        == 404
+    )
+
+    response = async_request(
+        "post",
+        reverse("api:async-orders-list"),
+        {"table_number": 4, "items": [{"name": "Суп", "price": 300}]},
+        content_type="application/json",
+    )
+    assert response.status_code == 201
+    order = Order.objects.get(pk=response.json()["id"])
+    assert order.total_price == 300
+    assert (
+        response.json()
+        == APIClient()
+        .get(reverse("api:orders-detail", args=[order.pk]))
+        .json()
+    )
+
+    response = async_request(
+        "post",
+        reverse("api:async-orders-list"),
+        {"table_number": 4, "items": []},
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert "items" in response.json()
+    response = async_request("delete", url)
+    assert response.status_code == 405
+
+
+@pytest.mark.django_db
+def test_async_order_status(create_test_order):
+    """Тест смены статуса: условный UPDATE по If-Match и ошибки."""
+    url = reverse("api:async-orders-status", args=[create_test_order.pk])
+    response = async_request(
+        "patch",
+        url,
+        {"status": "ready"},
+        content_type="application/json",
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response["ETag"] == '"2"'
+
+    response = async_request(
+        "patch",
+        url,
+        {"status": "paid"},
+        content_type="application/json",
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 412
+    create_test_order.refresh_from_db()
+    assert create_test_order.status == "ready"
+
+    response = async_request(
+        "patch", url, {"status": "cooking"}, content_type="application/json"
+    )
+    assert response.status_code == 400
+    response = async_request(
+        "patch", url, "{", content_type="application/json"
+    )
+    assert response.status_code == 400
+    response = async_request(
+        "patch",
+        reverse("api:async-orders-status", args=[0]),
+        {"status": "paid"},
+        content_type="application/json",
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_async_order_revenue(create_test_orders):
+    """Тест выручки: ответ совпадает с синхронным endpoint'ом."""
+    for params in ({}, {"group_by": "status"}, {"group_by": "day"}):
+        response = async_request(
+            "get", reverse("api:async-orders-revenue"), params
+        )
+        assert response.status_code == 200
+        assert (
+            response.json()
+            == APIClient().get(reverse("api:orders-revenue"), params).json()
+        )
+    response = async_request(
+        "get", reverse("api:async-orders-revenue"), {"group_by": "week"}
+    )
+    assert response.status_code == 400
+    assert "group_by" in response.json()
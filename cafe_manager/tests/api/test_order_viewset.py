@@ -0,0 +1,524 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.export import iter_order_chunks
+from api.serializers import OrderSerializer
+from api.views import OrderViewSet
+from orders import revenue as orders_revenue
+from orders.models import Order
+
+
+@pytest.fixture
+def api_client():
+    """Фикстура клиента для REST API."""
+    return APIClient()
+
+
+@pytest.mark.django_db
+def test_order_list_pagination(api_client, create_test_orders):
+    """Тест keyset-пагинации списка заказов в API."""
+    url = reverse("api:orders-list")
+    response = api_client.get(url, {"page_size": 2})
+    assert response.status_code == 200
+    assert response.data["previous"] is None
+    assert [o["id"] for o in response.data["results"]] == [
+        create_test_orders[2].pk,
+        create_test_orders[1].pk,
+    ]
+
+    response = api_client.get(response.data["next"])
+    assert response.status_code == 200
+    assert [o["id"] for o in response.data["results"]] == [
+        create_test_orders[0].pk
+    ]
+    assert response.data["next"] is None
+    assert response.data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_order_list_pagination_stable_under_inserts(
+    api_client, create_test_orders
+):
+    """Тест: новые заказы не сдвигают следующую страницу."""
+    url = reverse("api:orders-list")
+    first = api_client.get(url, {"page_size": 2})
+    Order.objects.create(table_number=9, items=[{"name": "чай", "price": 50}])
+
+    response = api_client.get(first.data["next"])
+    assert [o["id"] for o in response.data["results"]] == [
+        create_test_orders[0].pk
+    ]
+
+
+@pytest.mark.django_db
+def test_order_list_invalid_cursor(api_client):
+    """Тест обработки некорректного курсора в API."""
+    response = api_client.get(reverse("api:orders-list"), {"cursor": "x"})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_order_list_items_without_n_plus_one(
+    api_client, create_test_orders, django_assert_num_queries
+):
+    """Тест: блюда всех заказов загружаются одним запросом."""
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse("api:orders-list"))
+    assert response.data["results"][0]["items"] == [
+        {"name": "Салат", "price": 200}
+    ]
+
+
+@pytest.mark.django_db
+def test_order_create_writes_item_rows(api_client):
+    """Тест создания заказа через API со строками блюд."""
+    response = api_client.post(
+        reverse("api:orders-list"),
+        {
+            "table_number": 1,
+            "items": [
+                {"name": "борщ", "price": 100},
+                {"name": "гречка", "price": 20.5},
+            ],
+            "status": "pending",
+        },
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.data["total_price"] == "120.50"
+
+    order = Order.objects.get(pk=response.data["id"])
+    assert order.order_items.count() == 2
+
+
+@pytest.mark.django_db
+def test_revenue_grouped_by_day(api_client, create_test_orders):
+    """Тест endpoint'а выручки с группировкой по дням."""
+    today = timezone.localdate().isoformat()
+    response = api_client.get(
+        reverse("api:orders-revenue"),
+        {"from": today, "to": today, "group_by": "day"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_revenue": 200.0,
+        "group_by": "day",
+        "results": [{"key": today, "total": 200.0, "orders_count": 1}],
+    }
+
+
+@pytest.mark.django_db
+def test_revenue_invalid_params(api_client):
+    """Тест проверки параметров endpoint'а выручки."""
+    response = api_client.get(
+        reverse("api:orders-revenue"),
+        {"from": "2025-02-01", "to": "2025-01-01", "group_by": "week"},
+    )
+    assert response.status_code == 400
+    assert "group_by" in response.data
+
+
+@pytest.mark.django_db
+def test_bulk_create(api_client, django_assert_max_num_queries):
+    """Тест массового создания заказов."""
+    payload = [
+        {"table_number": 1, "items": [{"name": "борщ", "price": 100}]},
+        {
+            "table_number": 2,
+            "items": [
+                {"name": "чай", "price": 30},
+                {"name": "сок", "price": 70},
+            ],
+            "status": "paid",
+        },
+    ]
+    # 8 запросов на заказы и выручку, 3 на первое создание строк
+    # версий доски открытых заказов, 1 на сессии столов и 1 на чтение
+    # меню в кэш процесса (один на весь запрос, а не на каждый заказ)
+    with django_assert_max_num_queries(13):
+        response = api_client.post(
+            reverse("api:orders-bulk"), payload, format="json"
+        )
+
+    assert response.status_code == 201
+    assert [o["total_price"] for o in response.data] == ["100.00", "100.00"]
+    assert Order.objects.count() == 2
+    assert Order.objects.get(table_number=2).items == [
+        {"name": "чай", "price": 30},
+        {"name": "сок", "price": 70},
+    ]
+    assert orders_revenue.total_revenue() == 100
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_errors_per_item(api_client):
+    """Тест: при ошибке ничего не создается, ошибки указаны по позициям."""
+    payload = [
+        {"table_number": 1, "items": [{"name": "борщ", "price": 100}]},
+        {"table_number": 2, "items": []},
+    ]
+    response = api_client.post(
+        reverse("api:orders-bulk"), payload, format="json"
+    )
+
+    assert response.status_code == 400
+    assert response.data[0] == {}
+    assert "items" in response.data[1]
+    assert Order.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_update(api_client, create_test_orders):
+    """Тест массового обновления заказов."""
+    pizza, pasta, _ = create_test_orders
+    payload = [
+        {"id": pasta.pk, "table_number": 5},
+        {"id": pizza.pk, "items": [{"name": "Пицца", "price": 900}]},
+    ]
+    response = api_client.patch(
+        reverse("api:orders-bulk"), payload, format="json"
+    )
+
+    assert response.status_code == 200
+    pizza.refresh_from_db()
+    pasta.refresh_from_db()
+    assert (pasta.table_number, pasta.status) == (5, "ready")
+    assert pizza.total_price == 900
+    assert pizza.items == [{"name": "Пицца", "price": 900}]
+    assert orders_revenue.total_revenue() == 200
+
+
+@pytest.mark.django_db
+def test_bulk_update_rejects_status(api_client, create_test_orders):
+    """Тест: статус массово меняется только через /bulk-status/."""
+    _, pasta, salad = create_test_orders
+    response = api_client.patch(
+        reverse("api:orders-bulk"),
+        [
+            {"id": pasta.pk, "table_number": 5},
+            {"id": salad.pk, "status": "ready"},
+        ],
+        format="json",
+    )
+    assert response.status_code == 400
+    assert response.data[1]["status"] == [
+        "Статус заказов массово меняется через /api/orders/bulk-status/."
+    ]
+    salad.refresh_from_db()
+    assert (salad.status, salad.version) == ("paid", 1)
+    assert Order.objects.get(pk=pasta.pk).table_number == 2
+
+
+@pytest.mark.django_db
+def test_bulk_update_checks_versions(api_client, create_test_orders):
+    """
+    Тест: заказ, измененный после чтения, — ошибка своей позиции
+    (412 с version, 409 без нее), остальные заказы не пишутся.
+    """
+    pizza, pasta, _ = create_test_orders
+    Order.objects.get(pk=pasta.pk).save()
+    url = reverse("api:orders-bulk")
+
+    response = api_client.patch(
+        url,
+        [
+            {"id": pizza.pk, "version": 1, "table_number": 7},
+            {"id": pasta.pk, "version": 1, "table_number": 7},
+        ],
+        format="json",
+    )
+    assert response.status_code == 412
+    assert response.data == [
+        {},
+        {"version": ["Версия заказа не совпадает с текущей."]},
+    ]
+    assert not Order.objects.filter(table_number=7).exists()
+
+    Order.objects.filter(pk=pasta.pk).delete()
+    response = api_client.patch(
+        url,
+        [{"id": pizza.pk, "table_number": 7, "version": "1"}],
+        format="json",
+    )
+    assert response.status_code == 400
+    assert "version" in response.data[0]
+
+    response = api_client.patch(
+        url, [{"id": pizza.pk, "table_number": 7}], format="json"
+    )
+    assert response.status_code == 200
+    assert response.data[0]["version"] == 2
+
+
+@pytest.mark.django_db
+def test_bulk_update_unknown_id(api_client, create_test_orders):
+    """Тест ошибки массового обновления для несуществующего заказа."""
+    response = api_client.patch(
+        reverse("api:orders-bulk"),
+        [{"id": 999, "status": "paid"}],
+        format="json",
+    )
+    assert response.status_code == 400
+    assert "id" in response.data[0]
+
+
+@pytest.mark.django_db
+def test_bulk_status(api_client, create_test_orders):
+    """Тест массовой смены статуса условным UPDATE по статусу."""
+    ids = [order.pk for order in create_test_orders[:2]] + [999]
+    response = api_client.patch(
+        reverse("api:orders-bulk-status"),
+        {"ids": ids, "status": "paid"},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.data["updated"] == [ids[1]]
+    assert response.data["errors"] == [
+        {
+            "id": ids[0],
+            "detail": "Заказ в статусе «В ожидании» нельзя перевести "
+            "в статус «Оплачено».",
+        },
+        {"id": 999, "detail": "Заказ с таким id не найден."},
+    ]
+    assert Order.objects.filter(status="paid").count() == 2
+    assert orders_revenue.total_revenue() == 550
+
+    response = api_client.patch(
+        reverse("api:orders-bulk-status"),
+        {"ids": ids, "status": "pending"},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert "status" in response.data
+
+
+@pytest.mark.django_db
+def test_fast_read_matches_model_serializer(api_client, create_test_orders):
+    """Тест: быстрый путь чтения отдает тот же JSON, что OrderSerializer."""
+    order = Order.objects.create(
+        table_number=5,
+        items=[
+            {"name": "хлеб", "price": "2.5", "quantity": 4},
+            {"name": "суп", "price": 199.99},
+        ],
+    )
+    renderer = JSONRenderer()
+    orders = Order.objects.prefetch_related("order_items")
+
+    response = api_client.get(reverse("api:orders-list"))
+    expected = {
+        "next": None,
+        "previous": None,
+        "results": OrderSerializer(orders, many=True).data,
+    }
+    assert response.content == renderer.render(expected)
+
+    response = api_client.get(
+        reverse("api:orders-detail", kwargs={"pk": order.pk})
+    )
+    assert response.content == renderer.render(OrderSerializer(order).data)
+
+
+@pytest.mark.django_db
+def test_export_csv(api_client, create_test_orders, settings):
+    """Тест потоковой выгрузки заказов в CSV с фильтром."""
+    settings.ORDERS_EXPORT_CHUNK_SIZE = 1
+    create_test_orders[0].items = [
+        {"name": "Пицца", "price": 800},
+        {"name": "сок", "price": 50, "quantity": 2},
+    ]
+    create_test_orders[0].save()
+
+    response = api_client.get(
+        reverse("api:orders-export"), {"format": "csv", "q": "1"}
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == "id,table_number,status,total_price,created_at,items"
+    assert len(lines) == 2
+    assert lines[1].startswith(f"{create_test_orders[0].pk},1,pending,900.00,")
+    assert lines[1].endswith(",Пицца 800.00; сок x2 50.00")
+
+
+@pytest.mark.django_db
+def test_export_ndjson(api_client, create_test_orders, settings):
+    """Тест потоковой выгрузки заказов в NDJSON по статусу."""
+    settings.ORDERS_EXPORT_CHUNK_SIZE = 2
+    response = api_client.get(
+        reverse("api:orders-export"), {"format": "ndjson", "status": "paid"}
+    )
+
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        create_test_orders[2].pk
+    ]
+    assert json.loads(lines[0])["items"] == [{"name": "Салат", "price": 200.0}]
+
+    response = api_client.get(
+        reverse("api:orders-export"), {"format": "ndjson"}
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert len(lines) == 3
+
+
+@pytest.mark.django_db
+def test_export_pages_by_key(create_test_orders, settings):
+    """
+    Тест: выгрузка читает пачки отдельными запросами WHERE id > <n>
+    LIMIT, без серверного курсора (как за PgBouncer).
+    """
+    settings.ORDERS_EXPORT_CHUNK_SIZE = 2
+    with CaptureQueriesContext(connection) as queries:
+        chunks = list(iter_order_chunks(Order.objects.all()))
+
+    assert [[row["id"] for row in chunk] for chunk in chunks] == [
+        [order.pk for order in create_test_orders[:2]],
+        [create_test_orders[2].pk],
+    ]
+    assert chunks[1][0]["items"] == [{"name": "Салат", "price": 200}]
+    pages = [
+        query["sql"]
+        for query in queries.captured_queries
+        if 'FROM "orders_order"' in query["sql"]
+    ]
+    assert len(pages) == 2
+    assert "LIMIT 2" in pages[0]
+    assert f'"id" > {create_test_orders[1].pk}' in pages[1]
+
+
+@pytest.mark.django_db
+def test_export_invalid_filters(api_client):
+    """Тест ошибки выгрузки при некорректном периоде."""
+    response = api_client.get(
+        reverse("api:orders-export"), {"format": "csv", "from": "вчера"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_open_orders(api_client, create_test_orders):
+    """Тест открытых заказов по столам и условного GET в API."""
+    url = reverse("api:orders-open-orders")
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert [
+        (table["table_number"], [o["id"] for o in table["orders"]])
+        for table in response.data["tables"]
+    ] == [(1, [create_test_orders[0].pk]), (2, [create_test_orders[1].pk])]
+    assert response.data["tables"][0]["orders"][0]["items"] == [
+        {"name": "Пицца", "price": 800}
+    ]
+    etag = response["ETag"]
+    assert etag == f'"{response.data["version"]}"'
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Order.objects.filter(pk=create_test_orders[0].pk).update(status="ready")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.data["tables"][0]["orders"][0]["status"] == "ready"
+
+
+@pytest.mark.django_db
+def test_order_if_match(api_client, create_test_orders):
+    """Тест ETag и If-Match: изменение по устаревшей версии — 412."""
+    order = create_test_orders[0]
+    url = reverse("api:orders-detail", args=[order.pk])
+    response = api_client.get(url)
+    assert response["ETag"] == '"1"'
+    assert response.data["version"] == 1
+
+    response = api_client.patch(
+        url, {"status": "ready"}, format="json", HTTP_IF_MATCH='"1"'
+    )
+    assert response.status_code == 200
+    assert response["ETag"] == '"2"'
+
+    response = api_client.patch(
+        url, {"status": "paid"}, format="json", HTTP_IF_MATCH='"1"'
+    )
+    assert response.status_code == 412
+    response = api_client.delete(url, HTTP_IF_MATCH='"1"')
+    assert response.status_code == 412
+    assert Order.objects.get(pk=order.pk).status == "ready"
+
+    response = api_client.put(
+        url,
+        {"table_number": 3, "items": [{"name": "чай", "price": 60}]},
+        format="json",
+        HTTP_IF_MATCH="*",
+    )
+    assert response.status_code == 200
+    assert response.data["version"] == 3
+
+
+@pytest.mark.django_db
+def test_order_concurrent_update(api_client, create_test_orders, monkeypatch):
+    """
+    Тест одновременного изменения: заказ изменили между чтением
+    и записью — 409 без If-Match, 412 с ним; данные не теряются.
+    """
+    order = create_test_orders[0]
+    url = reverse("api:orders-detail", args=[order.pk])
+    get_object = OrderViewSet.get_object
+
+    def get_stale_object(self):
+        stale = get_object(self)
+        Order.objects.filter(pk=stale.pk).update(table_number=9)
+        return stale
+
+    monkeypatch.setattr(OrderViewSet, "get_object", get_stale_object)
+    response = api_client.patch(url, {"status": "ready"}, format="json")
+    assert response.status_code == 409
+    response = api_client.patch(
+        url, {"status": "ready"}, format="json", HTTP_IF_MATCH="*"
+    )
+    assert response.status_code == 412
+
+    order.refresh_from_db()
+    assert (order.table_number, order.status) == (9, "pending")
+
+
+@pytest.mark.django_db
+def test_status_actions(api_client, create_test_order):
+    """Тест действий ready и pay: переходы, 409, 412 и 404."""
+    ready_url = reverse("api:orders-ready", args=[create_test_order.pk])
+    pay_url = reverse("api:orders-pay", args=[create_test_order.pk])
+
+    response = api_client.post(pay_url)
+    assert response.status_code == 409
+    assert response.data["detail"] == (
+        "Заказ в статусе «В ожидании» нельзя перевести в статус «Оплачено»."
+    )
+
+    response = api_client.post(ready_url, HTTP_IF_MATCH='"1"')
+    assert response.status_code == 200
+    assert response.data["status"] == "ready"
+    assert response.data["ready_at"] is not None
+    assert response["ETag"] == '"2"'
+
+    response = api_client.post(pay_url, HTTP_IF_MATCH='"1"')
+    assert response.status_code == 412
+    response = api_client.post(pay_url, HTTP_IF_MATCH='"2"')
+    assert response.status_code == 200
+    assert response.data["status"] == "paid"
+    assert orders_revenue.total_revenue() == 800
+
+    response = api_client.post(reverse("api:orders-pay", args=[0]))
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.models import Order, TableSession
+
+
+@pytest.fixture
+def api_client():
+    """Фикстура клиента для REST API."""
+    return APIClient()
+
+
+@pytest.mark.django_db
+def test_table_balance(
+    api_client, create_test_orders, django_assert_num_queries
+):
+    """Тест баланса стола: одна строка сессии, без суммы по заказам."""
+    Order.objects.create(table_number=1, items=[{"name": "Чай", "price": 50}])
+    session = TableSession.objects.get(table_number=1)
+
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse("api:table-balance", args=[1]))
+    assert response.status_code == 200
+    assert response.data == {
+        "table_number": 1,
+        "session": session.pk,
+        "unpaid_total": "850.00",
+        "orders_count": 2,
+    }
+
+    response = api_client.get(reverse("api:table-balance", args=[3]))
+    assert response.data == {
+        "table_number": 3,
+        "session": None,
+        "unpaid_total": "0.00",
+        "orders_count": 0,
+    }
+
+
+@pytest.mark.django_db
+def test_session_list_and_close(api_client, create_test_orders):
+    """Тест списка открытых счетов, счета и его закрытия."""
+    response = api_client.get(reverse("api:sessions-list"))
+    assert [
+        (row["table_number"], row["unpaid_total"]) for row in response.data
+    ] == [(1, "800.00"), (2, "350.00")]
+
+    pk = response.data[0]["id"]
+    response = api_client.get(reverse("api:sessions-detail", args=[pk]))
+    assert [
+        (line["name"], line["quantity"]) for line in response.data["items"]
+    ] == [("Пицца", 1)]
+
+    response = api_client.post(reverse("api:sessions-close", args=[pk]))
+    assert response.status_code == 200
+    assert response.data["paid_total"] == "800.00"
+    assert response.data["closed_at"] is not None
+    assert Order.objects.get(pk=create_test_orders[0].pk).status == "paid"
+    assert [
+        row["table_number"]
+        for row in api_client.get(reverse("api:sessions-list")).data
+    ] == [2]
+
+    response = api_client.post(reverse("api:sessions-close", args=[pk]))
+    assert response.status_code == 409
+    response = api_client.post(reverse("api:sessions-close", args=[0]))
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_session_split(api_client):
+    """Тест деления счета и ошибок по частям."""
+    Order.objects.create(
+        table_number=1,
+        items=[
+            {"name": "Суп", "price": 300},
+            {"name": "Чай", "price": 50, "quantity": 2},
+        ],
+    )
+    session = TableSession.objects.get(table_number=1)
+    lines = api_client.get(
+        reverse("api:sessions-detail", args=[session.pk])
+    ).data["items"]
+    soup, tea = (line["item"] for line in lines)
+    url = reverse("api:sessions-split", args=[session.pk])
+
+    response = api_client.post(
+        url,
+        {"parts": [[{"item": soup}], [{"item": tea, "quantity": 1}]]},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert [part["total"] for part in response.data["parts"]] == [300, 50]
+    assert response.data["remainder"]["total"] == 50
+
+    response = api_client.post(
+        url, {"parts": [[{"item": tea, "quantity": 3}]]}, format="json"
+    )
+    assert response.status_code == 400
+    assert response.data["parts"] == [
+        "Часть 1: порций «Чай» осталось 2, а не 3."
+    ]
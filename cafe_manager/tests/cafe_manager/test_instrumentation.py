@@ -0,0 +1,137 @@
+import re
+from importlib import reload
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient
+from django.urls import NoReverseMatch, clear_url_caches, reverse
+from rest_framework.test import APIClient
+
+from cafe_manager import urls
+from cafe_manager.instrumentation import instrument, registry
+from orders.models import Order
+
+
+def timings(response) -> dict[str, float]:
+    """Длительности из заголовка Server-Timing по именам метрик."""
+    return {
+        name: float(duration)
+        for name, duration in re.findall(
+            r"(\w+);dur=([\d.]+)", response["Server-Timing"]
+        )
+    }
+
+
+def reload_urls() -> None:
+    """Перечитывает корневой URLconf: /metrics/ зависит от настройки."""
+    reload(urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def instrumentation(settings):
+    """
+    Включает измерение запросов, как при INSTRUMENTATION_ENABLED=True
+    в окружении: бэкенд шаблонов с измерением и /metrics/. Очищает
+    гистограммы.
+    """
+    enabled = settings.INSTRUMENTATION_ENABLED
+    settings.INSTRUMENTATION_ENABLED = True
+    settings.TEMPLATES = [
+        {
+            **settings.TEMPLATES[0],
+            "BACKEND": "cafe_manager.instrumentation.DjangoTemplates",
+        }
+    ]
+    reload_urls()
+    registry.reset()
+    yield
+    registry.reset()
+    settings.INSTRUMENTATION_ENABLED = enabled
+    reload_urls()
+
+
+@pytest.mark.django_db
+def test_disabled(client, create_test_orders, settings):
+    """Тест: при выключенной настройке middleware не подключается."""
+    settings.INSTRUMENTATION_ENABLED = False
+    response = client.get(reverse("order_list"))
+    assert "Server-Timing" not in response
+    assert client.get("/metrics/").status_code == 404
+    with pytest.raises(NoReverseMatch):
+        reverse("metrics")
+
+
+@pytest.mark.django_db
+def test_server_timing(client, instrumentation, create_test_orders):
+    """Тест заголовка Server-Timing для HTML-страницы и ответа API."""
+    response = client.get(reverse("order_list"))
+    assert '"2 SQL"' in response["Server-Timing"]
+    html = timings(response)
+    assert html["tpl"] > 0
+    assert html["ser"] == 0
+    assert html["total"] >= html["db"]
+
+    api = timings(APIClient().get(reverse("api:orders-list")))
+    assert api["ser"] > 0
+    assert api["tpl"] == 0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client, instrumentation, create_test_orders):
+    """Тест гистограмм Prometheus по именам URL."""
+    client.get(reverse("order_list"))
+    client.get(reverse("order_list"), {"q": "1"})
+    client.get("/nonexistent/")
+
+    content = client.get(reverse("metrics")).content.decode()
+    assert "# TYPE cafe_request_queries histogram" in content
+    assert 'cafe_request_queries_bucket{view="order_list",le="1"} 0' in content
+    assert 'cafe_request_queries_bucket{view="order_list",le="2"} 2' in content
+    assert 'cafe_request_queries_count{view="order_list"} 2' in content
+    assert (
+        'cafe_request_duration_seconds_count{view="unresolved"} 1' in content
+    )
+    assert (
+        'cafe_request_template_seconds_bucket{view="order_list",le="+Inf"} 2'
+        in content
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_access(client, instrumentation, settings):
+    """Тест: /metrics/ доступен адресам из списка и персоналу."""
+    settings.INSTRUMENTATION_METRICS_IPS = ["10.0.0.5"]
+    assert client.get(reverse("metrics")).status_code == 403
+    response = client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.5")
+    assert response.status_code == 200
+
+    client.force_login(User.objects.create_user("manager", is_staff=True))
+    assert client.get(reverse("metrics")).status_code == 200
+
+
+@pytest.mark.django_db
+def test_async_handler(instrumentation, create_test_orders):
+    """Тест middleware в асинхронном обработчике запросов."""
+
+    async def get():
+        return await AsyncClient().get(reverse("kitchen_board"))
+
+    response = async_to_sync(get)()
+    assert response.status_code == 200
+    assert '"3 SQL"' in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_instrument_context_manager(create_test_orders):
+    """Тест измерения блока кода без middleware."""
+    with instrument() as metrics:
+        list(Order.objects.all())
+        Order.objects.count()
+    assert metrics.queries == 2
+    assert metrics.total_time >= metrics.db_time > 0
+
+    with instrument() as metrics:
+        pass
+    assert metrics.queries == 0
@@ -0,0 +1,46 @@
+import runpy
+
+import pytest
+
+from cafe_manager import settings
+
+
+def load_settings(monkeypatch, **env) -> dict:
+    """Исполняет модуль настроек заново с переменными окружения env."""
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(settings.__file__)
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({"DATABASE_CONN_MAX_AGE": "300"}, (300, True, False)),
+        ({"DATABASE_CONN_MAX_AGE": "None"}, (None, True, False)),
+        (
+            {
+                "DATABASE_CONN_MAX_AGE": "0",
+                "DATABASE_CONN_HEALTH_CHECKS": "False",
+                "DATABASE_PGBOUNCER": "True",
+            },
+            (0, False, True),
+        ),
+    ],
+)
+def test_database_connection_settings(monkeypatch, env, expected):
+    """Тест настроек соединений с БД из переменных окружения."""
+    monkeypatch.delenv("DJANGO_ASGI", raising=False)
+    database = load_settings(monkeypatch, **env)["DATABASES"]["default"]
+    assert (
+        database["CONN_MAX_AGE"],
+        database["CONN_HEALTH_CHECKS"],
+        database["DISABLE_SERVER_SIDE_CURSORS"],
+    ) == expected
+
+
+def test_asgi_closes_connections(monkeypatch):
+    """Тест: под ASGI постоянные соединения отключаются."""
+    database = load_settings(
+        monkeypatch, DJANGO_ASGI="True", DATABASE_CONN_MAX_AGE="300"
+    )["DATABASES"]["default"]
+    assert database["CONN_MAX_AGE"] == 0
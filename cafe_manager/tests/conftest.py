@@ -1,7 +1,53 @@
+from contextlib import contextmanager
+
 import pytest
+from django.core.cache import cache
+
+from cafe_manager.instrumentation import request_measured
+
+from orders.cache import stats
 from orders.models import Order
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Очищает кэш ответов: откат транзакции теста его не сбрасывает."""
+    cache.clear()
+    stats.reset()
+
+
+@pytest.fixture
+def query_budgets(settings):
+    """
+    Включает измерение запросов и возвращает контекстный менеджер,
+    который проверяет бюджеты SQL-запросов {имя URL: максимум}
+    для всех запросов к view внутри блока. Запрос к view без бюджета
+    тоже считается ошибкой: новые view не остаются без проверки.
+    """
+    settings.INSTRUMENTATION_ENABLED = True
+
+    @contextmanager
+    def check(budgets: dict[str, int]):
+        measured = []
+
+        def receiver(sender, view_name, metrics, **kwargs) -> None:
+            measured.append((view_name, metrics.queries))
+
+        request_measured.connect(receiver, dispatch_uid="query_budgets")
+        try:
+            yield measured
+        finally:
+            request_measured.disconnect(dispatch_uid="query_budgets")
+        over = [
+            f"{view}: {queries} SQL (бюджет {budgets.get(view)})"
+            for view, queries in measured
+            if queries > budgets.get(view, -1)
+        ]
+        assert not over, "Превышен бюджет запросов: " + "; ".join(over)
+
+    return check
+
+
 @pytest.fixture
 def create_test_orders():
     """Фикстура для создания тестовых заказов."""
@@ -0,0 +1,136 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.admin import helpers
+from django.urls import reverse
+from django.utils import timezone
+
+from orders import archive, revenue
+from orders.admin import _periods, estimated_count
+from orders.models import ArchivedOrder, Order
+
+
+@pytest.fixture
+def orders():
+    """Фикстура заказов на столах 1–6: блюдо «Борщ» на четных."""
+    return Order.objects.bulk_create_with_items(
+        [
+            Order(
+                table_number=number,
+                status="pending",
+                items=[
+                    {
+                        "name": "Борщ" if number % 2 == 0 else "Чай",
+                        "price": 100,
+                    }
+                ],
+            )
+            for number in range(1, 7)
+        ]
+    )
+
+
+def changelist_ids(admin_client, params: dict) -> list[int]:
+    response = admin_client.get(
+        reverse("admin:orders_order_changelist"), params
+    )
+    assert response.status_code == 200
+    return sorted(
+        order.table_number for order in response.context["cl"].result_list
+    )
+
+
+@pytest.mark.django_db
+def test_changelist_filters(admin_client, orders):
+    """
+    Тест списка заказов в админке: диапазон столов, поиск по номеру
+    стола, статусу и блюду, date_hierarchy.
+    """
+    assert changelist_ids(admin_client, {}) == [1, 2, 3, 4, 5, 6]
+    assert changelist_ids(
+        admin_client, {"table_number__gte": 2, "table_number__lte": 4}
+    ) == [2, 3, 4]
+    assert changelist_ids(admin_client, {"q": "3"}) == [3]
+    assert changelist_ids(admin_client, {"q": "борщ"}) == [2, 4, 6]
+    assert changelist_ids(admin_client, {"q": "paid"}) == []
+
+    today = orders[0].created_at
+    response = admin_client.get(
+        reverse("admin:orders_order_changelist"),
+        {"created_at__year": today.year, "table_number__gte": 5},
+    )
+    content = response.content.decode()
+    assert 'name="table_number__gte" value="5"' in content
+    assert 'type="hidden" name="created_at__year"' in content
+
+    response = admin_client.get(
+        reverse("admin:orders_order_changelist"), {"table_number__gte": "x"}
+    )
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_changelist_status_action(admin_client, orders):
+    """Тест смены статуса действием админки: только по порядку."""
+
+    def run(action: str, pks: list[int]) -> str:
+        return admin_client.post(
+            reverse("admin:orders_order_changelist"),
+            {"action": action, helpers.ACTION_CHECKBOX_NAME: pks},
+            follow=True,
+        ).content.decode()
+
+    content = run("mark_ready", [orders[0].pk])
+    assert "Статус «Готово» установлен у заказов: 1." in content
+    content = run("mark_paid", [orders[0].pk, orders[1].pk])
+    assert "Статус «Оплачено» установлен у заказов: 1." in content
+    assert "Пропущено заказов не в статусе «Готово»: 1." in content
+    assert dict(Order.objects.values_list("pk", "status")) == {
+        order.pk: "paid" if order == orders[0] else "pending"
+        for order in orders
+    }
+
+
+@pytest.mark.django_db
+def test_archive_is_read_only(admin_client, create_test_orders):
+    """Тест: архив в админке только просматривается, удалить нельзя."""
+    paid = create_test_orders[2]
+    Order.objects.filter(pk=paid.pk).update(
+        created_at=timezone.now() - timedelta(days=400)
+    )
+    archive.archive_orders()
+
+    response = admin_client.get(
+        reverse("admin:orders_archivedorder_changelist")
+    )
+    assert response.status_code == 200
+    assert "delete_selected" not in response.content.decode()
+    response = admin_client.post(
+        reverse("admin:orders_archivedorder_delete", args=[paid.pk]),
+        {"post": "yes"},
+    )
+    assert response.status_code == 403
+    assert ArchivedOrder.objects.filter(pk=paid.pk).exists()
+    assert revenue.total_revenue() == revenue.live_total_revenue() == 200
+
+
+@pytest.mark.django_db
+def test_estimated_count_sqlite(orders):
+    """Тест: на SQLite число заказов считается точно."""
+    assert estimated_count(Order.objects.all()) == 6
+    assert estimated_count(Order.objects.filter(table_number__gte=5)) == 2
+
+
+def test_periods():
+    """Тест периодов date_hierarchy между первой и последней датой."""
+    assert _periods(date(2023, 11, 5), date(2024, 2, 1), "month") == [
+        date(2023, 11, 1),
+        date(2023, 12, 1),
+        date(2024, 1, 1),
+        date(2024, 2, 1),
+    ]
+    assert _periods(date(2023, 11, 5), date(2024, 2, 1), "year") == [
+        date(2023, 1, 1),
+        date(2024, 1, 1),
+    ]
+    assert len(_periods(date(2024, 2, 1), date(2024, 2, 29), "day")) == 29
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from orders import archive, revenue
+from orders.models import ArchivedOrder, Order, OrderItem
+
+
+def make_old_orders(days: int = 400) -> list[Order]:
+    """Старые заказы: два оплаченных (один с двумя блюдами) и один новый."""
+    orders = [
+        Order.objects.create(
+            table_number=1,
+            items=[
+                {"name": "Суп", "price": 300},
+                {"name": "Чай", "price": 50, "quantity": 2},
+            ],
+            status="paid",
+        ),
+        Order.objects.create(
+            table_number=2,
+            items=[{"name": "Пирог", "price": 200}],
+            status="paid",
+        ),
+        Order.objects.create(
+            table_number=3, items=[{"name": "Салат", "price": 150}]
+        ),
+    ]
+    Order.objects.filter(pk__in=[order.pk for order in orders]).update(
+        created_at=timezone.now() - timedelta(days=days)
+    )
+    return orders
+
+
+@pytest.mark.django_db
+def test_archive_moves_only_old_paid_orders(create_test_orders):
+    """Тест: в архив уходят только старые оплаченные заказы с блюдами."""
+    soup, pie, salad = make_old_orders()
+    hours = revenue.revenue_series("hour")
+    total = revenue.total_revenue()
+
+    assert archive.archive_orders(batch_size=1) == 2
+    assert not Order.objects.filter(pk__in=[soup.pk, pie.pk]).exists()
+    assert not OrderItem.objects.filter(order_id=soup.pk).exists()
+    assert Order.objects.filter(pk=salad.pk).exists()
+    assert Order.objects.count() == 4
+
+    archived = ArchivedOrder.objects.get(pk=soup.pk)
+    assert archived.total_price == Decimal("400")
+    assert archived.paid_at == soup.paid_at
+    assert archived.items == [
+        {"name": "Суп", "price": "300.00", "quantity": 1, "menu_item": None},
+        {"name": "Чай", "price": "50.00", "quantity": 2, "menu_item": None},
+    ]
+
+    assert revenue.total_revenue() == revenue.live_total_revenue() == total
+    assert revenue.revenue_series("hour") == hours
+    assert archive.archive_orders() == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_revenue_counts_archive(create_test_orders):
+    """Тест: пересборка агрегатов учитывает архивные заказы."""
+    make_old_orders()
+    archive.archive_orders()
+    by_day = revenue.revenue_series("day")
+
+    call_command("rebuild_revenue")
+    assert revenue.revenue_series("day") == by_day
+    assert revenue.total_revenue() == Decimal("800")
+
+
+@pytest.mark.django_db
+def test_archive_command(capsys):
+    """Тест команды: --dry-run только считает, --days задает возраст."""
+    make_old_orders(days=10)
+    call_command("archive_orders", "--dry-run")
+    assert "Заказов для архива: 0" in capsys.readouterr().out
+
+    call_command("archive_orders", "--days", "5", "--dry-run")
+    assert "Заказов для архива: 2" in capsys.readouterr().out
+    assert not ArchivedOrder.objects.exists()
+
+    call_command("archive_orders", "--days", "5", "--batch-size", "1")
+    assert "Перенесено в архив заказов: 2" in capsys.readouterr().out
+    assert ArchivedOrder.objects.count() == 2
@@ -0,0 +1,138 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders import cache as orders_cache
+from orders.models import Order
+
+
+@pytest.mark.django_db
+def test_order_list_cached_per_table(
+    client, create_test_orders, django_assert_num_queries
+):
+    """Тест кэша списка: изменение стола сбрасывает только его ответы."""
+    url = reverse("order_list")
+    first = client.get(url, {"q": "1"})
+    client.get(url, {"q": "2"})
+    client.get(url)
+
+    with django_assert_num_queries(0):
+        second = client.get(url, {"q": "1"})
+    assert second.content == first.content
+
+    order = create_test_orders[0]
+    order.items = [{"name": "Борщ", "price": 300}]
+    order.save()
+
+    with django_assert_num_queries(0):
+        client.get(url, {"q": "2"})
+    response = client.get(url, {"q": "1"})
+    assert "Борщ" in response.content.decode()
+    assert "Борщ" in client.get(url).content.decode()
+
+    assert orders_cache.stats.snapshot() == {
+        "order_list": {"hits": 2, "misses": 5}
+    }
+
+
+@pytest.mark.django_db
+def test_escaped_params_get_own_entry(client, create_test_orders):
+    """
+    Тест: «&» и «=» внутри значения не склеиваются с разделителями,
+    запросы с совпадающей сырой строкой параметров кэшируются отдельно.
+    """
+    url = reverse("order_list")
+    escaped = client.get(f"{url}?q=Пицца%26status%3Dpending")
+    response = client.get(url, {"q": "Пицца", "status": "pending"})
+
+    assert response.content != escaped.content
+    assert "Пицца" in response.content.decode()
+    assert orders_cache.stats.snapshot() == {
+        "order_list": {"hits": 0, "misses": 2}
+    }
+
+
+@pytest.mark.django_db
+def test_revenue_report_cached(client, create_test_orders):
+    """Тест сброса кэша отчета о выручке при оплате заказа."""
+    url = reverse("revenue_report")
+    assert "200,00" in client.get(url).content.decode()
+
+    Order.objects.filter(pk=create_test_orders[1].pk).update(status="paid")
+
+    assert "550,00" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_invalidation_after_commit(
+    create_test_order, django_capture_on_commit_callbacks
+):
+    """Тест: поколение меняется при записи и еще раз после фиксации."""
+    scopes = [orders_cache.ALL_ORDERS, orders_cache.table_scope(1)]
+    before = orders_cache.get_generation(scopes)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        create_test_order.status = "ready"
+        create_test_order.save()
+    during = orders_cache.get_generation(scopes)
+    assert during != before
+
+    for callback in callbacks:
+        callback()
+    assert orders_cache.get_generation(scopes) not in (before, during)
+    # Поколение другого стола не меняется
+    other = orders_cache.get_generation([orders_cache.table_scope(2)])
+    create_test_order.save()
+    assert orders_cache.get_generation([orders_cache.table_scope(2)]) == other
+
+
+@pytest.mark.django_db
+def test_evicted_generation_is_new(create_test_order):
+    """Тест: вытесненное поколение заменяется новым, а не исходным."""
+    generation = orders_cache.get_generation([orders_cache.ALL_ORDERS])
+    cache.clear()
+    assert orders_cache.get_generation([orders_cache.ALL_ORDERS]) != generation
+
+
+@pytest.mark.django_db
+def test_api_responses_cached(create_test_orders, django_assert_num_queries):
+    """Тест кэша списка, заказа и выручки в API и счетчиков кэша."""
+    client = APIClient()
+    list_url = reverse("api:orders-list")
+    detail_url = reverse("api:orders-detail", args=[create_test_orders[0].pk])
+    revenue_url = reverse("api:orders-revenue")
+    responses = [
+        client.get(url) for url in (list_url, detail_url, revenue_url)
+    ]
+
+    with django_assert_num_queries(0):
+        for url, response in zip(
+            (list_url, detail_url, revenue_url), responses
+        ):
+            assert client.get(url).data == response.data
+
+    create_test_orders[0].status = "paid"
+    create_test_orders[0].save()
+
+    assert client.get(detail_url).data["status"] == "paid"
+    assert client.get(revenue_url).data["total_revenue"] == 1000
+    assert (
+        client.get(reverse("api:orders-detail", args=[0])).status_code == 404
+    )
+
+    response = client.get(reverse("api:cache-stats"))
+    assert response.data == {
+        "orders_api_list": {"hits": 1, "misses": 1},
+        "orders_api_retrieve": {"hits": 1, "misses": 3},
+        "revenue_api": {"hits": 1, "misses": 2},
+    }
+
+
+@pytest.mark.django_db
+def test_cache_disabled(client, create_test_orders, settings):
+    """Тест отключения кэша настройкой ORDERS_CACHE_ENABLED."""
+    settings.ORDERS_CACHE_ENABLED = False
+    client.get(reverse("order_list"))
+    client.get(reverse("order_list"))
+    assert orders_cache.stats.snapshot() == {}
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+
+from orders import events
+from orders.models import Order
+
+
+async def read_events(response, count: int) -> list[dict]:
+    """Читает из потока SSE count событий (без комментариев)."""
+    result = []
+    async for chunk in response.streaming_content:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith("event:"):
+            result.append(json.loads(chunk.split("data: ", 1)[1]))
+            if len(result) == count:
+                break
+    return result
+
+
+@pytest.mark.django_db
+def test_events_from_changes(create_test_order):
+    """Тест типов событий для создания, изменений и удаления."""
+    created = create_test_order.get_state()
+    updated = created._replace(table_number=2)
+    ready = updated._replace(status="ready")
+
+    assert [
+        (event["type"], event["status"], event.get("previous_status"))
+        for event in events.events_from_changes(
+            [
+                (None, created),
+                (created, updated),
+                (updated, ready),
+                (ready, None),
+            ]
+        )
+    ] == [
+        ("created", "pending", None),
+        ("updated", "pending", "pending"),
+        ("status_changed", "ready", "pending"),
+        ("deleted", "ready", None),
+    ]
+
+
+def test_subscription_filters():
+    """Тест фильтров подписки по столу и статусу (до и после)."""
+
+    async def check():
+        subscription = events.Subscription(tables=[1], statuses=["ready"])
+        event = {"table_number": 2, "status": "ready"}
+        assert not subscription.matches(event)
+        assert subscription.matches({**event, "previous_table_number": 1})
+        assert not subscription.matches({"table_number": 1, "status": "paid"})
+        assert subscription.matches(
+            {"table_number": 1, "status": "paid", "previous_status": "ready"}
+        )
+
+    async_to_sync(check)()
+
+
+def test_broker_delivers_from_other_thread():
+    """Тест публикации из другого потока и переполнения очереди."""
+
+    async def check():
+        broker = events.Broker()
+        subscription = broker.subscribe(tables=[1])
+        slow = broker.subscribe()
+        slow.queue = asyncio.Queue(1)
+        thread = threading.Thread(
+            target=broker.publish,
+            args=(
+                [
+                    {"type": "created", "table_number": 2, "status": "ready"},
+                    {"type": "created", "table_number": 1, "status": "ready"},
+                ],
+            ),
+        )
+        thread.start()
+        thread.join()
+        event = await asyncio.wait_for(subscription.queue.get(), 1)
+        assert event["table_number"] == 1
+        assert subscription.queue.empty()
+        # Переполненная подписка закрывает поток
+        assert slow.overflowed
+        stream = events.stream_events(slow, broker)
+        assert await stream.__anext__() == "retry: 1000\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert broker.subscribers == 1
+
+    async_to_sync(check)()
+
+
+def change_orders() -> int:
+    """Создает, меняет и удаляет заказы; возвращает id заказа стола 1."""
+    Order.objects.create(table_number=2, items=[{"name": "чай", "price": 50}])
+    order = Order.objects.create(
+        table_number=1, items=[{"name": "суп", "price": 150}]
+    )
+    pk = order.pk
+    Order.objects.filter(pk=pk).update(status="ready")
+    order.delete()
+    return pk
+
+
+@pytest.mark.django_db(transaction=True)
+def test_order_events_stream():
+    """Тест потока событий: подписка по столу получает его события."""
+
+    async def check():
+        response = await AsyncClient().get(
+            reverse("order_events"), {"table": "1"}
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+
+        pk = await sync_to_async(change_orders)()
+        received = await asyncio.wait_for(read_events(response, 3), 5)
+        assert [(event["type"], event["id"]) for event in received] == [
+            ("created", pk),
+            ("status_changed", pk),
+            ("deleted", pk),
+        ]
+        assert received[0]["total_price"] == "150.00"
+        assert received[1]["previous_status"] == "pending"
+
+    async_to_sync(check)()
+
+
+@pytest.mark.django_db
+def test_order_events_invalid_filters(client):
+    """Тест ошибки подписки с некорректными фильтрами."""
+    response = client.get(reverse("order_events"), {"status": "cooking"})
+    assert response.status_code == 400
+    response = client.get(reverse("order_events"), {"table": "первый"})
+    assert response.status_code == 400
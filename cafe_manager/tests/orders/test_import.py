@@ -0,0 +1,179 @@
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+
+from api.export import stream_csv, stream_ndjson
+from orders import board, events, revenue
+from orders.models import Order, OrderItem
+
+CSV_DATA = (
+    "table_number,status,created_at,items\n"
+    "1,paid,2025-01-28T10:00:00+00:00,борщ 100; хлеб x3 5.50\n"
+    "2,pending,,рис 70\n"
+    "0,paid,,чай 10\n"
+    "3,unknown,,кофе 50\n"
+    "4,ready,2025-01-28 12:30,невалидная строка\n"
+    "5,paid,2025-01-29,суп 150\n"
+)
+
+
+def run_import(path, *args) -> tuple[str, str]:
+    """Запускает import_orders и возвращает stdout и stderr."""
+    out, err = io.StringIO(), io.StringIO()
+    call_command("import_orders", str(path), *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_csv(tmp_path):
+    """Тест импорта CSV: корректные строки загружаются, ошибки пропускаются."""
+    path = tmp_path / "orders.csv"
+    path.write_text(CSV_DATA, encoding="utf-8")
+
+    out, err = run_import(path, "--batch-size", "2")
+
+    assert Order.objects.count() == 3
+    order = Order.objects.get(table_number=1)
+    assert order.total_price == Decimal("116.50")
+    assert order.items == [
+        {"name": "борщ", "price": Decimal("100.00")},
+        {"name": "хлеб", "price": Decimal("5.50"), "quantity": 3},
+    ]
+    assert order.created_at.isoformat() == "2025-01-28T10:00:00+00:00"
+    assert OrderItem.objects.count() == 4
+    # Агрегаты выручки учитывают загруженные заказы
+    assert revenue.total_revenue() == Decimal("266.50")
+
+    assert "Строка 4:" in err
+    assert "Строка 5:" in err
+    assert "Некорректный формат строки" in err
+    assert "пропущено строк с ошибками 3" in out
+    assert not (tmp_path / "orders.csv.progress").exists()
+
+
+@pytest.mark.django_db
+def test_import_publishes_no_events(
+    tmp_path, monkeypatch, django_capture_on_commit_callbacks
+):
+    """
+    Тест импорта без событий подписчикам: исторические заказы
+    не приходят на доску как новые, но агрегаты и версия доски
+    обновляются.
+    """
+    published = []
+    monkeypatch.setattr(events.get_broker(), "publish", published.append)
+    path = tmp_path / "orders.csv"
+    path.write_text(CSV_DATA, encoding="utf-8")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        run_import(path)
+
+    assert Order.objects.count() == 3
+    assert published == []
+    assert revenue.total_revenue() == Decimal("266.50")
+    assert board.get_revision(2).version > 0
+
+    # Обычное создание заказа по-прежнему публикует событие
+    with django_capture_on_commit_callbacks(execute=True):
+        Order.objects.create(table_number=2, items=[])
+    assert [event["type"] for event in sum(published, [])] == [events.CREATED]
+
+
+@pytest.mark.django_db
+def test_import_ndjson(tmp_path):
+    """Тест импорта NDJSON с проверкой блюд по правилам API."""
+    rows = [
+        {"table_number": 1, "items": [{"name": "суп", "price": 100}]},
+        {"table_number": 2, "items": []},
+        {"table_number": 3, "items": [{"name": "чай", "price": "10"}]},
+        {
+            "table_number": 4,
+            "status": "paid",
+            "items": [{"name": "сок", "price": 60, "quantity": 2}],
+        },
+    ]
+    path = tmp_path / "orders.ndjson"
+    path.write_text(
+        "\n".join(json.dumps(row) for row in rows) + "\n{битый json\n",
+        encoding="utf-8",
+    )
+
+    out, err = run_import(path)
+
+    assert sorted(Order.objects.values_list("table_number", flat=True)) == [
+        1,
+        4,
+    ]
+    assert Order.objects.get(table_number=4).total_price == Decimal("120")
+    assert "Список блюд не может быть пустым." in err
+    assert "'price' числом" in err
+    assert "Строка 5:" in err
+
+
+@pytest.mark.django_db
+def test_import_dry_run(tmp_path):
+    """Тест режима проверки: ничего не записывается."""
+    path = tmp_path / "orders.csv"
+    path.write_text(CSV_DATA, encoding="utf-8")
+
+    out, err = run_import(path, "--dry-run")
+
+    assert Order.objects.count() == 0
+    assert "корректных заказов 3, ошибок 3" in out
+    assert not (tmp_path / "orders.csv.progress").exists()
+
+
+@pytest.mark.django_db
+def test_import_resumes_from_progress(tmp_path):
+    """Тест продолжения импорта с сохраненного прогресса."""
+    path = tmp_path / "orders.csv"
+    path.write_text(CSV_DATA, encoding="utf-8")
+    progress = tmp_path / "orders.csv.progress"
+    progress.write_text(
+        json.dumps(
+            {
+                "source": str(path.resolve()),
+                "rows": 2,
+                "created": 2,
+                "errors": 0,
+            }
+        )
+    )
+
+    out, err = run_import(path)
+
+    assert list(Order.objects.values_list("table_number", flat=True)) == [5]
+    assert "Продолжаем импорт с записи 3." in out
+    assert "создано заказов 3" in out
+    assert not progress.exists()
+
+
+@pytest.mark.django_db
+def test_import_roundtrip_with_export(tmp_path, create_test_orders):
+    """Тест: выгрузку заказов можно загрузить обратно."""
+    create_test_orders[0].items = [
+        {"name": "Пицца", "price": 800},
+        {"name": "сок", "price": 50, "quantity": 2},
+    ]
+    create_test_orders[0].save()
+    expected = sorted(
+        (order.table_number, order.status, order.total_price, order.created_at)
+        for order in Order.objects.all()
+    )
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("".join(stream_csv(Order.objects.all())))
+    ndjson_path = tmp_path / "orders.ndjson"
+    ndjson_path.write_text("".join(stream_ndjson(Order.objects.all())))
+    Order.objects.all().delete()
+
+    for path in (csv_path, ndjson_path):
+        run_import(path)
+        imported = sorted(
+            (o.table_number, o.status, o.total_price, o.created_at)
+            for o in Order.objects.all()
+        )
+        assert imported == expected
+        Order.objects.all().delete()
@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Order
+from orders.search import FTS_TABLE, SEARCH_INDEX_NAME, search_orders
+
+
+def explain(queryset_call) -> str:
+    """
+    Выполняет запрос и возвращает план последнего SQL-запроса.
+    На PostgreSQL последовательное сканирование отключается, чтобы
+    на маленькой тестовой таблице планировщик выбирал индекс,
+    если он вообще применим.
+    """
+    with CaptureQueriesContext(connection) as captured:
+        queryset_call()
+    sql = captured.captured_queries[-1]["sql"]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def assert_uses_index(plan: str, *index_names: str) -> None:
+    """
+    Проверяет, что план использует один из индексов
+    и не сканирует таблицу целиком.
+    """
+    assert any(name in plan for name in index_names), plan
+    assert "Seq Scan" not in plan, plan
+    assert "SCAN orders_order\n" not in plan + "\n", plan
+    assert "USE TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.django_db
+def test_list_ordering_uses_index(create_test_orders):
+    """Сортировка списка заказов использует индекс по времени создания."""
+    plan = explain(lambda: list(Order.objects.all()[:50]))
+    assert_uses_index(plan, "order_created_idx")
+
+
+@pytest.mark.django_db
+def test_status_filter_uses_index(create_test_orders):
+    """Поиск по статусу использует составной индекс."""
+    plan = explain(lambda: list(Order.objects.filter(status="ready")[:50]))
+    assert_uses_index(plan, "order_status_created_idx")
+
+
+@pytest.mark.django_db
+def test_table_filter_uses_index(create_test_orders):
+    """Поиск по номеру стола использует составной индекс."""
+    plan = explain(lambda: list(Order.objects.filter(table_number=1)[:50]))
+    assert_uses_index(plan, "order_table_created_idx")
+
+
+@pytest.mark.django_db
+def test_paid_revenue_uses_partial_index(create_test_orders):
+    """
+    Сумма выручки считается по индексу: частичному по оплаченным
+    заказам (PostgreSQL) или составному по статусу (SQLite без статистики).
+    """
+    plan = explain(
+        lambda: Order.objects.filter(status="paid").aggregate(
+            Sum("total_price")
+        )
+    )
+    assert_uses_index(
+        plan, "order_paid_revenue_idx", "order_status_created_idx"
+    )
+
+
+@pytest.mark.django_db
+def test_dish_search_uses_index(create_test_orders):
+    """
+    Поиск по блюду идет по индексу поиска: GIN на PostgreSQL,
+    FTS5 на SQLite, без сканирования строк блюд.
+    """
+    plan = explain(
+        lambda: list(search_orders(Order.objects.all(), "пицца")[:50])
+    )
+    assert SEARCH_INDEX_NAME in plan or FTS_TABLE in plan, plan
+    assert "Seq Scan" not in plan, plan
+    for table in ("orders_order", "orders_orderitem"):
+        assert f"SCAN {table}\n" not in plan + "\n", plan
+        assert f"SCAN {table} USING" not in plan, plan
@@ -0,0 +1,116 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.items import (
+    format_item_line,
+    parse_item_line,
+    parse_items_text,
+    validate_items,
+)
+from orders.models import Order
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("борщ 100", {"name": "борщ", "price": Decimal("100")}),
+        ("  рис 25.70 ", {"name": "рис", "price": Decimal("25.70")}),
+        (
+            "борщ x3 100",
+            {"name": "борщ", "price": Decimal("100"), "quantity": 3},
+        ),
+        (
+            "салат оливье х2 210.5",
+            {"name": "салат оливье", "price": Decimal("210.5"), "quantity": 2},
+        ),
+        ("суп 1 2", {"name": "суп 1", "price": Decimal("2")}),
+    ],
+)
+def test_parse_item_line(line, expected):
+    """Тест разбора строки блюда: цена Decimal и количество через x."""
+    assert parse_item_line(line) == expected
+
+
+def test_parse_items_text_reports_all_errors():
+    """Тест: ошибки всех строк возвращаются вместе с номерами строк."""
+    with pytest.raises(ValidationError) as error:
+        parse_items_text("борщ 100\nсуп\n\nчай 0\nхлеб x0 5\nсок 1.555")
+
+    assert [message.split(":")[0] for message in error.value.messages] == [
+        "Строка 2",
+        "Строка 4",
+        "Строка 5",
+        "Строка 6",
+    ]
+    assert "Цена блюда должна быть больше 0." in error.value.messages[1]
+
+
+def test_parse_items_text_sums_exactly():
+    """Тест: сумма цен Decimal не теряет копейки на больших заказах."""
+    items = parse_items_text("\n".join(["чай 0.10"] * 10_000))
+    assert sum(item["price"] for item in items) == Decimal("1000.00")
+
+
+def test_format_item_line_round_trip():
+    """Тест: строка из format_item_line() разбирается обратно."""
+    item = {"name": "хлеб", "price": Decimal("5.00"), "quantity": 3}
+    assert format_item_line(item) == "хлеб x3 5.00"
+    assert parse_item_line(format_item_line(item)) == item
+
+
+def test_validate_items():
+    """Тест проверки JSON: цены Decimal и ошибки всех блюд сразу."""
+    assert validate_items([{"name": "чай", "price": 0.1, "quantity": 2}]) == [
+        {"name": "чай", "price": Decimal("0.1"), "quantity": 2}
+    ]
+    with pytest.raises(ValidationError) as error:
+        validate_items(
+            [
+                {"name": "чай", "price": 10},
+                {"name": "сок", "price": "10"},
+                {"name": "хлеб", "price": 1.001},
+                {"name": "суп", "price": 5, "quantity": 0},
+            ]
+        )
+    assert [message.split(":")[0] for message in error.value.messages] == [
+        "Блюдо 2",
+        "Блюдо 3",
+        "Блюдо 4",
+    ]
+
+
+@pytest.mark.django_db
+def test_form_quantity_and_errors(client):
+    """Тест формы: количество через x и все ошибки строк на странице."""
+    url = reverse("order_create")
+    data = {"table_number": 1, "status": "pending"}
+    content = client.post(
+        url, {**data, "items_text": "суп\nчай 0"}
+    ).content.decode()
+    assert "Строка 1: Некорректный формат строки" in content
+    assert "Строка 2: Цена блюда должна быть больше 0." in content
+
+    client.post(url, {**data, "items_text": "борщ x3 100\nхлеб 5.50"})
+    order = Order.objects.get()
+    assert order.total_price == Decimal("305.50")
+    response = client.get(reverse("order_update", args=[order.pk]))
+    assert "борщ x3 100.00" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_serializer_quantity():
+    """Тест API: количество блюда учитывается в общей стоимости."""
+    response = APIClient().post(
+        reverse("api:orders-list"),
+        {
+            "table_number": 1,
+            "items": [{"name": "чай", "price": 0.1, "quantity": 3}],
+        },
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.data["total_price"] == "0.30"
@@ -0,0 +1,134 @@
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.menu import get_menu
+from orders.models import MenuItem, Order, OrderItem
+
+
+@pytest.fixture
+def menu_items():
+    """Фикстура меню из двух доступных блюд и одного недоступного."""
+    return MenuItem.objects.bulk_create(
+        [
+            MenuItem(name="Борщ", price=Decimal("250.00")),
+            MenuItem(name="Чай", price=Decimal("60.00")),
+            MenuItem(name="Уха", price=Decimal("400.00"), is_available=False),
+        ]
+    )
+
+
+@pytest.mark.django_db
+def test_menu_cache_invalidation(menu_items, django_assert_num_queries):
+    """Тест кэша меню: одно чтение и сброс после изменения меню."""
+    with django_assert_num_queries(1):
+        assert get_menu().get("  борщ ").price == 250
+        assert get_menu().get("ЧАЙ").price == 60
+    assert get_menu().get("кофе") is None
+
+    borscht = menu_items[0]
+    borscht.price = 270
+    borscht.save()
+    assert get_menu().get("борщ").price == 270
+
+    MenuItem.objects.filter(name="Чай").update(price=70)
+    assert get_menu().get("чай").price == 70
+
+    borscht.delete()
+    assert get_menu().get("борщ") is None
+
+
+@pytest.mark.django_db
+def test_form_prices_from_menu(client, menu_items):
+    """Тест формы: цена блюда из меню берется из меню."""
+    response = client.post(
+        reverse("order_create"),
+        {
+            "table_number": 1,
+            "status": "pending",
+            "items_text": "борщ\nчай 1\nхлеб 20",
+        },
+    )
+
+    assert response.status_code == 302
+    order = Order.objects.get()
+    assert order.total_price == Decimal("330.00")
+    assert list(
+        OrderItem.objects.values_list("name", "price", "menu_item")
+    ) == [
+        ("Борщ", Decimal("250.00"), menu_items[0].pk),
+        ("Чай", Decimal("60.00"), menu_items[1].pk),
+        ("хлеб", Decimal("20.00"), None),
+    ]
+
+
+@pytest.mark.django_db
+def test_form_menu_errors(client, menu_items, settings):
+    """Тест ошибок: недоступное блюдо и блюдо не из меню."""
+    url = reverse("order_create")
+    data = {"table_number": 1, "status": "pending", "items_text": "уха 1"}
+    content = client.post(url, data).content.decode()
+    assert "Блюдо «Уха» сейчас недоступно." in content
+
+    settings.ORDERS_MENU_REQUIRED = True
+    data["items_text"] = "борщ\nхлеб 20"
+    content = client.post(url, data).content.decode()
+    assert "Блюда «хлеб» нет в меню." in content
+    assert not Order.objects.exists()
+
+
+@pytest.mark.django_db
+def test_api_prices_from_menu(menu_items, django_assert_max_num_queries):
+    """
+    Тест API: цены назначаются по меню, меню читается
+    одним запросом на весь массовый запрос.
+    """
+    client = APIClient()
+    response = client.post(
+        reverse("api:orders-list"),
+        {"table_number": 1, "items": [{"name": "борщ"}]},
+        format="json",
+    )
+    assert response.status_code == 201
+    assert response.data["total_price"] == "250.00"
+
+    payload = [
+        {"table_number": number, "items": [{"name": "чай", "price": 1}]}
+        for number in range(1, 21)
+    ]
+    MenuItem.objects.filter(name="Чай").update(price=65)
+    with django_assert_max_num_queries(12):
+        response = client.post(
+            reverse("api:orders-bulk"), payload, format="json"
+        )
+    assert response.status_code == 201
+    assert {row["total_price"] for row in response.data} == {"65.00"}
+
+    response = client.post(
+        reverse("api:orders-list"),
+        {"table_number": 1, "items": [{"name": "хлеб"}]},
+        format="json",
+    )
+    assert response.data == {
+        "items": ["Блюда «хлеб» нет в меню, укажите цену."]
+    }
+
+
+@pytest.mark.django_db
+def test_menu_endpoint(menu_items, django_assert_num_queries):
+    """Тест меню в API: повторный запрос не обращается к базе."""
+    client = APIClient()
+    url = reverse("api:menu")
+    first = client.get(url).data
+    assert [row["name"] for row in first] == ["Борщ", "Уха", "Чай"]
+    assert first[0] == {
+        "id": menu_items[0].pk,
+        "name": "Борщ",
+        "price": "250.00",
+        "is_available": True,
+    }
+
+    with django_assert_num_queries(0):
+        assert client.get(url).data == first
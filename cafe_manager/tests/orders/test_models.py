@@ -0,0 +1,200 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+
+from orders import revenue, sessions
+from orders.models import (
+    InvalidStatusTransition,
+    Order,
+    OrderItem,
+    OrderVersionConflict,
+    OrdersVersionConflict,
+)
+
+
+@pytest.mark.django_db
+def test_items_are_stored_as_rows():
+    """Тест записи списка блюд в таблицу OrderItem."""
+    order = Order.objects.create(
+        table_number=1,
+        items=[
+            {"name": "борщ", "price": 100},
+            {"name": "хлеб", "price": 5.5, "quantity": 3},
+        ],
+    )
+
+    rows = list(OrderItem.objects.filter(order=order))
+    assert [(r.name, r.price, r.quantity) for r in rows] == [
+        ("борщ", Decimal("100.00"), 1),
+        ("хлеб", Decimal("5.50"), 3),
+    ]
+    assert order.total_price == Decimal("116.50")
+
+    order.refresh_from_db()
+    assert order.items == [
+        {"name": "борщ", "price": 100},
+        {"name": "хлеб", "price": Decimal("5.5"), "quantity": 3},
+    ]
+
+
+@pytest.mark.django_db
+def test_items_are_replaced_on_update(create_test_order):
+    """Тест замены строк блюд при изменении заказа."""
+    create_test_order.items = [{"name": "суп", "price": 300}]
+    create_test_order.save()
+
+    assert list(OrderItem.objects.values_list("name", flat=True)) == ["суп"]
+    create_test_order.refresh_from_db()
+    assert create_test_order.total_price == 300
+
+
+@pytest.mark.django_db
+def test_save_without_items_keeps_rows(create_test_order):
+    """Тест: изменение статуса не перезаписывает строки блюд."""
+    item_ids = list(OrderItem.objects.values_list("pk", flat=True))
+    create_test_order.status = "ready"
+    create_test_order.save()
+
+    assert list(OrderItem.objects.values_list("pk", flat=True)) == item_ids
+    assert create_test_order.total_price == 800
+
+
+@pytest.mark.django_db(transaction=True)
+def test_items_migration_copies_json_to_rows():
+    """Тест миграции данных из JSON-поля items в OrderItem."""
+    executor = MigrationExecutor(connection)
+    executor.migrate([("orders", "0002_order_indexes")])
+    old_apps = executor.loader.project_state(
+        ("orders", "0002_order_indexes")
+    ).apps
+    OldOrder = old_apps.get_model("orders", "Order")
+    old_order = OldOrder.objects.create(
+        table_number=1,
+        items=[{"name": "сок", "price": 60.0}, {"name": "чай", "price": 20}],
+        total_price=80,
+    )
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes("orders"))
+
+    order = Order.objects.get(pk=old_order.pk)
+    assert order.items == [
+        {"name": "сок", "price": 60},
+        {"name": "чай", "price": 20},
+    ]
+
+
+@pytest.mark.django_db
+def test_version_conflict():
+    """
+    Тест оптимистичной блокировки: изменение по устаревшей версии
+    не перезаписывает заказ, массовые изменения увеличивают версию.
+    """
+    order = Order.objects.create(
+        table_number=1, items=[{"name": "чай", "price": 60}]
+    )
+    assert order.version == 1
+    first = Order.objects.get(pk=order.pk)
+    second = Order.objects.get(pk=order.pk)
+
+    first.status = "ready"
+    first.save()
+    assert first.version == 2
+
+    second.items = [{"name": "кофе", "price": 140}]
+    with pytest.raises(OrderVersionConflict):
+        second.save()
+    assert second.version == 1
+    order.refresh_from_db()
+    assert (order.status, order.version) == ("ready", 2)
+    assert order.items == [{"name": "чай", "price": 60}]
+
+    Order.objects.filter(pk=order.pk).update(status="paid")
+    order.refresh_from_db()
+    assert order.version == 3
+    order.refresh_total_price()
+    assert Order.objects.get(pk=order.pk).version == 4
+
+
+@pytest.mark.django_db
+def test_bulk_update_version_conflict(create_test_orders):
+    """
+    Тест: массовое обновление пишет заказы только с прочитанной
+    версией; если один заказ изменили, не пишется ни один.
+    """
+    pizza, pasta, _ = [
+        Order.objects.get(pk=order.pk) for order in create_test_orders
+    ]
+    Order.objects.get(pk=pasta.pk).save()
+    pizza.table_number = pasta.table_number = 7
+
+    with pytest.raises(OrdersVersionConflict) as error:
+        Order.objects.bulk_update_with_items([pizza, pasta])
+    assert error.value.versions == {pasta.pk: 1}
+    assert not Order.objects.filter(table_number=7).exists()
+    assert Order.objects.get(pk=pizza.pk).version == 1
+
+    pasta.version = 2
+    Order.objects.bulk_update_with_items([pizza, pasta])
+    assert Order.objects.filter(table_number=7).count() == 2
+    assert (pizza.version, Order.objects.get(pk=pasta.pk).version) == (2, 3)
+
+
+@pytest.mark.django_db
+def test_status_transitions(create_test_order):
+    """
+    Тест переходов pending → ready → paid: один условный UPDATE
+    только статуса, времени перехода и версии.
+    """
+    pk = create_test_order.pk
+    with CaptureQueriesContext(connection) as queries:
+        state = Order.objects.advance(pk, "ready")
+    updates = [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith('UPDATE "orders_order"')
+    ]
+    assert len(updates) == 1
+    assert '"status" = ' in updates[0]
+    assert "\"status\" = 'pending'" in updates[0].split("WHERE")[1]
+    assert "total_price" not in updates[0]
+    assert state.status == "ready"
+
+    with pytest.raises(InvalidStatusTransition) as error:
+        Order.objects.advance(pk, "ready")
+    assert str(error.value) == (
+        "Заказ в статусе «Готово» нельзя перевести в статус «Готово»."
+    )
+    with pytest.raises(OrderVersionConflict):
+        Order.objects.advance(pk, "paid", version=1)
+    with pytest.raises(Order.DoesNotExist):
+        Order.objects.advance(0, "paid")
+
+    Order.objects.advance(pk, "paid", version=2)
+    order = Order.objects.get(pk=pk)
+    assert (order.status, order.version) == ("paid", 3)
+    assert order.created_at <= order.ready_at <= order.paid_at
+    assert revenue.total_revenue() == revenue.live_total_revenue() == 800
+    assert sessions.get_open_session(1) is None
+    with pytest.raises(InvalidStatusTransition):
+        Order.objects.advance(pk, "pending")
+
+
+@pytest.mark.django_db
+def test_status_change_is_validated(create_test_order):
+    """Тест: форма и админка не пропускают смену статуса не по порядку."""
+    create_test_order.status = "paid"
+    with pytest.raises(ValidationError) as error:
+        create_test_order.full_clean()
+    assert error.value.message_dict["status"] == [
+        "Заказ в статусе «В ожидании» нельзя перевести в статус «Оплачено»."
+    ]
+    create_test_order.status = "ready"
+    create_test_order.full_clean()
+    create_test_order.save()
+    assert create_test_order.ready_at is not None
+    assert create_test_order.paid_at is None
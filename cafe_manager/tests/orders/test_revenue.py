@@ -0,0 +1,186 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from orders import revenue, sessions
+from orders.models import DailyRevenue, Order
+
+
+def rollup() -> dict:
+    """Возвращает непустые агрегаты выручки в виде словаря."""
+    return {
+        (row.date, row.table_number): (row.total, row.orders_count)
+        for row in DailyRevenue.objects.all()
+        if row.orders_count
+    }
+
+
+@pytest.mark.django_db
+def test_rollup_follows_order_lifecycle(create_test_order):
+    """Тест: агрегат меняется при оплате, изменении цены и удалении."""
+    today = timezone.localdate()
+    assert rollup() == {}
+
+    create_test_order.status = "paid"
+    create_test_order.save()
+    assert rollup() == {(today, 1): (Decimal("800"), 1)}
+
+    create_test_order.items = [{"name": "Пицца", "price": 650}]
+    create_test_order.save()
+    assert rollup() == {(today, 1): (Decimal("650"), 1)}
+
+    create_test_order.table_number = 4
+    create_test_order.save()
+    assert rollup() == {(today, 4): (Decimal("650"), 1)}
+
+    create_test_order.delete()
+    assert rollup() == {}
+
+
+@pytest.mark.django_db
+def test_rollup_splits_by_day(create_test_orders):
+    """Тест разбивки агрегата по дням."""
+    paid = create_test_orders[2]
+    paid.created_at -= timedelta(days=1)
+    paid.save()
+    Order.objects.create(
+        table_number=3, items=[{"name": "Суп", "price": 100}], status="paid"
+    )
+
+    today = timezone.localdate()
+    assert rollup() == {
+        (today - timedelta(days=1), 3): (Decimal("200"), 1),
+        (today, 3): (Decimal("100"), 1),
+    }
+
+
+@pytest.mark.django_db
+def test_rollup_follows_queryset_update_and_delete(create_test_orders):
+    """Тест обновления агрегата при update() и delete() на QuerySet."""
+    Order.objects.filter(status__in=["pending", "ready"]).update(status="paid")
+    assert revenue.total_revenue() == Decimal("1350")
+
+    Order.objects.filter(table_number=1).delete()
+    assert revenue.total_revenue() == Decimal("550")
+
+    Order.objects.update(status="pending")
+    assert revenue.total_revenue() == 0
+
+
+@pytest.mark.django_db
+def test_stale_instance_delete(create_test_orders):
+    """
+    Тест: удаление устаревшего экземпляра вычитает текущее состояние
+    заказа, а не то, с которым он был прочитан.
+    """
+    stale = Order.objects.get(pk=create_test_orders[1].pk)
+    again = Order.objects.get(pk=stale.pk)
+    Order.objects.filter(pk=stale.pk).update(status="paid", table_number=4)
+    assert revenue.total_revenue() == Decimal("550")
+    assert sessions.get_open_session(2) is None
+
+    stale.delete()
+    assert revenue.total_revenue() == revenue.live_total_revenue() == 200
+    assert sessions.get_open_session(4) is None
+    assert sessions.get_open_session(1).unpaid_total == Decimal("800")
+
+    # Заказ уже удален другим запросом: второй раз не вычитается
+    again.delete()
+    assert revenue.total_revenue() == Decimal("200")
+
+
+@pytest.mark.django_db
+def test_rebuild_revenue_command(create_test_orders):
+    """Тест пересборки агрегатов и сверки с живой суммой."""
+    DailyRevenue.objects.update(total=0)
+    with pytest.raises(CommandError):
+        call_command("rebuild_revenue", "--check")
+
+    call_command("rebuild_revenue")
+    assert revenue.total_revenue() == revenue.live_total_revenue() == 200
+    call_command("rebuild_revenue", "--check")
+
+
+@pytest.fixture
+def orders_over_days():
+    """Фикстура заказов за три дня на разных столах."""
+    now = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    rows = [
+        (now - timedelta(days=2), 1, 100, "paid"),
+        (now - timedelta(days=1), 1, 200, "paid"),
+        (now - timedelta(days=1, hours=1), 2, 300, "paid"),
+        (now - timedelta(days=1), 2, 50, "pending"),
+        (now, 3, 400, "paid"),
+    ]
+    return [
+        Order.objects.create(
+            created_at=created_at,
+            table_number=table_number,
+            items=[{"name": "блюдо", "price": price}],
+            status=status,
+        )
+        for created_at, table_number, price, status in rows
+    ]
+
+
+@pytest.mark.django_db
+def test_revenue_series_by_day(orders_over_days):
+    """Тест группировки выручки по дням с ограничением периода."""
+    today = timezone.localdate()
+    series = revenue.revenue_series(
+        "day", date_from=today - timedelta(days=1), date_to=today
+    )
+    assert series == [
+        {"key": today - timedelta(days=1), "total": 500, "orders_count": 2},
+        {"key": today, "total": 400, "orders_count": 1},
+    ]
+
+
+@pytest.mark.django_db
+def test_revenue_series_by_table_hour_and_status(orders_over_days):
+    """Тест группировки выручки по столам, часам и статусам."""
+    assert [
+        (row["key"], row["total"]) for row in revenue.revenue_series("table")
+    ] == [(1, 300), (2, 300), (3, 400)]
+
+    yesterday = timezone.localdate() - timedelta(days=1)
+    hours = revenue.revenue_series(
+        "hour", date_from=yesterday, date_to=yesterday
+    )
+    assert [(row["key"].hour, row["total"]) for row in hours] == [
+        (11, 300),
+        (12, 200),
+    ]
+
+    assert [
+        (row["key"], row["total"], row["orders_count"])
+        for row in revenue.revenue_series("status")
+    ] == [("paid", 1000, 4), ("pending", 50, 1)]
+
+
+@pytest.mark.django_db
+def test_rollup_bulk_path():
+    """Тест пакетного обновления агрегата при множестве затронутых строк."""
+    now = timezone.now()
+    orders = Order.objects.bulk_create(
+        Order(
+            table_number=table_number,
+            total_price=10,
+            status="paid",
+            created_at=now - timedelta(days=day),
+        )
+        for day in range(5)
+        for table_number in range(1, 6)
+    )
+    assert len(rollup()) == len(orders) > revenue.BULK_THRESHOLD
+
+    Order.objects.bulk_create(
+        Order(table_number=1, total_price=5, status="paid", created_at=now)
+        for _ in range(revenue.BULK_THRESHOLD + 1)
+    )
+    assert revenue.total_revenue() == revenue.live_total_revenue()
+    call_command("rebuild_revenue", "--check")
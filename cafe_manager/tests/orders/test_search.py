@@ -0,0 +1,114 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+from orders.search import fts_query, search_orders
+
+
+@pytest.fixture
+def dish_orders():
+    """Заказы с разными формами названий блюд."""
+    return [
+        Order.objects.create(
+            table_number=1, items=[{"name": "Борщ украинский", "price": 300}]
+        ),
+        Order.objects.create(
+            table_number=2,
+            items=[
+                {"name": "борщом", "price": 250},
+                {"name": "Хлеб", "price": 20},
+            ],
+        ),
+        Order.objects.create(
+            table_number=3, items=[{"name": "Щи с мясом", "price": 200}]
+        ),
+        Order.objects.create(
+            table_number=4, items=[{"name": "Ёжики в сметане", "price": 400}]
+        ),
+    ]
+
+
+def found(text: str) -> list[int]:
+    return sorted(
+        search_orders(Order.objects.all(), text).values_list(
+            "table_number", flat=True
+        )
+    )
+
+
+def test_fts_query():
+    """Тест запроса FTS5: основы слов как префиксы, без синтаксиса FTS5."""
+    assert fts_query("Борща") == '"борщ"*'
+    assert fts_query('суп "OR" ёжики*') == '"суп"* "or"* "ежик"*'
+    assert fts_query("  ") == ""
+
+
+@pytest.mark.django_db
+def test_search_by_dish(dish_orders):
+    """Тест поиска по блюду: падежи, регистр, «ё» и несколько слов."""
+    assert found("борщ") == [1, 2]
+    assert found("БОРЩА") == [1, 2]
+    assert found("борщ украинский") == [1]
+    assert found("ежик") == [4]
+    assert found("мяса") == [3]
+    assert found("пицца") == []
+    assert found("!!!") == []
+
+
+@pytest.mark.django_db
+def test_search_index_follows_writes(dish_orders):
+    """Тест: индекс поиска следует за save, bulk_update и удалением."""
+    order = dish_orders[0]
+    order.items = [{"name": "Солянка", "price": 350}]
+    order.save()
+    assert found("борщ") == [2]
+    assert found("солянку") == [1]
+
+    dish_orders[2].items = [{"name": "Борщ", "price": 280}]
+    Order.objects.bulk_update_with_items([dish_orders[2]])
+    assert found("борщ") == [2, 3]
+
+    OrderItem.objects.filter(name="Хлеб").update(name="Хлебушек")
+    assert found("хлебушек") == [2]
+
+    dish_orders[1].delete()
+    assert found("борщ") == [3]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_search_index_survives_migration_rollback(dish_orders):
+    """Тест: после отката до 0008 и обратно поиск видит новые блюда."""
+    executor = MigrationExecutor(connection)
+    executor.migrate([("orders", "0008_orderitem_search")])
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes("orders"))
+
+    Order.objects.create(
+        table_number=5, items=[{"name": "Борщ зеленый", "price": 280}]
+    )
+    assert found("борщ") == [1, 2, 5]
+
+
+@pytest.mark.django_db
+def test_order_list_search_by_dish(client, dish_orders):
+    """Тест поиска по блюду в списке заказов; статус ищется как раньше."""
+    url = reverse("order_list")
+    content = client.get(url, {"q": "борщ"}).content.decode()
+    assert "Борщ украинский" in content
+    assert "Щи с мясом" not in content
+
+    content = client.get(url, {"q": "pending"}).content.decode()
+    assert "Щи с мясом" in content
+
+
+@pytest.mark.django_db
+def test_api_dish_filter(dish_orders):
+    """Тест параметра dish в списке заказов API."""
+    response = APIClient().get(reverse("api:orders-list"), {"dish": "борщ"})
+    assert sorted(row["table_number"] for row in response.data["results"]) == [
+        1,
+        2,
+    ]
@@ -0,0 +1,164 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from orders import revenue, sessions
+from orders.models import Order, TableSession
+
+
+def balances() -> dict:
+    """Открытые сессии: {стол: (не оплачено, заказов)}."""
+    return {
+        session.table_number: (session.unpaid_total, session.orders_count)
+        for session in sessions.open_sessions()
+    }
+
+
+@pytest.mark.django_db
+def test_session_follows_order_lifecycle(create_test_order):
+    """Тест: сумма сессии меняется при изменении, оплате и удалении."""
+    assert balances() == {1: (Decimal("800"), 1)}
+
+    Order.objects.create(
+        table_number=1, items=[{"name": "Чай", "price": 50}], status="ready"
+    )
+    Order.objects.create(
+        table_number=2, items=[{"name": "Суп", "price": 300}], status="paid"
+    )
+    assert balances() == {1: (Decimal("850"), 2)}
+
+    create_test_order.items = [{"name": "Пицца", "price": 650}]
+    create_test_order.save()
+    assert balances() == {1: (Decimal("700"), 2)}
+
+    create_test_order.table_number = 3
+    create_test_order.save()
+    assert balances() == {1: (Decimal("50"), 1), 3: (Decimal("650"), 1)}
+
+    Order.objects.filter(table_number=1).update(status="paid")
+    create_test_order.delete()
+    assert balances() == {}
+    assert not TableSession.objects.filter(orders_count__gt=0).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_changes_across_tables():
+    """Тест: массовые изменения по нескольким столам."""
+    Order.objects.bulk_create_with_items(
+        [
+            Order(table_number=table, items=[{"name": "Чай", "price": 50}])
+            for table in (1, 1, 2, 3)
+        ]
+    )
+    assert balances() == {
+        1: (Decimal("100"), 2),
+        2: (Decimal("50"), 1),
+        3: (Decimal("50"), 1),
+    }
+    Order.objects.filter(table_number__in=[1, 2]).update(status="ready")
+    Order.objects.filter(table_number__in=[2, 3]).update(status="paid")
+    assert balances() == {1: (Decimal("100"), 2)}
+
+
+@pytest.mark.django_db
+def test_close_session(create_test_orders):
+    """Тест закрытия: заказы стола оплачены, новый заказ — новый счет."""
+    Order.objects.create(
+        table_number=1, items=[{"name": "Чай", "price": 50}], status="ready"
+    )
+    session = sessions.get_open_session(1)
+
+    closed = sessions.close_session(session.pk)
+    assert closed.closed_at is not None
+    assert closed.paid_total == Decimal("850")
+    assert closed.unpaid_total == 0
+    assert set(
+        Order.objects.filter(table_number=1).values_list("status", flat=True)
+    ) == {"paid"}
+    assert sessions.session_orders(closed).count() == 2
+    assert revenue.total_revenue() == revenue.live_total_revenue() == 1050
+    assert sessions.get_open_session(1) is None
+    assert balances() == {2: (Decimal("350"), 1)}
+
+    with pytest.raises(sessions.SessionClosed):
+        sessions.close_session(session.pk)
+
+    Order.objects.create(table_number=1, items=[{"name": "Суп", "price": 90}])
+    assert sessions.get_open_session(1).pk != session.pk
+    assert balances()[1] == (Decimal("90"), 1)
+
+
+@pytest.mark.django_db
+def test_paying_orders_one_by_one_closes_session(create_test_orders):
+    """
+    Тест: оплата последнего неоплаченного заказа стола закрывает
+    сессию с оплаченной суммой, следующий заказ открывает новую.
+    """
+    tea = Order.objects.create(
+        table_number=1, items=[{"name": "Чай", "price": 50}], status="ready"
+    )
+    session = sessions.get_open_session(1)
+    Order.objects.advance(tea.pk, "paid")
+    assert balances()[1] == (Decimal("800"), 1)
+
+    pizza = create_test_orders[0]
+    Order.objects.advance(pizza.pk, "ready")
+    Order.objects.advance(pizza.pk, "paid")
+    session.refresh_from_db()
+    assert session.closed_at is not None
+    assert (session.unpaid_total, session.orders_count) == (0, 0)
+    assert session.paid_total == Decimal("850")
+    assert set(sessions.session_orders(session)) == {pizza, tea}
+    assert balances() == {2: (Decimal("350"), 1)}
+
+    Order.objects.create(table_number=1, items=[{"name": "Суп", "price": 90}])
+    assert sessions.get_open_session(1).pk != session.pk
+
+
+@pytest.mark.django_db
+def test_split_bill():
+    """Тест деления счета по блюдам и порциям."""
+    order = Order.objects.create(
+        table_number=1,
+        items=[
+            {"name": "Суп", "price": 300},
+            {"name": "Чай", "price": 50, "quantity": 3},
+        ],
+    )
+    Order.objects.create(
+        table_number=1, items=[{"name": "Пирог", "price": 200}]
+    )
+    session = TableSession.objects.get(table_number=1)
+    lines = sessions.bill_lines(session)
+    assert [(line["name"], line["total"]) for line in lines] == [
+        ("Суп", Decimal("300")),
+        ("Чай", Decimal("150")),
+        ("Пирог", Decimal("200")),
+    ]
+    assert lines[0]["order"] == order.pk
+    soup, tea, pie = (line["item"] for line in lines)
+
+    bill = sessions.split_bill(
+        session,
+        [
+            [{"item": soup}, {"item": tea, "quantity": 1}],
+            [{"item": tea, "quantity": 2}],
+        ],
+    )
+    assert [part["total"] for part in bill["parts"]] == [
+        Decimal("350"),
+        Decimal("100"),
+    ]
+    assert [line["name"] for line in bill["remainder"]["items"]] == ["Пирог"]
+    assert bill["total"] == session.unpaid_total == Decimal("650")
+
+    with pytest.raises(ValidationError) as error:
+        sessions.split_bill(
+            session,
+            [[{"item": tea, "quantity": 2}], [{"item": tea}, {"item": 0}]],
+        )
+    assert error.value.messages == [
+        "Часть 2: порций «Чай» осталось 1, а не 3.",
+        "Часть 2: блюда 0 нет в счете.",
+    ]
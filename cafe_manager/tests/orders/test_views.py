@@ -1,6 +1,31 @@
 import pytest
 from django.urls import reverse
 from orders.models import Order
+from orders.views import order_list
+
+# Бюджеты SQL-запросов на один запрос к каждому view
+QUERY_BUDGETS = {
+    # Страница заказов и блюда страницы одним запросом
+    "order_list": 2,
+    # Заказ, блюда, выручка, версия доски, сессия стола и меню
+    "order_create": 7,
+    # Заказ, его блюда и (при сохранении) замена блюд и агрегатов;
+    # при смене стола — сессии обоих столов
+    "order_update": 11,
+    # Удаление перечитывает строку заказа под блокировкой
+    "order_delete": 6,
+    # Агрегаты по дням и по группам
+    "revenue_report": 2,
+    # Версия доски (для ETag) и открытые заказы с блюдами
+    "kitchen_board": 3,
+}
+
+
+@pytest.fixture(autouse=True)
+def check_query_budgets(query_budgets):
+    """Проверяет бюджеты запросов всех view в тестах этого модуля."""
+    with query_budgets(QUERY_BUDGETS):
+        yield
 
 
 @pytest.mark.django_db
@@ -185,6 +210,50 @@ def test_order_update_view_post_invalid_data(client, create_test_order):
     assert create_test_order.items == [{"name": "Пицца", "price": 800}]
 
 
+@pytest.mark.django_db
+def test_order_update_view_conflict(client, create_test_order):
+    """
+    Тест одновременного редактирования: форма, открытая до чужого
+    изменения, не перезаписывает его, а возвращается с ответом 409.
+    """
+    url = reverse("order_update", kwargs={"pk": create_test_order.pk})
+    assert 'name="version" value="1"' in client.get(url).content.decode()
+    Order.objects.filter(pk=create_test_order.pk).update(status="ready")
+    data = {
+        "table_number": 5,
+        "status": "pending",
+        "items_text": "Пицца 800\nсок 100",
+        "version": 1,
+    }
+
+    response = client.post(url, data)
+
+    assert response.status_code == 409
+    content = response.content.decode()
+    assert "Заказ уже изменил другой пользователь" in content
+    assert "статус «Готово», блюда: Пицца 800.00" in content
+    assert 'name="version" value="2"' in content
+    assert "сок 100" in content
+    create_test_order.refresh_from_db()
+    assert (create_test_order.table_number, create_test_order.status) == (
+        1,
+        "ready",
+    )
+
+    # Статус уже «Готово»: вернуть заказ в «В ожидании» нельзя
+    response = client.post(url, {**data, "version": 2})
+    assert response.status_code == 200
+    assert response.context["form"].errors["status"]
+
+    response = client.post(url, {**data, "version": 2, "status": "ready"})
+    assert response.status_code == 302
+    create_test_order.refresh_from_db()
+    assert (create_test_order.table_number, create_test_order.version) == (
+        5,
+        3,
+    )
+
+
 @pytest.mark.django_db
 def test_order_delete_view_get(client, create_test_order):
     """Тест отображения страницы подтверждения удаления заказа (GET-запрос)."""
@@ -296,3 +365,151 @@ def test_revenue_report_only_pending_orders(client):
     assert (
         "Общая выручка за оплаченные заказы: <strong>0,00 ₽</strong" in content
     )
+
+
+@pytest.mark.django_db
+def test_list_view_keyset_pagination(client, settings):
+    """Тест постраничного вывода списка заказов по курсору."""
+    settings.ORDERS_PAGE_SIZE = 2
+    orders = [
+        Order.objects.create(
+            table_number=i, items=[{"name": "чай", "price": 50}]
+        )
+        for i in range(1, 6)
+    ]
+    # Одинаковое время создания: порядок должен определяться id
+    Order.objects.filter(pk__in=[o.pk for o in orders[1:4]]).update(
+        created_at=orders[2].created_at
+    )
+
+    seen = []
+    url = reverse("order_list")
+    response = client.get(url)
+    assert response.context["previous_url"] is None
+    while True:
+        seen.extend(order.pk for order in response.context["orders"])
+        next_url = response.context["next_url"]
+        if next_url is None:
+            break
+        response = client.get(url + next_url)
+        assert response.status_code == 200
+
+    expected = list(
+        Order.objects.order_by("-created_at", "-id").values_list(
+            "pk", flat=True
+        )
+    )
+    assert seen == expected
+
+    # Переход назад возвращает предыдущую страницу
+    previous_url = response.context["previous_url"]
+    response = client.get(url + previous_url)
+    assert [o.pk for o in response.context["orders"]] == expected[2:4]
+
+
+@pytest.mark.django_db
+def test_list_view_pagination_keeps_query(client, settings):
+    """Тест сохранения параметра поиска в ссылках пагинации."""
+    settings.ORDERS_PAGE_SIZE = 1
+    for _ in range(2):
+        Order.objects.create(
+            table_number=7, items=[{"name": "чай", "price": 50}]
+        )
+
+    response = client.get(reverse("order_list"), {"q": "7"})
+    assert "q=7" in response.context["next_url"]
+
+
+@pytest.mark.django_db
+def test_list_view_invalid_cursor(client):
+    """Тест обработки некорректного курсора."""
+    response = client.get(reverse("order_list"), {"cursor": "мусор"})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_revenue_report_grouped_by_table(client, create_test_orders):
+    """Тест отчета о выручке с разбивкой по столам."""
+    response = client.get(reverse("revenue_report"), {"group_by": "table"})
+
+    assert response.status_code == 200
+    assert [row["label"] for row in response.context["series"]] == ["Стол 3"]
+    content = response.content.decode("utf-8")
+    assert "<td>Стол 3</td>" in content
+    assert "<td>200,00 ₽</td>" in content
+
+
+@pytest.mark.django_db
+def test_kitchen_board(client, create_test_orders):
+    """Тест доски открытых заказов: только pending и ready по столам."""
+    response = client.get(reverse("kitchen_board"))
+
+    assert response.status_code == 200
+    assert [t["table_number"] for t in response.context["tables"]] == [1, 2]
+    content = response.content.decode("utf-8")
+    assert "Пицца" in content
+    assert "Паста" in content
+    assert "Салат" not in content
+    assert response["ETag"]
+    assert response["Last-Modified"]
+    assert "no-cache" in response["Cache-Control"]
+
+    response = client.get(reverse("kitchen_board"), {"table": "2"})
+    assert [t["table_number"] for t in response.context["tables"]] == [2]
+
+
+@pytest.mark.django_db
+def test_kitchen_board_not_modified(
+    client, create_test_orders, django_assert_num_queries
+):
+    """Тест условного GET: без изменений — 304 за один запрос."""
+    etag = client.get(reverse("kitchen_board"))["ETag"]
+
+    with django_assert_num_queries(1):
+        response = client.get(
+            reverse("kitchen_board"), HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 304
+
+    # Изменение оплаченного заказа доску не меняет
+    create_test_orders[2].table_number = 5
+    create_test_orders[2].save()
+    response = client.get(reverse("kitchen_board"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    # Готовый заказ на другом столе не меняет доску стола 1
+    table_etag = client.get(reverse("kitchen_board"), {"table": "1"})["ETag"]
+    create_test_orders[1].status = "paid"
+    create_test_orders[1].save()
+    response = client.get(
+        reverse("kitchen_board"), {"table": "1"}, HTTP_IF_NONE_MATCH=table_etag
+    )
+    assert response.status_code == 304
+
+    response = client.get(reverse("kitchen_board"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "Паста" not in response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_list_view_matches_reference_template(rf, create_test_orders):
+    """Тест: подготовленные значения дают тот же HTML, что и шаблон."""
+    from benchmarks.bench_order_list import render_reference
+
+    Order.objects.create(
+        table_number=12,
+        items=[
+            {"name": "<b>Суп & хлеб</b>", "price": 99.5},
+            {"name": "чай", "price": 1234.05, "quantity": 3},
+        ],
+        status="ready",
+    )
+    request = rf.get(reverse("order_list"))
+
+    response = order_list(request)
+
+    assert response.content.decode() == render_reference(request, 50)
+    assert "&lt;b&gt;Суп &amp; хлеб&lt;/b&gt; — 99,50 руб." in (
+        response.content.decode()
+    )
+    assert "чай × 3 — 1234,05 руб." in response.content.decode()